@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark the OCR engines on small synthetic screenshots
+Compares per-image latency of the subprocess, pipe and in-process Tesseract backends
+"""
+
+import sys
+import os
+import time
+import argparse
+import statistics
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PIL import Image, ImageDraw, ImageFont
+from ocr_engines import ENGINES, get_engine
+
+
+def make_images(count):
+    """Render small UI-screenshot-like images with a line or two of text"""
+    font = ImageFont.load_default()
+    images = []
+    for i in range(count):
+        image = Image.new('L', (480, 64), color=255)
+        draw = ImageDraw.Draw(image)
+        draw.text((8, 8), f"Settings saved at 10:{i % 60:02d}", fill=0, font=font)
+        draw.text((8, 32), f"Item {i}: Download complete", fill=0, font=font)
+        images.append(image.resize((960, 128)))
+    return images
+
+
+def bench_engine(name, images, language, runs):
+    """Time one engine over the images and return per-image latencies in ms"""
+    engine = get_engine(name)
+    engine.check()
+
+    # Warm up so one-time model loading is reported separately
+    start = time.perf_counter()
+    engine.image_to_string(images[0], language, 6, 3)
+    warmup_ms = (time.perf_counter() - start) * 1000
+
+    latencies = []
+    for _ in range(runs):
+        for image in images:
+            start = time.perf_counter()
+            engine.image_to_string(image, language, 6, 3)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    engine.close()
+    return warmup_ms, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare OCR engine latency')
+    parser.add_argument('--images', type=int, default=20, help='Number of synthetic images')
+    parser.add_argument('--runs', type=int, default=3, help='Passes over the images')
+    parser.add_argument('-l', '--language', default='eng', help='Tesseract language code')
+    parser.add_argument('--engines', nargs='+', default=['pytesseract'] +
+                        sorted(name for name in ENGINES if name != 'pytesseract'),
+                        help='Engines to compare; savings are relative to the first (default: all)')
+    args = parser.parse_args()
+
+    images = make_images(args.images)
+
+    print(f"{'engine':<14}{'first ms':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}"
+          f"{'img/s':>10}{'saved ms':>10}")
+    baseline = None
+    for name in args.engines:
+        try:
+            warmup_ms, latencies = bench_engine(name, images, args.language, args.runs)
+        except Exception as e:
+            print(f"{name:<14}unavailable: {e}")
+            continue
+
+        latencies.sort()
+        mean = statistics.mean(latencies)
+        p95 = latencies[int(0.95 * (len(latencies) - 1))]
+        # Per-image saving relative to the first engine measured
+        baseline = mean if baseline is None else baseline
+        print(f"{name:<14}{warmup_ms:>10.1f}{mean:>10.1f}{statistics.median(latencies):>10.1f}"
+              f"{p95:>10.1f}{1000 / mean:>10.1f}{baseline - mean:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -38,11 +38,19 @@ setup(
     ],
     python_requires=">=3.7",
     install_requires=requirements,
+    extras_require={
+        "pdf": ["PyMuPDF>=1.23.0"],
+        "serve": ["Flask>=2.0"],
+        "tiff": ["tifffile>=2023.7.10"],
+    },
     entry_points={
         "console_scripts": [
             "ocr-extract=ocr_extractor:main",
             "ocr-gui=gui_extractor:main",
             "ocr-batch=batch_processor:main",
+            "ocr-bench=ocr_bench:main",
+            "ocr-serve=ocr_server:main",
+            "ocr-search=ocr_search:main",
         ],
     },
     include_package_data=True,
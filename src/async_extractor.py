@@ -0,0 +1,391 @@
+"""
+Async OCR Extractor - asyncio-native text extraction with bounded concurrency
+"""
+
+import io
+import os
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+import pytesseract
+from PIL import Image
+
+from ocr_extractor import OCRExtractor
+from ocr_engines import PipeEngine, PytesseractEngine, encode_uncompressed
+from parallel_engine import default_omp_threads
+from preprocessing import count_frames, load_grayscale, to_grayscale
+from text_regions import detect_text_regions, region_pixel_fraction
+from tiling import image_height
+
+logger = logging.getLogger(__name__)
+
+# A file path, or the encoded bytes of an image (PNG, JPEG, ...)
+Source = Union[str, os.PathLike, bytes]
+
+
+def decode_grayscale(data: bytes) -> np.ndarray:
+    """
+    Decode encoded image bytes to a writable 8-bit grayscale array
+
+    Args:
+        data (bytes): Encoded image (any format OpenCV or PIL can read)
+
+    Returns:
+        np.ndarray: Grayscale image (height x width, uint8)
+    """
+    gray = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        with Image.open(io.BytesIO(data)) as image:
+            gray = to_grayscale(image)
+    return gray
+
+
+class AsyncOCRExtractor:
+    """
+    Extract text from images inside an asyncio event loop
+
+    Tesseract runs as a subprocess driven by asyncio.create_subprocess_exec,
+    with images streamed uncompressed over stdin. A semaphore bounds how many
+    tesseract processes run at once; decoding and preprocessing run on a
+    small thread pool. Cancelling an extraction kills its tesseract process.
+
+    Inputs the synchronous extractor handles (PDFs, multi-frame and tiled
+    images, extra output formats, language detection, the adaptive cascade,
+    and any engine other than the tesseract command line) run on the thread
+    pool and cannot be interrupted: cancelling one returns at once, but its
+    concurrency slot stays taken until the blocking call finishes.
+    """
+
+    def __init__(self, extractor: Optional[OCRExtractor] = None,
+                 max_concurrency: Optional[int] = None, tesseract_cmd: Optional[str] = None):
+        """
+        Initialize async OCR extractor
+
+        Args:
+            extractor (OCRExtractor): Supplies the language, preprocessing pipeline,
+                region detection, cache and text cleanup (default: OCRExtractor())
+            max_concurrency (int): Most tesseract processes running at once
+                (default: one per CPU core)
+            tesseract_cmd (str): tesseract binary (default: pytesseract's configured command)
+        """
+        self.extractor = extractor or OCRExtractor()
+        self.max_concurrency = max_concurrency or os.cpu_count() or 1
+        self.tesseract_cmd = tesseract_cmd or pytesseract.pytesseract.tesseract_cmd
+        # Split the cores between concurrent tesseract processes
+        self._env = dict(os.environ,
+                         OMP_THREAD_LIMIT=str(default_omp_threads(self.max_concurrency)))
+        self._semaphore = None
+        self._executor = None
+
+    async def __aenter__(self) -> "AsyncOCRExtractor":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shut down the preprocessing thread pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created on first use so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                thread_name_prefix='ocr-preprocess')
+        return self._executor
+
+    async def _run_blocking(self, func, *args):
+        """Run CPU-bound work on the preprocessing thread pool"""
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+
+    async def _run_in_slot(self, func, *args):
+        """
+        Run blocking OCR on the thread pool, holding a concurrency slot until it returns
+
+        A running thread cannot be stopped, so on cancellation the slot is
+        only released once the call has finished; otherwise new tesseract
+        runs would be admitted on top of the orphaned one.
+        """
+        async with self._get_semaphore():
+            work = self._get_executor().submit(func, *args)
+            future = asyncio.wrap_future(work)
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not work.cancel():
+                    await _wait_ignoring_cancel(future)
+                raise
+
+    async def _tesseract(self, image: Image.Image, psm: int, oem: int) -> str:
+        """
+        Run one tesseract process over an image, killing it if cancelled
+
+        Args:
+            image (PIL.Image): Preprocessed image
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+
+        Returns:
+            str: Raw recognized text
+        """
+        data = encode_uncompressed(image)
+        async with self._get_semaphore():
+            process = await asyncio.create_subprocess_exec(
+                self.tesseract_cmd, 'stdin', 'stdout', '-l', self.extractor.language,
+                '--oem', str(oem), '--psm', str(psm),
+                stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE, env=self._env)
+            try:
+                stdout, stderr = await process.communicate(data)
+            except BaseException:
+                # Cancelled (or failed) mid-run: do not leave tesseract running
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                raise
+
+        if process.returncode != 0:
+            raise RuntimeError(f"tesseract failed: {stderr.decode('utf-8', 'replace').strip()}")
+        return stdout.decode('utf-8')
+
+    def _native_engine(self) -> bool:
+        """Whether the extractor's engine is the tesseract command line this class drives itself"""
+        return type(self.extractor.engine) in (PytesseractEngine, PipeEngine)
+
+    def _lookup(self, source: Source, enhance: bool, psm: int,
+                oem: int) -> Tuple[Optional[str], Optional[str], Optional[np.ndarray]]:
+        """
+        Check the cache for an input on a worker thread, decoding bytes inputs
+
+        Returns:
+            Tuple: Cache key (None when caching is off), cached text (None on a
+                miss) and the decoded image for bytes inputs
+        """
+        extractor = self.extractor
+        gray = decode_grayscale(source) if isinstance(source, bytes) else None
+        if extractor.cache is None:
+            return None, None, gray
+
+        settings = extractor.cache_settings(enhance, psm, oem)
+        if isinstance(source, bytes):
+            cache_key = extractor.cache.make_data_key(source, **settings)
+        else:
+            cache_key = extractor.cache.make_key(source, **settings)
+        return cache_key, extractor.cache.get(cache_key), gray
+
+    def _preprocess(self, source: Source, gray: Optional[np.ndarray], enhance: bool):
+        """Preprocess a decoded image (or load it from its path) and find its text regions"""
+        if gray is None:
+            gray, stats = self.extractor.preprocess_array(source, enhance)
+        else:
+            gray, stats = self.extractor.pipeline.run(gray, enhance)
+
+        regions = []
+        if self.extractor.detect_regions:
+            found = detect_text_regions(gray)
+            fraction = region_pixel_fraction(found, gray.shape)
+            if found and fraction <= self.extractor.max_region_fraction:
+                regions = found
+                stats["regions"] = len(regions)
+                stats["ocr_pixel_fraction"] = round(fraction, 4)
+        return gray, stats, regions
+
+    def _run_cascade(self, source: Source, gray: Optional[np.ndarray], psm: int, oem: int):
+        """Run the extractor's adaptive cascade on a worker thread"""
+        if gray is None:
+            gray = load_grayscale(source)
+        return self.extractor.recognize_adaptive(gray, psm, oem)
+
+    def _extract_rendered(self, source: bytes, enhance: bool, psm: int, oem: int):
+        """Extract encoded image bytes with the synchronous extractor on a worker thread"""
+        details = self.extractor.extract_frame(decode_grayscale(source), 0, enhance, psm, oem)
+        del details["page"]
+        return details
+
+    async def extract_details(self, source: Source, enhance: bool = True,
+                              psm: int = 6, oem: int = 3) -> Dict[str, Any]:
+        """
+        Extract text from an image file or encoded image bytes
+
+        Multi-page files, PDFs and images tall enough to be tiled, and every
+        input when the extractor has extra output formats, detects each
+        image's language or uses an in-process engine, are handed to the
+        synchronous extractor on the thread pool, holding one concurrency
+        slot for the whole document (tiled images OCR their strips on the
+        extractor's tile_workers threads). Cancelling those does not stop the
+        OCR already running; the slot is freed when it finishes.
+
+        Args:
+            source (str or bytes): Image path, or encoded image bytes
+            enhance (bool): Whether to enhance the image before OCR
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+
+        Returns:
+            Dict: Extracted "text", "cache" status and preprocessing "stats",
+                as returned by OCRExtractor.extract_details
+        """
+        extractor = self.extractor
+        if not isinstance(source, bytes):
+            source = os.fspath(source)
+            if not os.path.exists(source):
+                raise FileNotFoundError(f"Image file not found: {source}")
+            file_ext = os.path.splitext(source)[1].lower()
+            if file_ext not in extractor.supported_formats:
+                raise ValueError(f"Unsupported file format: {file_ext}")
+            if (file_ext == '.pdf' or extractor.outputs or extractor.languages
+                    or not self._native_engine()
+                    or await self._run_blocking(count_frames, source) > 1
+                    or extractor.tile_height and extractor.use_tiles(
+                        await self._run_blocking(image_height, source))):
+                return await self._run_in_slot(
+                    lambda: extractor.extract_details(source, enhance=enhance, psm=psm, oem=oem))
+
+        elif (extractor.outputs or extractor.tile_height or extractor.languages
+              or not self._native_engine()):
+            # Extra outputs come from the extractor's engine, rendered with the text,
+            # and only the decoded image tells whether it needs tiling or which
+            # language model reads it
+            return await self._run_in_slot(self._extract_rendered, source, enhance, psm, oem)
+
+        cache_key, cached_text, gray = await self._run_blocking(self._lookup, source,
+                                                                enhance, psm, oem)
+        if cached_text is not None:
+            return {"text": cached_text, "cache": "hit", "stats": {"timings": {}}}
+
+        if extractor.cascade is not None:
+            # Each tier waits on the previous one's confidence, so the cascade runs
+            # as one blocking call holding one concurrency slot
+            raw_text, stats = await self._run_in_slot(self._run_cascade, source, gray, psm, oem)
+            text = extractor.clean_text(raw_text)
+            if cache_key is not None:
+                await self._run_blocking(extractor.cache.put, cache_key, text)
+            return {"text": text, "cache": "miss" if cache_key else None, "stats": stats}
+
+        gray, stats, regions = await self._run_blocking(self._preprocess, source, gray, enhance)
+
+        if regions:
+            crops = [Image.fromarray(gray[y:y + h, x:x + w]) for x, y, w, h in regions]
+            texts = await asyncio.gather(*(self._tesseract(crop, psm, oem) for crop in crops))
+            raw_text = '\n'.join(text.strip() for text in texts if text.strip())
+        else:
+            raw_text = await self._tesseract(Image.fromarray(gray), psm, oem)
+
+        text = extractor.clean_text(raw_text)
+        if cache_key is not None:
+            await self._run_blocking(extractor.cache.put, cache_key, text)
+        return {"text": text, "cache": "miss" if cache_key else None, "stats": stats}
+
+    async def extract(self, source: Source, enhance: bool = True,
+                      psm: int = 6, oem: int = 3) -> str:
+        """
+        Extract text from an image file or encoded image bytes
+
+        Args:
+            source (str or bytes): Image path, or encoded image bytes
+            enhance (bool): Whether to enhance the image before OCR
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+
+        Returns:
+            str: Extracted text
+        """
+        return (await self.extract_details(source, enhance=enhance, psm=psm, oem=oem))["text"]
+
+    async def extract_many(self, sources: Union[Iterable[Source], AsyncIterable[Source]],
+                           enhance: bool = True, psm: int = 6, oem: int = 3,
+                           max_pending: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Extract text from many inputs, yielding results as they complete
+
+        Inputs are pulled lazily: at most max_pending extractions are
+        scheduled at once, so a slow consumer or a huge input stream applies
+        backpressure instead of queueing unbounded work. Closing the iterator
+        early or cancelling the consuming task cancels the in-flight
+        extractions and kills their tesseract processes.
+
+        Args:
+            sources (Iterable or AsyncIterable): Image paths and/or encoded image bytes
+            enhance (bool): Whether to enhance images before OCR
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+            max_pending (int): Most extractions scheduled at once
+                (default: twice max_concurrency)
+
+        Yields:
+            Dict: Record with the input "index", "file_path" (None for bytes),
+                "status" ("success" or "failed"), and "text", "cache" and
+                "stats" or "error"
+        """
+        max_pending = max_pending or self.max_concurrency * 2
+        if hasattr(sources, '__aiter__'):
+            iterator = sources.__aiter__()
+        else:
+            iterator = _as_async_iterator(sources)
+
+        async def run(index: int, source: Source) -> Dict[str, Any]:
+            file_path = None if isinstance(source, bytes) else os.fspath(source)
+            try:
+                details = await self.extract_details(source, enhance=enhance, psm=psm, oem=oem)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to process {file_path or f'input {index}'}: {e}")
+                return {"index": index, "file_path": file_path, "status": "failed",
+                        "error": str(e)}
+            return {"index": index, "file_path": file_path, "status": "success",
+                    "text": details["text"], "cache": details["cache"], "stats": details["stats"]}
+
+        pending = set()
+        index = 0
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < max_pending:
+                    try:
+                        source = await iterator.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    pending.add(asyncio.ensure_future(run(index, source)))
+                    index += 1
+
+                if not pending:
+                    return
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def _wait_ignoring_cancel(future: asyncio.Future):
+    """Wait for a future to finish even if the waiting task is cancelled again"""
+    while not future.done():
+        try:
+            await asyncio.wait([future])
+        except asyncio.CancelledError:
+            pass
+    if not future.cancelled():
+        # Retrieve the outcome so a failure is not reported as never retrieved
+        future.exception()
+
+
+async def _as_async_iterator(items: Iterable[Source]) -> AsyncIterator[Source]:
+    for item in items:
+        yield item
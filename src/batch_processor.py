@@ -3,39 +3,228 @@ Batch OCR Processor - Command-line tool for processing multiple images
 """
 
 import os
+import re
 import sys
+import bisect
+import shutil
+import itertools
 import argparse
 import json
 import time
+import queue
+import cProfile
+import threading
+from concurrent.futures import FIRST_COMPLETED, wait
 from pathlib import Path
-from typing import List, Dict, Any
-from ocr_extractor import OCRExtractor
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
+from ocr_extractor import OCRExtractor, add_extractor_arguments, create_extractor
+from ocr_cache import OCRCache
+from parallel_engine import ParallelEngine, worker_extract_batch
+from run_journal import RunJournal
+from image_hash import try_dhash, find_near_duplicates, DEFAULT_MAX_DISTANCE
+from instrumentation import StageTimer, TimingStats, write_prometheus_textfile
+from folder_watcher import Debouncer, create_watcher
+from ocr_cascade import CascadeStats
+from ocr_search import SearchIndex, INDEX_FILENAME
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Text and rendered outputs (hOCR, PDF) written for an input image
+OUTPUT_NAME_PATTERN = re.compile(r"_extracted(_page\d+)?\.[^.]+$")
+
 logger = logging.getLogger(__name__)
 
+class FileResult:
+    """Compact per-file result yielded by BatchProcessor.iter_directory"""
+    
+    __slots__ = ("file_path", "status", "text", "text_length", "output_file",
+                 "error", "cache", "skipped", "stats", "duplicate_of",
+                 "pages", "outputs", "output_files", "signature", "summary_span")
+    
+    def __init__(self, file_path: str, status: str, text: Optional[str] = None,
+                 text_length: int = 0, output_file: Optional[str] = None,
+                 error: Optional[str] = None, cache: Optional[str] = None,
+                 skipped: bool = False, stats: Optional[Dict[str, Any]] = None,
+                 duplicate_of: Optional[str] = None,
+                 pages: Optional[List[Dict[str, Any]]] = None,
+                 outputs: Optional[Dict[str, Any]] = None,
+                 output_files: Optional[Dict[str, List[str]]] = None,
+                 signature: Optional[Tuple[int, float]] = None):
+        self.file_path = file_path
+        self.status = status
+        self.text = text
+        self.text_length = text_length
+        self.output_file = output_file
+        self.error = error
+        self.cache = cache
+        self.skipped = skipped
+        self.stats = stats
+        self.duplicate_of = duplicate_of
+        self.pages = pages
+        # Extra output data, held only until store_result saves it to output_files
+        self.outputs = outputs
+        self.output_files = output_files
+        # Size and modification time from just before the file was read
+        self.signature = signature
+        # Byte offset and length of the file's block in the summary, once written
+        self.summary_span = None
+    
+    @property
+    def file_name(self) -> str:
+        return os.path.basename(self.file_path)
+    
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "FileResult":
+        """
+        Build a result from a parallel engine or run journal record
+        
+        Args:
+            record (Dict): Per-file record
+            
+        Returns:
+            FileResult: Compact result
+        """
+        return cls(
+            file_path=record["file_path"],
+            status=record["status"],
+            text=record.get("extracted_text"),
+            text_length=record.get("text_length", 0),
+            output_file=record.get("output_file"),
+            error=record.get("error"),
+            cache=record.get("cache"),
+            stats=record.get("stats"),
+            duplicate_of=record.get("duplicate_of"),
+            pages=record.get("pages"),
+            outputs=record.get("outputs"),
+            output_files=record.get("output_files"),
+            signature=record.get("signature")
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to a report record (without the extracted text)
+        
+        Returns:
+            Dict: JSON-serializable per-file record
+        """
+        return {
+            "file_path": self.file_path,
+            "file_name": self.file_name,
+            "status": self.status,
+            "text_length": self.text_length,
+            "output_file": self.output_file,
+            "error": self.error,
+            "cache": self.cache,
+            "skipped": self.skipped,
+            "stats": self.stats,
+            "duplicate_of": self.duplicate_of,
+            "pages": self.pages,
+            "output_files": self.output_files
+        }
+
+class SummaryFile:
+    """Batch summary text file, opened on the first write"""
+    
+    def __init__(self, path: str, append: bool = False):
+        """
+        Initialize summary file
+        
+        Args:
+            path (str): Summary file path
+            append (bool): Add to an existing summary instead of replacing it
+        """
+        self.path = path
+        self.append = append
+        self._file = None
+    
+    def write(self, header: str, text: str) -> Tuple[int, int]:
+        """
+        Add one file's text under a header and flush it to disk
+        
+        Returns:
+            Tuple[int, int]: Byte offset and length of the block in the file
+        """
+        if self._file is None:
+            self._file = open(self.path, 'ab' if self.append else 'wb')
+        block = f"\n--- {header} ---\n{text}\n".encode('utf-8')
+        offset = self._file.tell()
+        self._file.write(block)
+        self._file.flush()
+        return offset, len(block)
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def remove_blocks(self, spans: List[Tuple[int, int]]) -> Callable[[int], int]:
+        """
+        Rewrite the closed summary without some of its blocks
+        
+        Args:
+            spans (List[Tuple[int, int]]): Byte offset and length of each block to drop
+            
+        Returns:
+            Callable[[int], int]: Maps a kept block's old offset to its new one
+        """
+        self.close()
+        spans = sorted(spans)
+        tmp_path = self.path + ".tmp"
+        with open(self.path, 'rb') as source, open(tmp_path, 'wb') as target:
+            position = 0
+            for offset, length in spans:
+                target.write(source.read(offset - position))
+                source.seek(offset + length)
+                position = offset + length
+            shutil.copyfileobj(source, target)
+        os.replace(tmp_path, self.path)
+        
+        starts = [offset for offset, _ in spans]
+        removed = list(itertools.accumulate(length for _, length in spans))
+        
+        def relocate(offset: int) -> int:
+            count = bisect.bisect_right(starts, offset)
+            return offset - (removed[count - 1] if count else 0)
+        
+        return relocate
+
 class BatchProcessor:
     """Batch processor for OCR text extraction"""
     
-    def __init__(self, language: str = 'eng', output_dir: str = None):
+    def __init__(self, language: str = 'eng', output_dir: str = None, workers: int = 1,
+                 cache: OCRCache = None, engine: str = None, extractor: OCRExtractor = None,
+                 split_pages: bool = True, search_index: bool = True):
         """
         Initialize batch processor
         
         Args:
             language (str): Tesseract language code
             output_dir (str): Output directory for text files
+            workers (int): Number of OCR worker processes (0 means one per CPU core)
+            cache (OCRCache): Optional cache of previously extracted text
+            engine (str): Tesseract backend name (default: 'pytesseract')
+            extractor (OCRExtractor): Preconfigured extractor to use instead of
+                building one from language, cache and engine
+            split_pages (bool): Spread the pages of multi-page TIFFs and PDFs across workers
+            search_index (bool): Keep a full-text search index of the results in the
+                output directory (searched with ocr-search)
         """
-        self.extractor = OCRExtractor(language=language)
+        self.extractor = extractor or OCRExtractor(language=language, cache=cache, engine=engine)
+        self.engine = ParallelEngine(self.extractor, workers=workers, split_pages=split_pages)
         self.output_dir = output_dir or "extracted_texts"
+        self.search_index = search_index
         self.results = []
+        self.run_stats = {}
+        self.timing_stats = TimingStats()
+        self.cascade_stats = CascadeStats()
         
         # Create output directory if it doesn't exist
         Path(self.output_dir).mkdir(parents=True, exist_ok=True)
     
     def process_directory(self, input_dir: str, recursive: bool = True, 
-                         save_individual: bool = True, create_summary: bool = True) -> Dict[str, Any]:
+                         save_individual: bool = True, create_summary: bool = True,
+                         resume: bool = False, incremental: bool = False,
+                         dedupe: Optional[int] = None, enhance: bool = True,
+                         psm: int = 6, oem: int = 3) -> Dict[str, Any]:
         """
         Process all images in a directory
         
@@ -44,93 +233,559 @@ class BatchProcessor:
             recursive (bool): Process subdirectories recursively
             save_individual (bool): Save text for each image individually
             create_summary (bool): Create a summary file with all results
+            resume (bool): Skip files the run journal records as already extracted
+            incremental (bool): Only extract files that are new or changed since
+                the last run, merging them into the existing summary and report
+            dedupe (int): OCR only one image per cluster of near-duplicates within
+                this Hamming distance, reusing its text for the rest (None disables)
+            enhance (bool): Whether to enhance images before OCR
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
             
         Returns:
-            Dict: Processing results
+            Dict: Processing results (per-file records without extracted text)
+        """
+        files = [
+            file_result.to_dict()
+            for file_result in self.iter_directory(input_dir, recursive, save_individual,
+                                                   create_summary, resume, incremental,
+                                                   dedupe, enhance, psm, oem)
+        ]
+        
+        if not self.run_stats.get("total_files"):
+            return {"status": "error", "message": "No image files found"}
+        
+        results = dict(self.run_stats)
+        results["files"] = files
+        return results
+    
+    def iter_directory(self, input_dir: str, recursive: bool = True,
+                       save_individual: bool = True, create_summary: bool = True,
+                       resume: bool = False, incremental: bool = False,
+                       dedupe: Optional[int] = None, enhance: bool = True,
+                       psm: int = 6, oem: int = 3) -> Iterator[FileResult]:
+        """
+        Process all images in a directory, yielding each result as it finishes
+        
+        The summary file and a JSON-lines report are written incrementally, and
+        no extracted text is retained once its result has been yielded, so memory
+        use does not grow with the number of files. Running totals are kept in
+        self.run_stats and per-stage timings in self.timing_stats.
+        
+        Args:
+            input_dir (str): Input directory path
+            recursive (bool): Process subdirectories recursively
+            save_individual (bool): Save text for each image individually
+            create_summary (bool): Create a summary file with all results
+            resume (bool): Skip files the run journal records as already extracted
+            incremental (bool): Only extract files that are new or changed since
+                the last run, merging them into the existing summary and report
+            dedupe (int): OCR only one image per cluster of near-duplicates within
+                this Hamming distance, reusing its text for the rest (None disables)
+            enhance (bool): Whether to enhance images before OCR
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+            
+        Yields:
+            FileResult: Per-file result, in sorted file order
         """
         logger.info(f"Starting batch processing of directory: {input_dir}")
         
         # Find all image files
         image_files = self.find_image_files(input_dir, recursive)
         
+        stats = self.run_stats = self.new_run_stats(len(image_files), dedupe)
         if not image_files:
             logger.warning("No image files found in directory")
-            return {"status": "error", "message": "No image files found"}
+            return
         
         logger.info(f"Found {len(image_files)} image files to process")
         
-        # Process each image
-        results = {
-            "total_files": len(image_files),
+        # Work out which files the journal lets us skip
+        merge = resume or incremental
+        journal = RunJournal(self.output_dir)
+        skipped_files = set()
+        if merge:
+            journal.load()
+            is_current = journal.is_done if resume else journal.is_unchanged
+            skipped_files = {f for f in image_files if is_current(f)}
+        pending_files = [f for f in image_files if f not in skipped_files]
+        stats["skipped"] = len(skipped_files)
+        
+        if skipped_files:
+            logger.info(f"Skipping {len(skipped_files)} files already extracted, "
+                        f"{len(pending_files)} left to process")
+        
+        # Cluster near-duplicates so only one image per cluster is OCRed
+        duplicates = {}
+        if dedupe is not None and pending_files:
+            duplicates = self.find_duplicates(pending_files, dedupe)
+        ocr_files = [f for f in pending_files if f not in duplicates]
+        # Representative texts are held only until their last duplicate is written
+        remaining = {}
+        for representative in duplicates.values():
+            remaining[representative] = remaining.get(representative, 0) + 1
+        shared_texts = {}
+        
+        summary_file = os.path.join(self.output_dir, "batch_summary.txt")
+        records_file = os.path.join(self.output_dir, "processing_report.jsonl")
+        # Resumed and incremental runs add to the existing summary
+        summary = SummaryFile(summary_file, append=merge)
+        
+        # A fresh run replaces the index like it replaces the summary
+        index = self.open_search_index(enhance, psm, oem)
+        if index is not None and not merge:
+            index.clear()
+        
+        start_time = time.time()
+        done = 0
+        # Summary blocks of earlier results that this run replaces
+        replaced_blocks = []
+        extracted = self.engine.imap(ocr_files, enhance=enhance, psm=psm, oem=oem)
+        journal.open(append=merge)
+        
+        try:
+            with journal, open(records_file, 'w', encoding='utf-8') as records:
+                for image_path in image_files:
+                    if image_path in skipped_files:
+                        file_result = self.get_journal_result(journal.get(image_path))
+                        stats["processed"] += 1
+                    else:
+                        previous = journal.get(image_path)
+                        if image_path in duplicates:
+                            file_result = self.get_duplicate_result(
+                                image_path, duplicates[image_path], shared_texts, remaining)
+                            stats["duplicates"] += 1
+                        else:
+                            file_result = FileResult.from_record(next(extracted))
+                            if image_path in remaining and file_result.status == "success":
+                                shared_texts[image_path] = file_result.text
+                        done += 1
+                        logger.info(f"Processed {done}/{len(pending_files)}: {file_result.file_name}")
+                        
+                        self.store_result(file_result, stats, save_individual,
+                                          summary if create_summary else None,
+                                          updated=merge and previous is not None, index=index)
+                        if create_summary and previous and previous.get("summary_span"):
+                            replaced_blocks.append(previous["summary_span"])
+                        
+                        journal.record(file_result.to_dict(), file_result.signature,
+                                       file_result.summary_span)
+                    
+                    records.write(json.dumps(file_result.to_dict(), ensure_ascii=False) + "\n")
+                    records.flush()
+                    stats["processing_time"] = time.time() - start_time
+                    yield file_result
+                
+                if merge:
+                    # Drop entries and summary text for deleted files and superseded results
+                    if create_summary:
+                        found = set(image_files)
+                        replaced_blocks.extend(
+                            entry["summary_span"] for file_path, entry in journal.entries.items()
+                            if file_path not in found and entry.get("summary_span"))
+                        self.remove_summary_blocks(summary, journal, replaced_blocks)
+                    journal.compact(image_files)
+                    if index is not None:
+                        index.compact(image_files)
+        finally:
+            summary.close()
+            extracted.close()
+            if index is not None:
+                index.close()
+                stats["index_file"] = index.path
+        
+        # Calculate processing time
+        stats["processing_time"] = time.time() - start_time
+        stats["records_file"] = records_file
+        stats["timings"] = self.timing_stats.summary()
+        if self.extractor.cascade is not None:
+            stats["cascade"] = self.cascade_stats.summary(self.extractor.min_confidence,
+                                                             len(self.extractor.cascade))
+        
+        # Save processing report
+        report_file = os.path.join(self.output_dir, "processing_report.json")
+        self.save_processing_report(stats, report_file, records_file)
+        stats["report_file"] = report_file
+        
+        logger.info(f"Batch processing completed: {stats['processed']}/{stats['total_files']} files processed successfully")
+    
+    def open_search_index(self, enhance: bool, psm: int, oem: int,
+                          commit_every: int = 200) -> Optional[SearchIndex]:
+        """
+        Open the output directory's search index for a run
+        
+        Args:
+            enhance (bool): Whether images are enhanced before OCR
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+            commit_every (int): Files added between commits
+            
+        Returns:
+            SearchIndex: Index recording the run's extraction settings, or None
+                when indexing is disabled
+        """
+        if not self.search_index:
+            return None
+        settings = dict(self.extractor.cache_settings(enhance, psm, oem),
+                        engine=self.extractor.engine.name)
+        return SearchIndex(os.path.join(self.output_dir, INDEX_FILENAME), settings,
+                           commit_every=commit_every)
+    
+    def new_run_stats(self, total_files: int = 0,
+                      dedupe: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Start fresh running totals and stage timings for a run
+        
+        Args:
+            total_files (int): Files found for the run
+            dedupe (int): Near-duplicate distance in use (None if disabled)
+            
+        Returns:
+            Dict: Zeroed running totals
+        """
+        self.timing_stats = TimingStats()
+        self.cascade_stats = CascadeStats()
+        return {
+            "total_files": total_files,
             "processed": 0,
             "failed": 0,
-            "files": [],
-            "summary_text": "",
-            "processing_time": 0
+            "skipped": 0,
+            "processing_time": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "rescaled": 0,
+            "pixels_in": 0,
+            "pixels_out": 0,
+            "region_images": 0,
+            "region_pixel_fraction_sum": 0.0,
+            "duplicates": 0,
+            "multi_page_files": 0,
+            "pages": 0,
+            "text_layer_pages": 0,
+            "languages": {},
+            "dedupe_distance": dedupe
         }
+    
+    def watch_directory(self, input_dir: str, recursive: bool = True,
+                        save_individual: bool = True, create_summary: bool = True,
+                        settle: float = 1.0, queue_size: int = 64,
+                        polling: bool = False, poll_interval: float = 2.0,
+                        catch_up: bool = True, enhance: bool = True, psm: int = 6,
+                        oem: int = 3, stop_event: Optional[threading.Event] = None
+                        ) -> Iterator[FileResult]:
+        """
+        Watch a directory and extract new or changed images as they land
         
-        start_time = time.time()
+        A background thread receives file events (inotify, or periodic rescans
+        where inotify is unavailable) and holds each file back until it has
+        stopped changing for `settle` seconds. Settled files go through a
+        bounded queue to a long-lived worker pool; when the queue is full the
+        watcher thread blocks until workers catch up, so a burst of files
+        never queues unbounded work. Results are appended to the individual
+        text files, the summary, the JSON-lines report and the run journal as
+        they finish, and the journal lets a restarted watch skip files it has
+        already extracted. Runs until stop_event is set or the iterator is
+        closed; the JSON report is written on exit.
         
-        for i, image_path in enumerate(image_files):
-            logger.info(f"Processing {i+1}/{len(image_files)}: {os.path.basename(image_path)}")
+        Args:
+            input_dir (str): Directory to watch
+            recursive (bool): Watch subdirectories too
+            save_individual (bool): Save text for each image individually
+            create_summary (bool): Append results to the summary file
+            settle (float): Seconds a file must stay unchanged before it is read
+            queue_size (int): Most settled files waiting for a worker
+            polling (bool): Rescan instead of using inotify (for network shares)
+            poll_interval (float): Seconds between rescans when polling
+            catch_up (bool): First extract existing files that are new or changed
+                since the journal was last written
+            enhance (bool): Whether to enhance images before OCR
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+            stop_event (threading.Event): Set to stop watching
             
+        Yields:
+            FileResult: Per-file result, in completion order
+        """
+        stop_event = stop_event or threading.Event()
+        stats = self.run_stats = self.new_run_stats()
+        supported_formats = self.extractor.supported_formats
+        
+        def is_image(path: str) -> bool:
+            # The same filter as the catch-up scan in find_image_files
+            return (os.path.splitext(path)[1].lower() in supported_formats
+                    and not self.is_output_file(path, input_dir))
+        
+        journal = RunJournal(self.output_dir)
+        journal.load()
+        # Start watching before the catch-up scan so nothing lands unseen in between
+        watcher = create_watcher(input_dir, recursive, polling, poll_interval)
+        logger.info(f"Watching {input_dir} for new images ({watcher.name})")
+        
+        work = queue.Queue(maxsize=queue_size)
+        watch_errors = []
+        
+        def watch():
+            debouncer = Debouncer(settle)
             try:
-                # Extract text
-                text = self.extractor.extract_text_from_image(image_path)
-                
-                file_result = {
-                    "file_path": image_path,
-                    "file_name": os.path.basename(image_path),
-                    "status": "success",
-                    "text_length": len(text),
-                    "extracted_text": text
-                }
-                
-                # Save individual file if requested
-                if save_individual and text.strip():
-                    output_file = self.get_output_filename(image_path)
-                    self.save_text_file(text, output_file, image_path)
-                    file_result["output_file"] = output_file
-                
-                results["files"].append(file_result)
-                results["processed"] += 1
-                
-                # Add to summary
-                if text.strip():
-                    results["summary_text"] += f"\n--- {os.path.basename(image_path)} ---\n{text}\n"
+                if catch_up:
+                    existing = [f for f in self.find_image_files(input_dir, recursive)
+                                if not journal.is_unchanged(f)]
+                    if existing:
+                        logger.info(f"Catching up on {len(existing)} new or changed files")
+                    debouncer.touch(existing)
                 
+                while not stop_event.is_set():
+                    wait_time = debouncer.next_deadline()
+                    changed = watcher.poll(0.5 if wait_time is None else min(wait_time, 0.5))
+                    debouncer.touch(path for path in changed if is_image(path))
+                    for path in debouncer.ready():
+                        # Backpressure: wait for room in the queue
+                        while not stop_event.is_set():
+                            try:
+                                work.put(path, timeout=0.5)
+                                break
+                            except queue.Full:
+                                continue
             except Exception as e:
-                logger.error(f"Failed to process {image_path}: {e}")
-                file_result = {
-                    "file_path": image_path,
-                    "file_name": os.path.basename(image_path),
-                    "status": "failed",
-                    "error": str(e)
-                }
-                results["files"].append(file_result)
-                results["failed"] += 1
+                logger.error(f"Folder watcher failed: {e}")
+                watch_errors.append(e)
+            finally:
+                watcher.close()
         
-        # Calculate processing time
-        results["processing_time"] = time.time() - start_time
+        watch_thread = threading.Thread(target=watch, name='ocr-folder-watch', daemon=True)
         
-        # Create summary file if requested
-        if create_summary and results["summary_text"]:
-            summary_file = os.path.join(self.output_dir, "batch_summary.txt")
-            self.save_text_file(results["summary_text"], summary_file)
-            results["summary_file"] = summary_file
+        summary_file = os.path.join(self.output_dir, "batch_summary.txt")
+        records_file = os.path.join(self.output_dir, "processing_report.jsonl")
+        summary = SummaryFile(summary_file, append=True) if create_summary else None
+        records_offset = os.path.getsize(records_file) if os.path.exists(records_file) else 0
         
-        # Save processing report
-        report_file = os.path.join(self.output_dir, "processing_report.json")
-        self.save_processing_report(results, report_file)
-        results["report_file"] = report_file
+        # Each file is committed as it lands, so it is searchable right away
+        index = self.open_search_index(enhance, psm, oem, commit_every=1)
+        pool = self.engine.create_pool()
+        max_pending = self.engine.workers * 2
+        pending = {}
+        # Files that changed again while being extracted are redone afterwards
+        changed_in_flight = set()
+        # Summary blocks of earlier results replaced while watching
+        replaced_blocks = []
+        start_time = time.time()
+        journal.open(append=True)
+        watch_thread.start()
         
-        logger.info(f"Batch processing completed: {results['processed']}/{results['total_files']} files processed successfully")
+        try:
+            with journal, open(records_file, 'a', encoding='utf-8') as records:
+                while True:
+                    while not stop_event.is_set() and len(pending) < max_pending:
+                        try:
+                            image_path = work.get(timeout=0.05 if pending else 0.5)
+                        except queue.Empty:
+                            break
+                        if image_path in pending.values():
+                            changed_in_flight.add(image_path)
+                            continue
+                        stats["total_files"] += 1
+                        if journal.is_unchanged(image_path):
+                            stats["skipped"] += 1
+                            continue
+                        future = pool.submit(worker_extract_batch,
+                                             [(image_path, enhance, psm, oem)])
+                        pending[future] = image_path
+                    
+                    if not pending:
+                        if stop_event.is_set() or not watch_thread.is_alive():
+                            break
+                        continue
+                    
+                    finished, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        image_path = pending.pop(future)
+                        file_result = FileResult.from_record(future.result()[0])
+                        previous = journal.get(image_path)
+                        self.store_result(file_result, stats, save_individual, summary,
+                                          updated=previous is not None, index=index)
+                        if summary is not None and previous and previous.get("summary_span"):
+                            replaced_blocks.append(previous["summary_span"])
+                        journal.record(file_result.to_dict(), file_result.signature,
+                                       file_result.summary_span)
+                        records.write(json.dumps(file_result.to_dict(), ensure_ascii=False) + "\n")
+                        records.flush()
+                        stats["processing_time"] = time.time() - start_time
+                        
+                        try:
+                            latency = f" {time.time() - os.path.getmtime(image_path):.1f}s after it landed"
+                        except OSError:
+                            latency = ""
+                        logger.info(f"Processed {file_result.file_name}{latency}")
+                        
+                        if image_path in changed_in_flight:
+                            changed_in_flight.discard(image_path)
+                            if not journal.is_unchanged(image_path):
+                                pending[pool.submit(worker_extract_batch,
+                                                    [(image_path, enhance, psm, oem)])] = image_path
+                        yield file_result
+        finally:
+            stop_event.set()
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=False)
+            watch_thread.join()
+            if summary is not None:
+                summary.close()
+                if replaced_blocks:
+                    self.remove_summary_blocks(summary, journal, replaced_blocks)
+                    journal.compact(list(journal.entries))
+            if index is not None:
+                index.close()
+                stats["index_file"] = index.path
+            
+            stats["processing_time"] = time.time() - start_time
+            stats["records_file"] = records_file
+            stats["timings"] = self.timing_stats.summary()
+            if self.extractor.cascade is not None:
+                stats["cascade"] = self.cascade_stats.summary(self.extractor.min_confidence,
+                                                             len(self.extractor.cascade))
+            report_file = os.path.join(self.output_dir, "processing_report.json")
+            self.save_processing_report(stats, report_file, records_file, records_offset)
+            stats["report_file"] = report_file
+            
+        if watch_errors:
+            raise RuntimeError(f"Folder watcher stopped: {watch_errors[0]}")
+    
+    def remove_summary_blocks(self, summary: SummaryFile, journal: RunJournal,
+                              spans: List[Tuple[int, int]]):
+        """
+        Remove superseded blocks from the summary and point the journal at the rest
         
-        return results
+        Args:
+            summary (SummaryFile): Summary of the run
+            journal (RunJournal): Journal whose entries record each file's block
+            spans (List[Tuple[int, int]]): Blocks to remove
+        """
+        if not spans or not os.path.exists(summary.path):
+            return
+        relocate = summary.remove_blocks(spans)
+        for entry in journal.entries.values():
+            span = entry.get("summary_span")
+            if span:
+                entry["summary_span"] = [relocate(span[0]), span[1]]
+    
+    def store_result(self, file_result: FileResult, stats: Dict[str, Any],
+                     save_individual: bool = True, summary: Optional[SummaryFile] = None,
+                     updated: bool = False, index: Optional[SearchIndex] = None):
+        """
+        Count a newly extracted result in the run totals and write out its text
+        
+        Args:
+            file_result (FileResult): Result of an extraction or duplicate lookup
+            stats (Dict): Running totals to update (self.run_stats)
+            save_individual (bool): Save the text to its own file
+            summary (SummaryFile): Summary to add the text to (None skips it)
+            updated (bool): The file replaces an earlier result in the summary
+            index (SearchIndex): Search index to add the text to (None skips it)
+        """
+        if file_result.cache == "hit":
+            stats["cache_hits"] += 1
+        elif file_result.cache == "miss":
+            stats["cache_misses"] += 1
+        
+        if file_result.stats and "pixels_in" in file_result.stats:
+            stats["pixels_in"] += file_result.stats["pixels_in"]
+            stats["pixels_out"] += file_result.stats["pixels_out"]
+            if file_result.stats["pixels_in"] != file_result.stats["pixels_out"]:
+                stats["rescaled"] += 1
+        
+        if file_result.stats and "ocr_pixel_fraction" in file_result.stats:
+            stats["region_images"] += 1
+            stats["region_pixel_fraction_sum"] += file_result.stats["ocr_pixel_fraction"]
+        
+        if file_result.stats and "cascade" in file_result.stats:
+            self.cascade_stats.add(file_result.stats["cascade"])
+        
+        # Images (or pages) OCRed with each language model picked by script detection
+        for record in file_result.pages or [file_result.stats or {}]:
+            if "language" in record:
+                languages = stats["languages"]
+                languages[record["language"]] = languages.get(record["language"], 0) + 1
+        
+        if file_result.pages:
+            stats["multi_page_files"] += 1
+            stats["pages"] += len(file_result.pages)
+            stats["text_layer_pages"] += sum(
+                1 for page in file_result.pages if page.get("source") == "text_layer")
+        
+        timer = StageTimer(file_result.stats.setdefault("timings", {})
+                           if file_result.stats is not None else {})
+        if file_result.status == "success":
+            text = file_result.text
+            stats["processed"] += 1
+            
+            # Save individual file if requested
+            if save_individual and text.strip():
+                output_file = self.get_output_filename(file_result.file_path)
+                with timer.stage("write"):
+                    self.save_text_file(text, output_file, file_result.file_path)
+                file_result.output_file = output_file
+            
+            # Save word boxes, hOCR and PDF renderings, then let them go
+            if file_result.outputs:
+                base_path = os.path.splitext(self.get_output_filename(file_result.file_path))[0]
+                with timer.stage("write"):
+                    file_result.output_files = self.extractor.save_outputs(file_result.outputs,
+                                                                           base_path)
+                file_result.outputs = None
+            
+            # Add to summary as soon as the text is available
+            if summary is not None and text.strip():
+                header = file_result.file_name
+                if file_result.duplicate_of:
+                    header += f" (same as {os.path.basename(file_result.duplicate_of)})"
+                if updated:
+                    header += " (updated)"
+                with timer.stage("write"):
+                    file_result.summary_span = summary.write(header, text)
+                stats["summary_file"] = summary.path
+            
+            if index is not None:
+                with timer.stage("index"):
+                    index.add(file_result.file_path, text)
+        else:
+            stats["failed"] += 1
+            # A failed re-extraction must not leave the old text searchable
+            if index is not None:
+                index.remove(file_result.file_path)
+        
+        self.timing_stats.add(timer.timings)
+    
+    def is_output_file(self, path: str, directory: str) -> bool:
+        """
+        Check whether a file found while scanning was written by this processor
+        
+        Everything under the output directory (text, rendered PDFs, the run
+        journal, search index and reports) is an output, unless the images
+        themselves are in the output directory; then only the files named
+        after an image (<name>_extracted.<ext>) are.
+        
+        Args:
+            path (str): File path
+            directory (str): Directory being scanned for images
+            
+        Returns:
+            bool: True if the file must not be extracted as an input
+        """
+        output_dir = os.path.abspath(self.output_dir)
+        path = os.path.abspath(path)
+        if not path.startswith(output_dir + os.sep):
+            return False
+        directory = os.path.abspath(directory)
+        if directory != output_dir and not directory.startswith(output_dir + os.sep):
+            return True
+        return (os.path.dirname(path) == output_dir
+                and OUTPUT_NAME_PATTERN.search(os.path.basename(path)) is not None)
     
     def find_image_files(self, directory: str, recursive: bool = True) -> List[str]:
         """
-        Find all image files in directory
+        Find all image files in directory, leaving out this processor's outputs
         
         Args:
             directory (str): Directory to search
@@ -140,7 +795,8 @@ class BatchProcessor:
             List[str]: List of image file paths
         """
         image_files = []
-        supported_formats = {'.png', '.jpg', '.jpeg', '.tiff', '.bmp', '.gif', '.webp'}
+        supported_formats = {'.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp', '.gif', '.webp',
+                             '.pdf'}
         
         if recursive:
             for root, dirs, files in os.walk(directory):
@@ -154,7 +810,66 @@ class BatchProcessor:
                     os.path.splitext(file)[1].lower() in supported_formats):
                     image_files.append(file_path)
         
-        return sorted(image_files)
+        return sorted(path for path in image_files if not self.is_output_file(path, directory))
+    
+    def find_duplicates(self, image_files: List[str], max_distance: int) -> Dict[str, str]:
+        """
+        Hash images and cluster near-duplicates
+        
+        Args:
+            image_files (List[str]): Image paths in processing order
+            max_distance (int): Largest Hamming distance counted as a duplicate
+            
+        Returns:
+            Dict[str, str]: Maps each duplicate's path to its representative's path
+        """
+        start = time.time()
+        hashes = zip(image_files, self.engine.imap_calls(try_dhash, image_files))
+        duplicates = find_near_duplicates(hashes, max_distance)
+        logger.info(f"Hashed {len(image_files)} images in {time.time() - start:.2f}s: "
+                    f"{len(duplicates)} near-duplicates will reuse a representative's text")
+        return duplicates
+    
+    def get_duplicate_result(self, image_path: str, representative: str,
+                             shared_texts: Dict[str, str],
+                             remaining: Dict[str, int]) -> FileResult:
+        """
+        Build a result for a near-duplicate from its representative's text
+        
+        Args:
+            image_path (str): Duplicate image path
+            representative (str): Path of the image that was OCRed in its place
+            shared_texts (Dict[str, str]): Texts of successfully OCRed representatives
+            remaining (Dict[str, int]): Duplicates still to be written per representative
+            
+        Returns:
+            FileResult: Per-file result for the duplicate
+        """
+        remaining[representative] -= 1
+        if remaining[representative]:
+            text = shared_texts.get(representative)
+        else:
+            text = shared_texts.pop(representative, None)
+        
+        if text is None:
+            return FileResult(image_path, "failed", duplicate_of=representative,
+                              error=f"Representative {os.path.basename(representative)} failed")
+        return FileResult(image_path, "success", text=text, text_length=len(text),
+                          duplicate_of=representative)
+    
+    def get_journal_result(self, entry: Dict[str, Any]) -> FileResult:
+        """
+        Build a result for a file carried over from the run journal
+        
+        Args:
+            entry (Dict): Run journal entry
+            
+        Returns:
+            FileResult: Per-file result without text
+        """
+        file_result = FileResult.from_record(entry)
+        file_result.skipped = True
+        return file_result
     
     def get_output_filename(self, image_path: str) -> str:
         """
@@ -169,7 +884,8 @@ class BatchProcessor:
         base_name = os.path.splitext(os.path.basename(image_path))[0]
         return os.path.join(self.output_dir, f"{base_name}_extracted.txt")
     
-    def save_text_file(self, text: str, output_path: str, source_image: str = None):
+    def save_text_file(self, text: str, output_path: str, source_image: str = None,
+                       append: bool = False):
         """
         Save extracted text to file with metadata
         
@@ -177,9 +893,10 @@ class BatchProcessor:
             text (str): Extracted text
             output_path (str): Output file path
             source_image (str): Source image path (optional)
+            append (bool): Append to the file instead of overwriting it
         """
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
+            with open(output_path, 'a' if append else 'w', encoding='utf-8') as f:
                 if source_image:
                     f.write(f"Extracted from: {source_image}\n")
                     f.write(f"Extraction time: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
@@ -191,13 +908,17 @@ class BatchProcessor:
         except Exception as e:
             logger.error(f"Failed to save text file {output_path}: {e}")
     
-    def save_processing_report(self, results: Dict[str, Any], report_path: str):
+    def save_processing_report(self, results: Dict[str, Any], report_path: str,
+                               records_path: str = None, records_offset: int = 0):
         """
         Save processing report as JSON
         
         Args:
             results (Dict): Processing results
             report_path (str): Report file path
+            records_path (str): JSON-lines file to stream per-file records from
+                (default: use results["files"])
+            records_offset (int): Byte offset of this run's first record in records_path
         """
         try:
             # Create a simplified report for JSON serialization
@@ -206,27 +927,129 @@ class BatchProcessor:
                 "total_files": results["total_files"],
                 "processed_successfully": results["processed"],
                 "failed": results["failed"],
+                "skipped_unchanged": results.get("skipped", 0),
                 "processing_time_seconds": round(results["processing_time"], 2),
                 "output_directory": self.output_dir,
                 "language": self.extractor.language,
-                "files": [
-                    {
-                        "file_name": f["file_name"],
-                        "status": f["status"],
-                        "text_length": f.get("text_length", 0),
-                        "error": f.get("error", None)
-                    }
-                    for f in results["files"]
-                ]
+                "workers": self.engine.workers,
+                "engine": self.extractor.engine.name,
+                "preprocess": self.extractor.pipeline.describe(),
+                "cache": {
+                    "enabled": self.extractor.cache is not None,
+                    "hits": results.get("cache_hits", 0),
+                    "misses": results.get("cache_misses", 0)
+                },
+                "rescale": {
+                    "enabled": self.extractor.pipeline.rescale.enabled,
+                    "images_rescaled": results.get("rescaled", 0),
+                    "pixels_in": results.get("pixels_in", 0),
+                    "pixels_out": results.get("pixels_out", 0),
+                    "pixels_saved": results.get("pixels_in", 0) - results.get("pixels_out", 0)
+                },
+                "regions": {
+                    "enabled": self.extractor.detect_regions,
+                    "images": results.get("region_images", 0),
+                    "mean_ocr_pixel_fraction": round(
+                        results.get("region_pixel_fraction_sum", 0.0) / results["region_images"], 4)
+                        if results.get("region_images") else None
+                },
+                "timings_ms": results.get("timings", {}),
+                "multi_page": {
+                    "files": results.get("multi_page_files", 0),
+                    "pages": results.get("pages", 0),
+                    "pdf_text_layer_pages": results.get("text_layer_pages", 0),
+                    "split_across_workers": self.engine.split_pages and self.engine.workers > 1
+                },
+                "cascade": results.get("cascade", {"enabled": False}),
+                "auto_language": {
+                    "enabled": bool(self.extractor.languages),
+                    "candidates": list(self.extractor.languages),
+                    "images_per_language": results.get("languages", {})
+                },
+                "dedupe": {
+                    "enabled": results.get("dedupe_distance") is not None,
+                    "max_distance": results.get("dedupe_distance"),
+                    "duplicates": results.get("duplicates", 0)
+                },
+                "search_index": results.get("index_file")
             }
             
+            # Per-file records are copied one at a time, never held in memory together
             with open(report_path, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+                f.write(json.dumps(report, indent=2, ensure_ascii=False)[:-2])
+                f.write(',\n  "files": [')
+                for i, record in enumerate(self.iter_report_records(results, records_path,
+                                                                    records_offset)):
+                    f.write(',\n    ' if i else '\n    ')
+                    f.write(json.dumps(record, ensure_ascii=False))
+                f.write('\n  ]\n}\n')
             
             logger.info(f"Processing report saved to: {report_path}")
             
         except Exception as e:
             logger.error(f"Failed to save processing report: {e}")
+    
+    def iter_report_records(self, results: Dict[str, Any], records_path: str = None,
+                            records_offset: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate the per-file records that go into the processing report
+        
+        Args:
+            results (Dict): Processing results
+            records_path (str): JSON-lines records file (optional)
+            records_offset (int): Byte offset to start reading records_path from
+            
+        Yields:
+            Dict: Per-file report record
+        """
+        if records_path is None:
+            for f in results.get("files", []):
+                yield f.to_dict() if isinstance(f, FileResult) else f
+            return
+        
+        with open(records_path, 'r', encoding='utf-8') as f:
+            f.seek(records_offset)
+            for line in f:
+                yield json.loads(line)
+
+def non_negative_int(value: str) -> int:
+    """argparse type for counts and distances that cannot be negative"""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {number}")
+    return number
+
+def watch_directory(processor: BatchProcessor, args: argparse.Namespace):
+    """Run watch mode from the command line until interrupted"""
+    print(f"Watching {args.input_dir} for new images (press Ctrl+C to stop)...")
+    stop_event = threading.Event()
+    try:
+        for file_result in processor.watch_directory(
+            input_dir=args.input_dir,
+            recursive=not args.no_recursive,
+            save_individual=not args.no_individual,
+            create_summary=not args.no_summary,
+            settle=args.settle,
+            queue_size=args.queue_size,
+            polling=args.polling,
+            poll_interval=args.poll_interval,
+            stop_event=stop_event
+        ):
+            if file_result.status == 'failed':
+                print(f"Failed: {file_result.file_name}: {file_result.error or 'Unknown error'}")
+    except KeyboardInterrupt:
+        stop_event.set()
+    
+    results = processor.run_stats
+    print("\nWatch Summary:")
+    print("-" * 40)
+    print(f"Files extracted: {results['processed']}")
+    print(f"Failed: {results['failed']}")
+    if results.get('skipped'):
+        print(f"Skipped (unchanged): {results['skipped']}")
+    print(f"Output directory: {processor.output_dir}")
+    if results.get('report_file'):
+        print(f"Detailed report: {results['report_file']}")
 
 def main():
     """Command line interface for batch processing"""
@@ -242,8 +1065,46 @@ def main():
                        help='Do not save individual text files for each image')
     parser.add_argument('--no-summary', action='store_true',
                        help='Do not create summary file with all extracted text')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                       help='Number of OCR worker processes (0 = one per CPU core, default: 1)')
+    add_extractor_arguments(parser)
+    run_mode = parser.add_mutually_exclusive_group()
+    run_mode.add_argument('--resume', action='store_true',
+                       help='Continue an interrupted run, skipping files already extracted')
+    run_mode.add_argument('--incremental', action='store_true',
+                       help='Only extract new or modified files and merge them into existing results')
+    run_mode.add_argument('--watch', action='store_true',
+                       help='Keep running and extract images as they are added or changed '
+                            '(stop with Ctrl+C)')
+    parser.add_argument('--settle', type=float, default=1.0,
+                       help='With --watch: seconds a file must stop changing before it is read '
+                            '(default: 1.0)')
+    parser.add_argument('--queue-size', type=int, default=64,
+                       help='With --watch: most settled files waiting for a worker before the '
+                            'watcher waits for workers to catch up (default: 64)')
+    parser.add_argument('--polling', action='store_true',
+                       help='With --watch: rescan the folder instead of using inotify '
+                            '(for network shares)')
+    parser.add_argument('--poll-interval', type=float, default=2.0,
+                       help='With --watch: seconds between rescans when polling (default: 2.0)')
+    parser.add_argument('--profile', action='store_true',
+                       help='Write cProfile stats of the main process (profile.pstats) and '
+                            'Prometheus textfile metrics (metrics.prom) to the output directory')
+    parser.add_argument('--no-split-pages', action='store_true',
+                       help='OCR each multi-page TIFF or PDF on a single worker instead of '
+                            'spreading its pages across workers')
+    parser.add_argument('--no-index', action='store_true',
+                       help=f'Do not update the full-text search index ({INDEX_FILENAME}) '
+                            'used by ocr-search')
+    parser.add_argument('--dedupe', type=non_negative_int, nargs='?', const=DEFAULT_MAX_DISTANCE,
+                       metavar='DISTANCE',
+                       help='OCR one image per group of near-duplicates and reuse its text '
+                            f'(max perceptual-hash distance, default: {DEFAULT_MAX_DISTANCE})')
     
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.watch and (args.dedupe is not None or args.profile):
+        parser.error("--dedupe and --profile cannot be combined with --watch")
     
     # Validate input directory
     if not os.path.isdir(args.input_dir):
@@ -252,15 +1113,45 @@ def main():
     
     try:
         # Initialize batch processor
-        processor = BatchProcessor(language=args.language, output_dir=args.output)
+        processor = BatchProcessor(output_dir=args.output, workers=args.workers,
+                                   extractor=create_extractor(args),
+                                   split_pages=not args.no_split_pages,
+                                   search_index=not args.no_index)
+        
+        if args.watch:
+            watch_directory(processor, args)
+            return
+        
+        profiler = None
+        if args.profile:
+            profiler = cProfile.Profile()
+            profiler.enable()
         
-        # Process directory
-        results = processor.process_directory(
+        # Process directory, streaming results so memory stays flat on huge runs
+        failed_files = []
+        for file_result in processor.iter_directory(
             input_dir=args.input_dir,
             recursive=not args.no_recursive,
             save_individual=not args.no_individual,
-            create_summary=not args.no_summary
-        )
+            create_summary=not args.no_summary,
+            resume=args.resume,
+            incremental=args.incremental,
+            dedupe=args.dedupe
+        ):
+            if file_result.status == 'failed':
+                failed_files.append((file_result.file_name, file_result.error))
+        
+        results = processor.run_stats
+        if not results['total_files']:
+            print("No supported image files found in directory")
+            return
+        
+        if profiler is not None:
+            profiler.disable()
+            profile_file = os.path.join(processor.output_dir, "profile.pstats")
+            profiler.dump_stats(profile_file)
+            metrics_file = os.path.join(processor.output_dir, "metrics.prom")
+            write_prometheus_textfile(metrics_file, results, results.get('timings', {}))
         
         # Print summary
         print("\nBatch Processing Summary:")
@@ -268,7 +1159,37 @@ def main():
         print(f"Total files found: {results['total_files']}")
         print(f"Successfully processed: {results['processed']}")
         print(f"Failed: {results['failed']}")
+        if results.get('skipped'):
+            print(f"Skipped (already extracted): {results['skipped']}")
         print(f"Processing time: {results['processing_time']:.2f} seconds")
+        if results.get('pages'):
+            print(f"Pages from multi-page images: {results['pages']} "
+                  f"in {results['multi_page_files']} files")
+        if results.get('text_layer_pages'):
+            print(f"PDF pages read from text layer (no OCR): {results['text_layer_pages']}")
+        if results.get('duplicates'):
+            print(f"Near-duplicates reusing text: {results['duplicates']}")
+        cascade = results.get('cascade')
+        if cascade and cascade['images']:
+            tiers = ", ".join(f"{tier}: {count}" for tier, count in cascade['final_tier'].items())
+            print(f"Adaptive OCR tiers used: {tiers}")
+            if cascade['empty_images']:
+                print(f"Images with no text found: {cascade['empty_images']}")
+            timings = ", ".join(f"{tier}: {runs} runs, {cascade['mean_ms'][tier]:.0f} ms mean"
+                                for tier, runs in cascade['runs'].items())
+            print(f"Adaptive OCR time per tier: {timings}")
+            if cascade['tier_runs_avoided_fraction'] is not None:
+                print(f"Adaptive OCR saved {cascade['tier_runs_avoided']} of "
+                      f"{cascade['tier_runs'] + cascade['tier_runs_avoided']} tier runs "
+                      f"({cascade['tier_runs_avoided_fraction']:.0%}); "
+                      f"{cascade['first_tier_only']} images needed only the first tier "
+                      f"({cascade['first_tier_only_ms'] / 1000:.1f}s)")
+        if results.get('languages'):
+            languages = ", ".join(f"{language}: {count}"
+                                  for language, count in results['languages'].items())
+            print(f"Detected languages: {languages}")
+        if processor.extractor.cache is not None:
+            print(f"Cache hits/misses: {results['cache_hits']}/{results['cache_misses']}")
         print(f"Output directory: {processor.output_dir}")
         
         if results.get('summary_file'):
@@ -277,12 +1198,25 @@ def main():
         if results.get('report_file'):
             print(f"Detailed report: {results['report_file']}")
         
+        if results.get('index_file'):
+            print(f"Search index: {results['index_file']} "
+                  f"(search with: ocr-search -d {processor.output_dir} WORDS)")
+        
+        if profiler is not None:
+            print(f"Profile: {profile_file} (view with: python -m pstats {profile_file})")
+            print(f"Metrics: {metrics_file}")
+            print("\nStage timings (ms):")
+            print(f"  {'stage':<10}{'files':>8}{'p50':>10}{'p95':>10}{'max':>10}{'total':>12}")
+            for name, stage in sorted(results.get('timings', {}).items(),
+                                      key=lambda item: -item[1]['total_ms']):
+                print(f"  {name:<10}{stage['count']:>8}{stage['p50_ms']:>10.1f}"
+                      f"{stage['p95_ms']:>10.1f}{stage['max_ms']:>10.1f}{stage['total_ms']:>12.1f}")
+        
         # Show failed files if any
         if results['failed'] > 0:
             print("\nFailed files:")
-            for file_info in results['files']:
-                if file_info['status'] == 'failed':
-                    print(f"  - {file_info['file_name']}: {file_info.get('error', 'Unknown error')}")
+            for file_name, error in failed_files:
+                print(f"  - {file_name}: {error or 'Unknown error'}")
     
     except Exception as e:
         logger.error(f"Batch processing failed: {e}")
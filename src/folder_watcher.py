@@ -0,0 +1,298 @@
+"""
+Folder Watcher - Notice new and changed files with inotify, or by polling
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import logging
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def scan_files(root: str, recursive: bool = True) -> Iterator[str]:
+    """Yield every file under a directory"""
+    if recursive:
+        for directory, _, files in os.walk(root):
+            for name in files:
+                yield os.path.join(directory, name)
+    else:
+        for name in os.listdir(root):
+            path = os.path.join(root, name)
+            if os.path.isfile(path):
+                yield path
+
+
+class PollingWatcher:
+    """Detects new and changed files by rescanning a directory tree"""
+
+    name = "polling"
+
+    def __init__(self, root: str, recursive: bool = True, interval: float = 2.0):
+        """
+        Initialize polling watcher
+
+        Args:
+            root (str): Directory to watch
+            recursive (bool): Include subdirectories
+            interval (float): Seconds between scans
+        """
+        self.root = root
+        self.recursive = recursive
+        self.interval = interval
+        self._snapshot = self._scan()
+        self._next_scan = time.monotonic() + interval
+
+    def _scan(self) -> Dict[str, Tuple[int, float]]:
+        snapshot = {}
+        for path in scan_files(self.root, self.recursive):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_size, stat.st_mtime)
+        return snapshot
+
+    def poll(self, timeout: float) -> List[str]:
+        """
+        Wait up to timeout seconds and return files created or changed since the last call
+
+        Args:
+            timeout (float): Longest time to wait, in seconds
+
+        Returns:
+            List[str]: Changed file paths
+        """
+        delay = self._next_scan - time.monotonic()
+        if delay > timeout:
+            time.sleep(timeout)
+            return []
+        if delay > 0:
+            time.sleep(delay)
+
+        snapshot = self._scan()
+        changed = [path for path, signature in snapshot.items()
+                   if self._snapshot.get(path) != signature]
+        self._snapshot = snapshot
+        self._next_scan = time.monotonic() + self.interval
+        return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Receives file events from the Linux kernel through inotify (via ctypes)"""
+
+    name = "inotify"
+
+    WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF
+
+    def __init__(self, root: str, recursive: bool = True):
+        """
+        Initialize inotify watcher
+
+        Args:
+            root (str): Directory to watch
+            recursive (bool): Include subdirectories, including ones created later
+        """
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.root = root
+        self.recursive = recursive
+        self._dirs: Dict[int, str] = {}
+        # Files found in directories created after the watch started
+        self._found: List[str] = []
+        self._add_tree(root)
+
+    def _add_watch(self, directory: str) -> bool:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error == errno.ENOSPC:
+                raise OSError(error, "inotify watch limit reached "
+                                     "(raise fs.inotify.max_user_watches)")
+            logger.warning(f"Cannot watch {directory}: {os.strerror(error)}")
+            return False
+        self._dirs[wd] = directory
+        return True
+
+    def _add_tree(self, root: str):
+        self._add_watch(root)
+        if self.recursive:
+            for directory, subdirs, _ in os.walk(root):
+                for name in subdirs:
+                    self._add_watch(os.path.join(directory, name))
+
+    def poll(self, timeout: float) -> List[str]:
+        """
+        Wait up to timeout seconds and return files created or changed since the last call
+
+        Args:
+            timeout (float): Longest time to wait, in seconds
+
+        Returns:
+            List[str]: Changed file paths
+        """
+        changed, self._found = self._found, []
+        if not changed:
+            readable, _, _ = select.select([self._fd], [], [], timeout)
+            if not readable:
+                return []
+
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped; rescan so nothing is missed
+                    logger.warning("inotify queue overflowed, rescanning watched folders")
+                    changed.extend(scan_files(self.root, self.recursive))
+                    continue
+                if mask & IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+
+                directory = self._dirs.get(wd)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, os.fsdecode(name))
+                if mask & IN_ISDIR:
+                    if self.recursive and mask & (IN_CREATE | IN_MOVED_TO):
+                        # Files may land before the new directory's watch exists
+                        self._add_tree(path)
+                        changed.extend(scan_files(path))
+                else:
+                    changed.append(path)
+        return changed
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(root: str, recursive: bool = True, polling: bool = False,
+                   poll_interval: float = 2.0):
+    """
+    Create an inotify watcher, falling back to polling where inotify is unavailable
+
+    Args:
+        root (str): Directory to watch
+        recursive (bool): Include subdirectories
+        polling (bool): Always poll (for network shares, where inotify sees no remote writes)
+        poll_interval (float): Seconds between scans when polling
+
+    Returns:
+        InotifyWatcher or PollingWatcher: Watcher with poll(timeout) and close()
+    """
+    if not polling:
+        try:
+            return InotifyWatcher(root, recursive)
+        except (OSError, AttributeError) as e:
+            logger.info(f"inotify unavailable ({e}), polling every {poll_interval}s instead")
+    return PollingWatcher(root, recursive, poll_interval)
+
+
+class Debouncer:
+    """
+    Holds back files until they stop changing
+
+    A file is ready once no event has arrived for it for `settle` seconds
+    and its size and modification time have not changed over that time,
+    so files still being written or copied are not read half-finished.
+    """
+
+    def __init__(self, settle: float = 1.0):
+        """
+        Initialize debouncer
+
+        Args:
+            settle (float): Seconds a file must stay unchanged before it is ready
+        """
+        self.settle = settle
+        self._pending: Dict[str, Tuple[float, Optional[Tuple[int, float]]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def touch(self, paths: Iterable[str]):
+        """Record that files changed just now"""
+        now = time.monotonic()
+        for path in paths:
+            self._pending[path] = (now, self._signature(path))
+
+    @staticmethod
+    def _signature(path: str) -> Optional[Tuple[int, float]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime
+
+    def ready(self) -> List[str]:
+        """
+        Take the files that have settled
+
+        Returns:
+            List[str]: Settled file paths, oldest first (deleted files are dropped)
+        """
+        now = time.monotonic()
+        settled: Set[str] = set()
+        ready = []
+        for path, (seen, signature) in sorted(self._pending.items(), key=lambda item: item[1][0]):
+            if now - seen < self.settle:
+                continue
+            current = self._signature(path)
+            if current is None:
+                settled.add(path)
+            elif current != signature:
+                # Still growing without events (e.g. on a network share): wait again
+                self._pending[path] = (now, current)
+            else:
+                settled.add(path)
+                ready.append(path)
+        for path in settled:
+            del self._pending[path]
+        return ready
+
+    def next_deadline(self) -> Optional[float]:
+        """Seconds until the earliest pending file could settle, or None if none are pending"""
+        if not self._pending:
+            return None
+        oldest = min(seen for seen, _ in self._pending.values())
+        return max(0.0, oldest + self.settle - time.monotonic())
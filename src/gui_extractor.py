@@ -5,10 +5,18 @@ GUI OCR Text Extractor - User-friendly interface for text extraction
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, ttk
 import threading
+import queue
+import time
 import os
+import logging
 from ocr_extractor import OCRExtractor
 import pyperclip
 
+logger = logging.getLogger(__name__)
+
+# How often the results of finished files are moved into the window
+POLL_INTERVAL_MS = 100
+
 class OCRExtractorGUI:
     """GUI application for OCR text extraction"""
     
@@ -22,6 +30,11 @@ class OCRExtractorGUI:
         self.extractor = None
         self.current_text = ""
         
+        # Extraction run state, shared with the worker thread through the queue
+        self.results = queue.Queue()
+        self.stop_event = threading.Event()
+        self.run_texts = []
+        
         # Setup GUI
         self.setup_gui()
         
@@ -81,20 +94,30 @@ class OCRExtractorGUI:
         ttk.Checkbutton(options_frame, text="Enhance image quality", 
                        variable=self.enhance_var).grid(row=0, column=2, sticky=tk.W)
         
+        # Parallel workers for multiple images (0 = one per CPU core)
+        ttk.Label(options_frame, text="Workers:").grid(row=0, column=3, sticky=tk.W, padx=(20, 0))
+        self.workers_var = tk.IntVar(value=os.cpu_count() or 1)
+        ttk.Spinbox(options_frame, from_=0, to=max(64, os.cpu_count() or 1), width=5,
+                    textvariable=self.workers_var).grid(row=0, column=4, padx=(10, 0), sticky=tk.W)
+        
         # Process button
         process_frame = ttk.Frame(main_frame)
         process_frame.grid(row=3, column=0, columnspan=3, pady=(0, 10))
         
         self.process_button = ttk.Button(process_frame, text="Extract Text", 
                                         command=self.start_extraction, style='Accent.TButton')
-        self.process_button.pack(pady=5)
+        self.process_button.pack(side=tk.TOP, pady=5)
         
-        # Progress bar
+        self.cancel_button = ttk.Button(process_frame, text="Cancel", state='disabled',
+                                       command=self.cancel_extraction)
+        self.cancel_button.pack(side=tk.TOP)
+        
+        # Progress bar, advanced once per finished file
         self.progress_var = tk.StringVar(value="Ready")
         self.progress_label = ttk.Label(process_frame, textvariable=self.progress_var)
         self.progress_label.pack(pady=(5, 0))
         
-        self.progress_bar = ttk.Progressbar(process_frame, mode='indeterminate')
+        self.progress_bar = ttk.Progressbar(process_frame, mode='determinate', length=400)
         self.progress_bar.pack(pady=(5, 0), fill=tk.X, padx=50)
         
         # Results section
@@ -147,7 +170,7 @@ class OCRExtractorGUI:
         file_path = filedialog.askopenfilename(
             title="Select Image File",
             filetypes=[
-                ("Image files", "*.png *.jpg *.jpeg *.tiff *.bmp *.gif *.webp"),
+                ("Image files", "*.png *.jpg *.jpeg *.tif *.tiff *.bmp *.gif *.webp *.pdf"),
                 ("PNG files", "*.png"),
                 ("JPEG files", "*.jpg *.jpeg"),
                 ("All files", "*.*")
@@ -164,7 +187,7 @@ class OCRExtractorGUI:
         file_paths = filedialog.askopenfilenames(
             title="Select Image Files",
             filetypes=[
-                ("Image files", "*.png *.jpg *.jpeg *.tiff *.bmp *.gif *.webp"),
+                ("Image files", "*.png *.jpg *.jpeg *.tif *.tiff *.bmp *.gif *.webp *.pdf"),
                 ("PNG files", "*.png"),
                 ("JPEG files", "*.jpg *.jpeg"),
                 ("All files", "*.*")
@@ -187,7 +210,7 @@ class OCRExtractorGUI:
         if dir_path:
             # Find all image files in directory
             image_files = []
-            supported_formats = {'.png', '.jpg', '.jpeg', '.tiff', '.bmp', '.gif', '.webp'}
+            supported_formats = {'.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp', '.gif', '.webp', '.pdf'}
             
             for root, dirs, files in os.walk(dir_path):
                 for file in files:
@@ -204,7 +227,7 @@ class OCRExtractorGUI:
                 self.status_var.set("No images found in directory")
     
     def start_extraction(self):
-        """Start text extraction in a separate thread"""
+        """Start text extraction on a worker thread, streaming results into the window"""
         if not hasattr(self, 'selected_files') or not self.selected_files:
             messagebox.showwarning("No Files Selected", "Please select image files first.")
             return
@@ -218,58 +241,148 @@ class OCRExtractorGUI:
         if self.extractor.language != self.language_var.get():
             self.extractor.language = self.language_var.get()
         
-        # Disable process button and show progress
+        # Disable process button, enable cancel and reset the display
         self.process_button.configure(state='disabled')
-        self.progress_bar.start()
-        self.progress_var.set("Processing images...")
+        self.cancel_button.configure(state='normal')
+        self.progress_bar.configure(maximum=len(self.selected_files), value=0)
+        self.progress_var.set(f"Processing 0/{len(self.selected_files)} files...")
         self.status_var.set("Extracting text...")
+        self.text_display.delete(1.0, tk.END)
+        self.current_text = ""
+        self.run_texts = []
+        self.run_done = 0
+        self.run_failed = 0
+        self.run_start = time.perf_counter()
+        
+        # A fresh queue and event per run, so a cancelled run's thread cannot
+        # feed results into the next one
+        self.results = queue.Queue()
+        self.stop_event = threading.Event()
         
         # Start extraction in separate thread
-        thread = threading.Thread(target=self.extract_text_thread)
+        thread = threading.Thread(target=self.extract_text_thread,
+                                  args=(list(self.selected_files), self.enhance_var.get(),
+                                        self.get_workers(), self.results, self.stop_event))
         thread.daemon = True
         thread.start()
+        self.root.after(POLL_INTERVAL_MS, self.poll_results, self.results)
     
-    def extract_text_thread(self):
-        """Extract text in a separate thread"""
+    def extract_text_thread(self, image_paths, enhance, workers, results, stop_event):
+        """
+        Extract text in a separate thread, queueing each file's record as it finishes
+        
+        Files are spread over a pool of worker processes (see ParallelEngine),
+        never more than there are files, so a single image is OCRed in this
+        thread with every core available to Tesseract. Records are queued in
+        input order; a final None marks the end of the run, preceded by an
+        ("error", message) item if it failed.
+        """
+        from parallel_engine import ParallelEngine, resolve_workers
+        
         try:
-            if len(self.selected_files) == 1:
-                # Single file
-                text = self.extractor.extract_text_from_image(
-                    self.selected_files[0], 
-                    enhance=self.enhance_var.get()
-                )
-            else:
-                # Multiple files
-                text = self.extractor.extract_text_from_multiple_images(
-                    self.selected_files, 
-                    combine=True
-                )
-            
-            # Update GUI in main thread
-            self.root.after(0, self.extraction_complete, text, None)
-            
+            workers = min(resolve_workers(workers), len(image_paths))
+            engine = ParallelEngine(self.extractor, workers=workers)
+            for record in engine.imap(image_paths, enhance=enhance, stop_event=stop_event):
+                results.put(record)
         except Exception as e:
-            # Update GUI in main thread with error
-            self.root.after(0, self.extraction_complete, None, str(e))
+            results.put(("error", str(e)))
+        results.put(None)
+    
+    def poll_results(self, results):
+        """Move the records of finished files into the window, in one batch per poll"""
+        if results is not self.results:
+            return
+        
+        texts = []
+        finished = False
+        error = None
+        while True:
+            try:
+                record = results.get_nowait()
+            except queue.Empty:
+                break
+            if record is None:
+                finished = True
+                break
+            if isinstance(record, tuple):
+                error = record[1]
+                continue
+            
+            self.run_done += 1
+            if record["status"] != "success":
+                self.run_failed += 1
+                logger.warning(f"Failed to process {record['file_path']}: {record['error']}")
+                continue
+            text = record["extracted_text"]
+            if len(self.selected_files) > 1:
+                text = f"--- Image {self.run_done}: {record['file_name']} ---\n{text}\n"
+            texts.append(text)
+        
+        if texts:
+            # One insert per poll keeps Tk responsive with thousands of files
+            chunk = "\n".join(texts) + "\n"
+            self.run_texts.append(chunk)
+            self.text_display.insert(tk.END, chunk)
+            self.text_display.see(tk.END)
+        self.update_progress()
+        
+        if finished:
+            self.extraction_complete(error)
+        else:
+            self.root.after(POLL_INTERVAL_MS, self.poll_results, results)
+    
+    def update_progress(self):
+        """Show files done, throughput and the estimated time left"""
+        total = len(self.selected_files)
+        self.progress_bar.configure(value=self.run_done)
+        elapsed = time.perf_counter() - self.run_start
+        if not self.run_done or elapsed <= 0:
+            return
+        rate = self.run_done / elapsed
+        remaining = (total - self.run_done) / rate
+        failed = f", {self.run_failed} failed" if self.run_failed else ""
+        prefix = "Cancelling" if self.stop_event.is_set() else "Processing"
+        self.progress_var.set(f"{prefix} {self.run_done}/{total} files{failed} - "
+                              f"{rate:.1f} files/s, ETA {format_duration(remaining)}")
     
-    def extraction_complete(self, text, error):
+    def cancel_extraction(self):
+        """Stop queuing work; files already being read finish first"""
+        self.stop_event.set()
+        self.cancel_button.configure(state='disabled')
+        self.progress_var.set("Cancelling...")
+        self.status_var.set("Cancelling - waiting for files in progress")
+    
+    def get_workers(self):
+        """Read the worker count setting, falling back to one per CPU core"""
+        try:
+            return max(0, int(self.workers_var.get()))
+        except (tk.TclError, ValueError):
+            return 0
+    
+    def extraction_complete(self, error):
         """Handle extraction completion"""
-        # Stop progress bar and re-enable button
-        self.progress_bar.stop()
+        # Re-enable the process button
         self.process_button.configure(state='normal')
+        self.cancel_button.configure(state='disabled')
+        
+        total = len(self.selected_files)
+        elapsed = format_duration(time.perf_counter() - self.run_start)
+        text = "".join(self.run_texts)
+        self.current_text = text
+        failed = f" ({self.run_failed} failed)" if self.run_failed else ""
         
         if error:
             self.progress_var.set("Extraction failed")
             self.status_var.set(f"Error: {error}")
             messagebox.showerror("Extraction Error", f"Failed to extract text:\n{error}")
-        elif text and text.strip():
-            self.current_text = text
-            self.text_display.delete(1.0, tk.END)
-            self.text_display.insert(1.0, text)
-            self.progress_var.set("Extraction completed successfully")
-            self.status_var.set(f"Extracted {len(text)} characters from {len(self.selected_files)} file(s)")
+        elif self.stop_event.is_set():
+            self.progress_var.set(f"Cancelled after {self.run_done}/{total} files{failed}")
+            self.status_var.set(f"Extraction cancelled - {len(text)} characters extracted")
+        elif text.strip():
+            self.progress_var.set(f"Extraction completed in {elapsed}{failed}")
+            self.status_var.set(f"Extracted {len(text)} characters from {total} file(s)")
         else:
-            self.progress_var.set("No text found")
+            self.progress_var.set(f"No text found{failed}")
             self.status_var.set("No text could be extracted from the selected images")
             self.text_display.delete(1.0, tk.END)
             self.text_display.insert(1.0, "No text could be extracted from the selected images.")
@@ -317,8 +430,15 @@ class OCRExtractorGUI:
         self.current_text = ""
         self.status_var.set("Text cleared")
 
+def format_duration(seconds: float) -> str:
+    """Format seconds as m:ss, or h:mm:ss for an hour or more"""
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
 def main():
     """Run the GUI application"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     root = tk.Tk()
     app = OCRExtractorGUI(root)
     
@@ -0,0 +1,160 @@
+"""
+Image Hashing - Perceptual hashes for finding near-duplicate screenshots
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from preprocessing import count_frames
+
+logger = logging.getLogger(__name__)
+
+# 16x16 gradient bits: coarse enough to ignore re-encoding noise, fine enough
+# that different text in the same window layout still changes the hash
+DEFAULT_HASH_SIZE = 16
+DEFAULT_MAX_DISTANCE = 6
+
+
+def dhash(image_path: str, hash_size: int = DEFAULT_HASH_SIZE) -> int:
+    """
+    Compute the difference hash of an image
+
+    The image is shrunk to (hash_size + 1) x hash_size grayscale pixels and
+    each bit records whether brightness increases from left to right.
+
+    Args:
+        image_path (str): Path to the image file
+        hash_size (int): Hash side length; the hash has hash_size ** 2 bits
+
+    Returns:
+        int: Hash bits packed into an integer
+    """
+    with Image.open(image_path) as image:
+        # Let JPEG decode at reduced size; other formats ignore the hint
+        image.draft('L', (hash_size * 8, hash_size * 8))
+        small = image.convert('L').resize((hash_size + 1, hash_size), Image.BILINEAR)
+
+    pixels = np.asarray(small, dtype=np.int16)
+    bits = pixels[:, 1:] > pixels[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def try_dhash(image_path: str, hash_size: int = DEFAULT_HASH_SIZE) -> Optional[int]:
+    """
+    Compute the difference hash of an image, or None if it cannot be read
+
+    PDFs, multi-page and animated images also get None: a hash of the first
+    frame says nothing about the pages after it.
+
+    Args:
+        image_path (str): Path to the image file
+        hash_size (int): Hash side length
+
+    Returns:
+        int: Hash, or None for unreadable and multi-frame images
+    """
+    try:
+        if image_path.lower().endswith('.pdf') or count_frames(image_path) > 1:
+            return None
+        return dhash(image_path, hash_size)
+    except Exception as e:
+        logger.warning(f"Could not hash {image_path}: {e}")
+        return None
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two hashes"""
+    return bin(a ^ b).count('1')
+
+
+class NearDuplicateIndex:
+    """
+    Multi-index for hashes within a Hamming distance of each other
+
+    Each hash is split into max_distance + 1 chunks. Two hashes within
+    max_distance bits must agree exactly on at least one chunk, so only
+    hashes sharing a chunk value need to be compared.
+    """
+
+    def __init__(self, max_distance: int = DEFAULT_MAX_DISTANCE,
+                 hash_bits: int = DEFAULT_HASH_SIZE ** 2):
+        """
+        Initialize near-duplicate index
+
+        Args:
+            max_distance (int): Largest Hamming distance counted as a duplicate
+            hash_bits (int): Number of bits in each hash
+
+        Raises:
+            ValueError: max_distance is negative
+        """
+        if max_distance < 0:
+            raise ValueError(f"max_distance must be 0 or more, got {max_distance}")
+        self.max_distance = max_distance
+        chunks = max_distance + 1
+        size = -(-hash_bits // chunks)
+        self._chunks = [(start, min(size, hash_bits - start))
+                        for start in range(0, hash_bits, size)]
+        self._buckets: List[Dict[int, List[Tuple[int, str]]]] = [{} for _ in self._chunks]
+
+    def _keys(self, value: int) -> Iterable[Tuple[int, int]]:
+        for i, (start, width) in enumerate(self._chunks):
+            yield i, (value >> start) & ((1 << width) - 1)
+
+    def find(self, value: int) -> Optional[str]:
+        """
+        Find an indexed item within max_distance of a hash
+
+        Args:
+            value (int): Hash to look up
+
+        Returns:
+            str: Closest matching item, or None
+        """
+        best, best_distance = None, self.max_distance + 1
+        for i, key in self._keys(value):
+            for other, item in self._buckets[i].get(key, ()):
+                distance = hamming_distance(value, other)
+                if distance < best_distance:
+                    best, best_distance = item, distance
+        return best
+
+    def add(self, value: int, item: str):
+        """Index an item under its hash"""
+        for i, key in self._keys(value):
+            self._buckets[i].setdefault(key, []).append((value, item))
+
+
+def find_near_duplicates(hashes: Iterable[Tuple[str, int]],
+                         max_distance: int = DEFAULT_MAX_DISTANCE,
+                         hash_size: int = DEFAULT_HASH_SIZE) -> Dict[str, str]:
+    """
+    Group images into near-duplicate clusters
+
+    Images are taken in order; each one joins the closest representative within
+    max_distance of it, or becomes a new representative. Comparing against
+    representatives only keeps clusters from chaining across dissimilar images.
+
+    Args:
+        hashes (Iterable[Tuple[str, int]]): (image path, hash) pairs in processing order;
+            pairs with a None hash are never treated as duplicates
+        max_distance (int): Largest Hamming distance counted as a duplicate
+        hash_size (int): Hash side length used to compute the hashes
+
+    Returns:
+        Dict[str, str]: Maps each duplicate's path to its representative's path
+    """
+    index = NearDuplicateIndex(max_distance, hash_size ** 2)
+    duplicates = {}
+    for path, value in hashes:
+        if value is None:
+            continue
+        representative = index.find(value)
+        if representative is None:
+            index.add(value, path)
+        else:
+            duplicates[path] = representative
+    return duplicates
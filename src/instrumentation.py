@@ -0,0 +1,186 @@
+"""
+Instrumentation - Per-stage timers, timing percentiles and metrics export
+"""
+
+import os
+import math
+import time
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Percentiles reported for every stage
+PERCENTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+class StageTimer:
+    """Accumulates wall-clock milliseconds per named stage"""
+
+    def __init__(self, timings: Optional[Dict[str, float]] = None):
+        """
+        Initialize stage timer
+
+        Args:
+            timings (Dict[str, float]): Dict to record into (default: a new one)
+        """
+        self.timings = timings if timings is not None else {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time a block of code as a stage; repeated stages add up
+
+        Args:
+            name (str): Stage name
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    def add(self, name: str, elapsed_ms: float):
+        """Add a measured duration to a stage"""
+        self.timings[name] = self.timings.get(name, 0.0) + elapsed_ms
+
+
+# Timing histogram buckets grow by 2%, so reported percentiles are within 1%
+# of the true value; durations at or below the first bucket's edge share it
+HISTOGRAM_GROWTH = 1.02
+HISTOGRAM_MIN_MS = 0.01
+_LOG_GROWTH = math.log(HISTOGRAM_GROWTH)
+
+
+class _Histogram:
+    """Count, sum, extremes and log-spaced bucket counts of one stage's timings"""
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.buckets: Dict[int, int] = {}
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value > HISTOGRAM_MIN_MS:
+            bucket = int(math.log(value / HISTOGRAM_MIN_MS) / _LOG_GROWTH)
+        else:
+            bucket = -1
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, fraction: float) -> float:
+        """Approximate percentile: the middle of the bucket holding that rank"""
+        rank = int(round(fraction * (self.count - 1)))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen > rank:
+                value = HISTOGRAM_MIN_MS * HISTOGRAM_GROWTH ** (bucket + 0.5)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+
+class TimingStats:
+    """
+    Collects per-file stage timings and summarizes them as percentiles
+
+    Each stage keeps a count, total, minimum, maximum and a histogram of
+    log-spaced buckets, so memory does not grow with the number of files
+    and percentiles are accurate to about 1%.
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, _Histogram] = {}
+
+    def add(self, timings: Optional[Dict[str, float]]):
+        """
+        Record the stage timings of one file
+
+        Args:
+            timings (Dict[str, float]): Milliseconds per stage
+        """
+        for name, value in (timings or {}).items():
+            histogram = self._stages.get(name)
+            if histogram is None:
+                histogram = self._stages[name] = _Histogram()
+            histogram.add(value)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize each stage
+
+        Returns:
+            Dict: Per-stage count, total, mean, max and percentiles in milliseconds
+        """
+        result = {}
+        for name, histogram in self._stages.items():
+            stage = {
+                "count": histogram.count,
+                "total_ms": round(histogram.total, 1),
+                "mean_ms": round(histogram.total / histogram.count, 2)
+            }
+            for fraction in PERCENTILES:
+                stage[f"p{int(fraction * 100)}_ms"] = round(histogram.percentile(fraction), 2)
+            stage["max_ms"] = round(histogram.max, 2)
+            result[name] = stage
+        return result
+
+
+def write_prometheus_textfile(path: str, run_stats: Dict[str, Any],
+                              timings: Dict[str, Dict[str, Any]]):
+    """
+    Write batch run metrics in the Prometheus textfile exposition format
+
+    The file is written to a temporary name and renamed into place, as the
+    node_exporter textfile collector expects.
+
+    Args:
+        path (str): Metrics file path (conventionally ending in .prom)
+        run_stats (Dict): BatchProcessor.run_stats
+        timings (Dict): Per-stage summary from TimingStats.summary()
+    """
+    lines = [
+        "# HELP ocr_batch_files Files in the last batch run by outcome",
+        "# TYPE ocr_batch_files gauge",
+    ]
+    for outcome in ("total_files", "processed", "failed", "skipped", "duplicates"):
+        lines.append(f'ocr_batch_files{{outcome="{outcome}"}} {run_stats.get(outcome, 0)}')
+
+    lines += [
+        "# HELP ocr_batch_cache_lookups OCR result cache lookups in the last batch run",
+        "# TYPE ocr_batch_cache_lookups gauge",
+        f'ocr_batch_cache_lookups{{result="hit"}} {run_stats.get("cache_hits", 0)}',
+        f'ocr_batch_cache_lookups{{result="miss"}} {run_stats.get("cache_misses", 0)}',
+        "# HELP ocr_batch_duration_seconds Wall-clock duration of the last batch run",
+        "# TYPE ocr_batch_duration_seconds gauge",
+        f"ocr_batch_duration_seconds {run_stats.get('processing_time', 0):.3f}",
+        "# HELP ocr_batch_stage_seconds Per-file time spent in each processing stage",
+        "# TYPE ocr_batch_stage_seconds summary",
+    ]
+    for name in sorted(timings):
+        stage = timings[name]
+        for fraction in PERCENTILES:
+            value = stage[f"p{int(fraction * 100)}_ms"] / 1000
+            lines.append(f'ocr_batch_stage_seconds{{stage="{name}",quantile="{fraction}"}} {value:.6f}')
+        lines.append(f'ocr_batch_stage_seconds_sum{{stage="{name}"}} {stage["total_ms"] / 1000:.6f}')
+        lines.append(f'ocr_batch_stage_seconds_count{{stage="{name}"}} {stage["count"]}')
+
+    lines += [
+        "# HELP ocr_batch_last_run_timestamp_seconds Unix time the last batch run finished",
+        "# TYPE ocr_batch_last_run_timestamp_seconds gauge",
+        f"ocr_batch_last_run_timestamp_seconds {time.time():.0f}",
+    ]
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(temp_path, path)
+    logger.info(f"Metrics saved to: {path}")
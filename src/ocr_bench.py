@@ -0,0 +1,504 @@
+"""
+OCR Benchmark - Measure throughput, latency, memory and accuracy on a synthetic corpus
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import resource
+import tempfile
+import itertools
+import subprocess
+import multiprocessing
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+CORPUS_VERSION = 1
+MANIFEST_NAME = "ground_truth.json"
+
+# Image kinds generated in turn, so every corpus size covers all of them
+CORPUS_KINDS = ("plain", "noisy", "dark", "scroll", "multipage")
+
+FONT_CANDIDATES = (
+    "DejaVuSans.ttf", "DejaVuSerif.ttf", "DejaVuSansMono.ttf",
+    "Arial.ttf", "Times New Roman.ttf", "Courier New.ttf",
+)
+FONT_DIRS = (
+    "/usr/share/fonts/truetype/dejavu", "/usr/share/fonts/TTF", "/usr/share/fonts/dejavu",
+    "/Library/Fonts", "/System/Library/Fonts/Supplemental", "C:\\Windows\\Fonts",
+)
+
+WORDS = (
+    "the quick brown fox jumps over lazy dog invoice total amount due settings saved "
+    "download complete meeting notes agenda project deadline review budget report "
+    "server error timeout retry connection user account password reset email inbox "
+    "lecture slide chapter figure table result analysis method data sample value"
+).split()
+
+
+def find_fonts() -> List[str]:
+    """
+    Find the TrueType fonts available for rendering, in a fixed order
+
+    Returns:
+        List[str]: Font file paths (empty when only PIL's built-in font is available)
+    """
+    fonts = []
+    for name in FONT_CANDIDATES:
+        for directory in FONT_DIRS:
+            path = os.path.join(directory, name)
+            if os.path.isfile(path):
+                fonts.append(path)
+                break
+    return fonts
+
+
+def load_font(fonts: List[str], index: int, size: int) -> ImageFont.ImageFont:
+    """Load a font by index at a size, falling back to PIL's built-in font"""
+    if fonts:
+        return ImageFont.truetype(fonts[index % len(fonts)], size)
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:
+        # Pillow < 10.1 has a single fixed-size default font
+        return ImageFont.load_default()
+
+
+def random_lines(rng: random.Random, count: int) -> List[str]:
+    """Generate lines of random words"""
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 8))).capitalize()
+            for _ in range(count)]
+
+
+def render_lines(lines: List[str], font: ImageFont.ImageFont, dark: bool = False,
+                 width: int = 1000) -> Image.Image:
+    """Render lines of text onto a screenshot-like canvas"""
+    line_height = int(font.getbbox("Hg")[3] * 1.6) + 2
+    image = Image.new('L', (width, line_height * len(lines) + 40), color=30 if dark else 255)
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(lines):
+        draw.text((20, 20 + i * line_height), line, fill=230 if dark else 0, font=font)
+    return image
+
+
+def add_noise(image: Image.Image, rng: random.Random, sigma: float = 12.0) -> Image.Image:
+    """Add Gaussian pixel noise, seeded from rng so the corpus stays reproducible"""
+    noise_rng = np.random.RandomState(rng.randrange(2 ** 31))
+    pixels = np.asarray(image, dtype=np.float32)
+    pixels += noise_rng.normal(0.0, sigma, pixels.shape)
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+
+
+def font_names(fonts: List[str]) -> List[str]:
+    """Names of the fonts a corpus is rendered with, as recorded in its manifest"""
+    return [os.path.basename(font) for font in fonts] or ["PIL default"]
+
+
+def generate_corpus(output_dir: str, images: int = 25, seed: int = 0) -> Dict[str, Any]:
+    """
+    Render a deterministic corpus of text images with ground truth
+
+    The same seed, size and fonts always produce the same images and texts.
+
+    Args:
+        output_dir (str): Directory to write the images and manifest to
+        images (int): Number of image files to generate
+        seed (int): Random seed
+
+    Returns:
+        Dict: Manifest with corpus settings and per-file ground-truth "pages"
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rng = random.Random(seed)
+    fonts = find_fonts()
+    files = {}
+
+    for i in range(images):
+        kind = CORPUS_KINDS[i % len(CORPUS_KINDS)]
+        font = load_font(fonts, i, rng.choice((14, 16, 18, 22, 28)))
+
+        if kind == "multipage":
+            pages = [random_lines(rng, rng.randint(4, 10)) for _ in range(3)]
+            frames = [render_lines(lines, font) for lines in pages]
+            name = f"{i:04d}_{kind}.tiff"
+            frames[0].save(os.path.join(output_dir, name), save_all=True,
+                           append_images=frames[1:], compression="tiff_deflate")
+        else:
+            lines = random_lines(rng, 80 if kind == "scroll" else rng.randint(3, 12))
+            image = render_lines(lines, font, dark=kind == "dark")
+            pages = [lines]
+            if kind == "noisy":
+                image = add_noise(image, rng)
+                name = f"{i:04d}_{kind}.jpg"
+                image.save(os.path.join(output_dir, name), quality=70)
+            else:
+                name = f"{i:04d}_{kind}.png"
+                image.save(os.path.join(output_dir, name))
+
+        files[name] = {"kind": kind, "pages": ["\n".join(lines) for lines in pages]}
+
+    manifest = {
+        "version": CORPUS_VERSION,
+        "seed": seed,
+        "images": images,
+        "fonts": font_names(fonts),
+        "pillow": Image.__version__,
+        "files": files
+    }
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_or_generate_corpus(corpus_dir: str, images: int, seed: int) -> Dict[str, Any]:
+    """
+    Reuse a corpus generated with the same settings, or generate it
+
+    Fonts and the Pillow version change how text is rendered, so a corpus made
+    on another machine or before an upgrade is regenerated too.
+    """
+    manifest_path = os.path.join(corpus_dir, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        settings = ("version", "seed", "images", "fonts", "pillow")
+        if tuple(manifest.get(key) for key in settings) == \
+                (CORPUS_VERSION, seed, images, font_names(find_fonts()), Image.__version__):
+            return manifest
+    logger.info(f"Generating {images} benchmark images in {corpus_dir}")
+    return generate_corpus(corpus_dir, images, seed)
+
+
+def normalize_text(text: str) -> str:
+    """Drop page headers and collapse whitespace before comparing texts"""
+    lines = [line for line in text.splitlines()
+             if not (line.startswith("--- Page ") and line.endswith(" ---"))]
+    return " ".join(" ".join(lines).split())
+
+
+def edit_distance(reference: str, hypothesis: str) -> int:
+    """Levenshtein distance between two strings"""
+    if len(reference) < len(hypothesis):
+        reference, hypothesis = hypothesis, reference
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_char in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_char in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (ref_char != hyp_char)))
+        previous = current
+    return previous[-1]
+
+
+def character_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    Character error rate of recognized text against ground truth
+
+    Args:
+        reference (str): Ground-truth text
+        hypothesis (str): Recognized text
+
+    Returns:
+        float: Edit distance divided by the reference length
+    """
+    reference, hypothesis = normalize_text(reference), normalize_text(hypothesis)
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+    return edit_distance(reference, hypothesis) / len(reference)
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of a list of values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def processing_ms(stats: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Time a worker spent extracting one file, from its stage timings"""
+    timings = (stats or {}).get("timings") or {}
+    if "total" in timings:
+        return timings["total"]
+    return sum(timings.values()) if timings else None
+
+
+def peak_rss_mb(who: int) -> float:
+    """Peak resident set size in MB for RUSAGE_SELF or RUSAGE_CHILDREN"""
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024.0 * 1024.0) if sys.platform == 'darwin' else peak / 1024.0
+
+
+def run_config(corpus_dir: str, manifest: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract the whole corpus with one configuration and measure it
+
+    Single-worker configurations call OCRExtractor directly and time each
+    call; multi-worker configurations go through BatchProcessor, where the
+    latency of an image is the time its worker spent on it, from the
+    result's stage timings (waiting in the pool's queue is not included).
+
+    Args:
+        corpus_dir (str): Corpus directory
+        manifest (Dict): Corpus manifest from generate_corpus
+        config (Dict): "enhance", "psm", "workers" and "engine" settings
+
+    Returns:
+        Dict: Configuration plus throughput, latency, memory and accuracy figures
+    """
+    from ocr_extractor import OCRExtractor
+    from batch_processor import BatchProcessor
+
+    extractor = OCRExtractor(engine=config["engine"])
+    paths = [os.path.join(corpus_dir, name) for name in sorted(manifest["files"])]
+    texts = {}
+    latencies = []
+    failed = 0
+
+    start = time.perf_counter()
+    if config["workers"] == 1:
+        for path in paths:
+            call_start = time.perf_counter()
+            try:
+                texts[path] = extractor.extract_text_from_image(
+                    path, enhance=config["enhance"], psm=config["psm"])
+            except Exception:
+                failed += 1
+            latencies.append((time.perf_counter() - call_start) * 1000)
+    else:
+        with tempfile.TemporaryDirectory() as output_dir:
+            processor = BatchProcessor(output_dir=output_dir, workers=config["workers"],
+                                       extractor=extractor)
+            for file_result in processor.iter_directory(corpus_dir, save_individual=False,
+                                                        create_summary=False,
+                                                        enhance=config["enhance"],
+                                                        psm=config["psm"]):
+                latency = processing_ms(file_result.stats)
+                if latency is not None:
+                    latencies.append(latency)
+                if file_result.status == "success":
+                    texts[file_result.file_path] = file_result.text
+                else:
+                    failed += 1
+    elapsed = time.perf_counter() - start
+
+    error_rates = []
+    for path in paths:
+        reference = "\n".join(manifest["files"][os.path.basename(path)]["pages"])
+        error_rates.append(character_error_rate(reference, texts.get(path, "")))
+
+    result = dict(config)
+    result.update({
+        "images": len(paths),
+        "failed": failed,
+        "seconds": round(elapsed, 3),
+        "images_per_sec": round(len(paths) / elapsed, 3) if elapsed else None,
+        "latency_ms": {
+            "source": "per_call" if config["workers"] == 1 else "worker_timings",
+            "p50": round(percentile(latencies, 0.50), 1) if latencies else None,
+            "p95": round(percentile(latencies, 0.95), 1) if latencies else None
+        },
+        "peak_rss_mb": round(peak_rss_mb(resource.RUSAGE_SELF), 1),
+        "peak_child_rss_mb": round(peak_rss_mb(resource.RUSAGE_CHILDREN), 1),
+        "cer": round(sum(error_rates) / len(error_rates), 4),
+        "cer_by_kind": {}
+    })
+    for kind in CORPUS_KINDS:
+        rates = [rate for path, rate in zip(paths, error_rates)
+                 if manifest["files"][os.path.basename(path)]["kind"] == kind]
+        if rates:
+            result["cer_by_kind"][kind] = round(sum(rates) / len(rates), 4)
+    return result
+
+
+def _run_config_process(connection, corpus_dir: str, manifest: Dict[str, Any],
+                        config: Dict[str, Any]):
+    """Child process entry point, so peak RSS is measured per configuration"""
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    try:
+        connection.send(run_config(corpus_dir, manifest, config))
+    except Exception as e:
+        connection.send(dict(config, error=str(e)))
+    finally:
+        connection.close()
+
+
+def run_isolated(corpus_dir: str, manifest: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one configuration in a fresh process and return its results"""
+    context = multiprocessing.get_context('spawn')
+    parent, child = context.Pipe(duplex=False)
+    process = context.Process(target=_run_config_process,
+                              args=(child, corpus_dir, manifest, config))
+    process.start()
+    child.close()
+    try:
+        result = parent.recv()
+    except EOFError:
+        result = dict(config, error=f"benchmark process exited with code {process.exitcode}")
+    process.join()
+    return result
+
+
+# Startup scenarios, each run in a fresh interpreter: (name, code or script args)
+STARTUP_SCENARIOS = (
+    ("import", "import ocr_extractor"),
+    ("init", "from ocr_extractor import OCRExtractor; OCRExtractor(engine={engine!r})"),
+    ("init_cold_probe", "from ocr_extractor import OCRExtractor; OCRExtractor(engine={engine!r})"),
+    ("extract_cli", None),
+)
+
+
+def run_startup_benchmark(image_path: str, runs: int = 10,
+                          engine: str = 'pytesseract') -> Dict[str, Any]:
+    """
+    Time how long short commands take from interpreter start to exit
+
+    Each scenario runs in a fresh Python process: importing ocr_extractor,
+    creating an OCRExtractor (with the tesseract probe cache warm, and with
+    an empty home directory so the probe runs), and extracting one image
+    with the ocr-extract command line.
+
+    Args:
+        image_path (str): Image for the extract_cli scenario
+        runs (int): Runs per scenario
+        engine (str): Tesseract backend
+
+    Returns:
+        Dict: Per-scenario min, median and max wall-clock milliseconds
+    """
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='ocr-bench-home-') as empty_home:
+        for name, code in STARTUP_SCENARIOS:
+            if code is None:
+                command = [sys.executable, os.path.join(src_dir, 'ocr_extractor.py'), image_path,
+                           '--no-cache', '--engine', engine]
+            else:
+                command = [sys.executable, '-c', code.format(engine=engine)]
+            env = dict(os.environ)
+            timings = []
+            for run in range(runs):
+                if name == "init_cold_probe":
+                    env["HOME"] = os.path.join(empty_home, str(run))
+                start = time.perf_counter()
+                proc = subprocess.run(command, cwd=src_dir, env=env, stdout=subprocess.DEVNULL,
+                                      stderr=subprocess.PIPE)
+                timings.append((time.perf_counter() - start) * 1000)
+                if proc.returncode != 0:
+                    error = proc.stderr.decode('utf-8', 'replace').strip().splitlines()
+                    results[name] = {"error": error[-1] if error else f"exit code {proc.returncode}"}
+                    break
+            else:
+                results[name] = {
+                    "runs": runs,
+                    "min_ms": round(min(timings), 1),
+                    "median_ms": round(percentile(timings, 0.5), 1),
+                    "max_ms": round(max(timings), 1)
+                }
+    return results
+
+
+def tesseract_version() -> Optional[str]:
+    """Installed Tesseract version, if it can be found"""
+    try:
+        import pytesseract
+        return str(pytesseract.get_tesseract_version())
+    except Exception:
+        return None
+
+
+def main():
+    """Command line interface for the OCR benchmark"""
+    parser = argparse.ArgumentParser(
+        description='Benchmark OCR throughput, latency, memory and accuracy on a synthetic corpus')
+    parser.add_argument('--corpus-dir', default=None,
+                       help='Directory for the generated corpus, reused when its settings match '
+                            '(default: a temporary directory)')
+    parser.add_argument('--images', type=int, default=25,
+                       help='Number of corpus images (default: 25)')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus random seed (default: 0)')
+    parser.add_argument('--enhance', nargs='+', choices=['on', 'off'], default=['on', 'off'],
+                       help='Enhancement settings to run (default: on off)')
+    parser.add_argument('--psm', nargs='+', type=int, default=[6],
+                       help='Page segmentation modes to run (default: 6)')
+    parser.add_argument('-w', '--workers', nargs='+', type=int,
+                       default=[1, os.cpu_count() or 1],
+                       help='Worker counts to run (default: 1 and one per CPU core)')
+    parser.add_argument('--engine', default='pytesseract', help='Tesseract backend (default: pytesseract)')
+    parser.add_argument('-o', '--output', default=None,
+                       help='Write the JSON results to this file (default: print them)')
+    parser.add_argument('--generate-only', action='store_true',
+                       help='Only generate the corpus; requires --corpus-dir')
+    parser.add_argument('--startup', type=int, nargs='?', const=10, default=None, metavar='RUNS',
+                       help='Instead of throughput, time command startup in fresh interpreters '
+                            '(import, extractor creation, one-image CLI run; default: 10 runs each)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.generate_only and not args.corpus_dir:
+        parser.error("--generate-only requires --corpus-dir")
+
+    temp_dir = None
+    if args.corpus_dir is None:
+        temp_dir = tempfile.TemporaryDirectory(prefix='ocr-bench-')
+        corpus_dir = temp_dir.name
+    else:
+        corpus_dir = args.corpus_dir
+
+    try:
+        manifest = load_or_generate_corpus(corpus_dir, args.images, args.seed)
+        if args.generate_only:
+            print(f"Corpus of {args.images} images written to {corpus_dir}")
+            return
+
+        if args.startup is not None:
+            image_path = os.path.join(corpus_dir, sorted(manifest["files"])[0])
+            print(f"Timing startup ({args.startup} runs per scenario)...", file=sys.stderr)
+            results = run_startup_benchmark(image_path, args.startup, args.engine)
+        else:
+            configs = [
+                {"engine": args.engine, "enhance": enhance == 'on', "psm": psm, "workers": workers}
+                for enhance, psm, workers in itertools.product(args.enhance, args.psm,
+                                                               sorted(set(args.workers)))
+            ]
+            results = []
+            for config in configs:
+                print(f"Running enhance={config['enhance']} psm={config['psm']} "
+                      f"workers={config['workers']}...", file=sys.stderr)
+                results.append(run_isolated(corpus_dir, manifest, config))
+
+        report = {
+            "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "tesseract": tesseract_version(),
+            "corpus": {key: manifest[key] for key in ("version", "seed", "images", "fonts", "pillow")},
+            "startup" if args.startup is not None else "results": results
+        }
+        output = json.dumps(report, indent=2)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(output + "\n")
+            print(f"Benchmark results saved to: {args.output}", file=sys.stderr)
+        else:
+            print(output)
+    finally:
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
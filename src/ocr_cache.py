@@ -0,0 +1,205 @@
+"""
+OCR Result Cache - Persistent, content-addressed cache of extracted text
+"""
+
+import os
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'screenshot-text-extractor')
+DEFAULT_CACHE_SIZE_MB = 256
+
+
+class OCRCache:
+    """SQLite-backed OCR result cache with size-based LRU eviction"""
+
+    def __init__(self, cache_dir: str = None, max_size_mb: float = DEFAULT_CACHE_SIZE_MB):
+        """
+        Initialize OCR cache
+
+        Args:
+            cache_dir (str): Directory holding the cache database
+            max_size_mb (float): Maximum size of cached text before eviction, in MB
+        """
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.db_path = os.path.join(self.cache_dir, "ocr_cache.sqlite3")
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._total_bytes = 0
+        # One connection is shared by every thread that uses this cache
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        # Connections cannot cross process boundaries; workers reconnect lazily
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        state["_lock"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database on first use"""
+        if self._conn is None:
+            Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None,
+                                         check_same_thread=False)
+            # WAL lets several worker processes read and write concurrently
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, text TEXT NOT NULL, "
+                "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)"
+            )
+            self._total_bytes = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        return self._conn
+
+    @staticmethod
+    def make_key(image_path: str, **settings) -> str:
+        """
+        Build a cache key from the image bytes and extraction settings
+
+        Args:
+            image_path (str): Path to the image file
+            **settings: Settings that affect the result (language, psm, oem, enhance, ...)
+
+        Returns:
+            str: Hex digest identifying this image and settings
+        """
+        digest = hashlib.sha256()
+        with open(image_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return OCRCache._finish_key(digest, settings)
+
+    @staticmethod
+    def make_data_key(data: bytes, **settings) -> str:
+        """
+        Build a cache key from decoded image data and extraction settings
+
+        Used for single frames of multi-page images, which have no file of their own.
+
+        Args:
+            data (bytes): Raw pixel data
+            **settings: Settings that affect the result
+
+        Returns:
+            str: Hex digest identifying this data and settings
+        """
+        digest = hashlib.sha256(b'data:')
+        digest.update(data)
+        return OCRCache._finish_key(digest, settings)
+
+    @staticmethod
+    def _finish_key(digest, settings: Dict[str, Any]) -> str:
+        for name in sorted(settings):
+            digest.update(f"|{name}={settings[name]}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up cached text, refreshing its LRU position
+
+        Args:
+            key (str): Cache key from make_key
+
+        Returns:
+            str: Cached text, or None on a miss
+        """
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute("SELECT text FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE entries SET last_access = ? WHERE key = ?",
+                                 (time.time(), key))
+            except sqlite3.Error as e:
+                logger.warning(f"OCR cache lookup failed: {e}")
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, text: str):
+        """
+        Store extracted text, evicting least recently used entries if over size
+
+        Args:
+            key (str): Cache key from make_key
+            text (str): Extracted text
+        """
+        size = len(text.encode('utf-8')) + len(key)
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute("INSERT OR REPLACE INTO entries (key, text, size, last_access) "
+                             "VALUES (?, ?, ?, ?)", (key, text, size, time.time()))
+                self._total_bytes += size
+                if self._total_bytes > self.max_bytes:
+                    self.evict()
+            except sqlite3.Error as e:
+                logger.warning(f"OCR cache store failed: {e}")
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits its size limit"""
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        conn = self._connect()
+        # Other processes share the database, so re-read the real total first
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total > self.max_bytes:
+            excess = total - self.max_bytes
+            freed = 0
+            stale = []
+            for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_access"):
+                stale.append((key,))
+                freed += size
+                if freed >= excess:
+                    break
+            conn.executemany("DELETE FROM entries WHERE key = ?", stale)
+            total -= freed
+            logger.info(f"OCR cache evicted {len(stale)} entries ({freed} bytes)")
+        self._total_bytes = total
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM entries")
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters for this process
+
+        Returns:
+            Dict: Cache statistics
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
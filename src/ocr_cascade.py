@@ -0,0 +1,152 @@
+"""
+OCR Cascade - Confidence-driven escalation from cheap to expensive OCR settings
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Mean word confidence (0-100) below which the next tier is tried; clean
+# screenshots usually score above 90, while garbled output falls well below 70
+DEFAULT_MIN_CONFIDENCE = 75.0
+
+
+class CascadeTier:
+    """One OCR configuration in the cascade"""
+
+    __slots__ = ("name", "enhance", "psm")
+
+    def __init__(self, name: str, enhance: bool, psm: Optional[int] = None):
+        """
+        Initialize cascade tier
+
+        Args:
+            name (str): Tier name recorded with results
+            enhance (bool): Whether to run the enhancement stages
+            psm (int): Page segmentation mode (default: the mode requested by the caller)
+        """
+        self.name = name
+        self.enhance = enhance
+        self.psm = psm
+
+    def describe(self) -> str:
+        """Describe the tier, for cache keys and reports"""
+        psm = "default" if self.psm is None else self.psm
+        return f"{self.name}(enhance={'on' if self.enhance else 'off'},psm={psm})"
+
+
+# Rescaled text only, then the standard enhancement, then sparse-text
+# segmentation for scattered UI labels that psm 6 reads as one garbled block
+DEFAULT_CASCADE = (
+    CascadeTier("fast", enhance=False),
+    CascadeTier("enhanced", enhance=True),
+    CascadeTier("sparse", enhance=True, psm=11),
+)
+
+
+def describe_cascade(tiers: Sequence[CascadeTier], min_confidence: float) -> str:
+    """
+    Describe a cascade, for cache keys and reports
+
+    Args:
+        tiers (Sequence[CascadeTier]): Tiers in the order they are tried
+        min_confidence (float): Confidence that accepts a tier's text
+
+    Returns:
+        str: Tier descriptions and threshold
+    """
+    return ">".join(tier.describe() for tier in tiers) + f"@{min_confidence:g}"
+
+
+def mean_confidence(confidences: Iterable[float]) -> Optional[float]:
+    """
+    Average word confidence of an OCR result
+
+    Args:
+        confidences (Iterable[float]): Per-word confidences (0-100)
+
+    Returns:
+        float: Mean confidence, or None when no words were recognized (a
+            blank image reads as blank at every tier, so it is not escalated)
+    """
+    values = list(confidences)
+    return sum(values) / len(values) if values else None
+
+
+class CascadeStats:
+    """Counts which tiers ran and produced the final text over a run"""
+
+    def __init__(self):
+        self.final = {}
+        self.runs = {}
+        self.ms = {}
+        self.empty = 0
+        # Images (or pages and strips) accepted by the first tier, and its time on them
+        self.first_tier_only = 0
+        self.first_tier_only_ms = 0.0
+
+    def add(self, attempts: Optional[List[Dict[str, Any]]]):
+        """
+        Record the tier attempts of one image (or of all pages of a document)
+
+        Args:
+            attempts (List[Dict]): Attempt records with "tier", "ms", "empty": True
+                when no words were found and, on the attempt whose text was
+                kept, "final": True. Each page or strip's attempts start again
+                at the first tier.
+        """
+        attempts = attempts or []
+        first_tier = attempts[0]["tier"] if attempts else None
+        for index, attempt in enumerate(attempts):
+            tier = attempt["tier"]
+            self.runs[tier] = self.runs.get(tier, 0) + 1
+            self.ms[tier] = self.ms.get(tier, 0.0) + attempt["ms"]
+            if attempt.get("final"):
+                self.final[tier] = self.final.get(tier, 0) + 1
+                if attempt.get("empty"):
+                    self.empty += 1
+            following = attempts[index + 1]["tier"] if index + 1 < len(attempts) else None
+            if tier == first_tier and following in (None, first_tier):
+                self.first_tier_only += 1
+                self.first_tier_only_ms += attempt["ms"]
+
+    def summary(self, min_confidence: float, tiers: int) -> Dict[str, Any]:
+        """
+        Summarize which tiers ran, how long they took and the runs the cascade saved
+
+        The saving is counted, not estimated: every image stopping before the
+        last tier avoids the runs of the tiers after it. No time is put on
+        those runs, since later tiers only ran on the images earlier tiers
+        could not read and their mean time says nothing about the rest.
+
+        Args:
+            min_confidence (float): Threshold the cascade ran with
+            tiers (int): Number of tiers in the cascade
+
+        Returns:
+            Dict: Images finished per tier (and how many had no text), runs,
+                total and mean milliseconds per tier, tier runs avoided compared
+                with running every tier, images the first tier alone finished
+                and the time spent on them, and total time spent
+        """
+        images = sum(self.final.values())
+        runs = sum(self.runs.values())
+        possible = images * tiers
+        return {
+            "enabled": True,
+            "min_confidence": min_confidence,
+            "images": images,
+            "empty_images": self.empty,
+            "final_tier": dict(self.final),
+            "runs": dict(self.runs),
+            "ms": {tier: round(value, 1) for tier, value in self.ms.items()},
+            "mean_ms": {tier: round(value / self.runs[tier], 1) for tier, value in self.ms.items()},
+            "spent_ms": round(sum(self.ms.values()), 1),
+            "tiers": tiers,
+            "tier_runs": runs,
+            "tier_runs_avoided": possible - runs,
+            "tier_runs_avoided_fraction": round((possible - runs) / possible, 3) if possible else None,
+            "first_tier_only": self.first_tier_only,
+            "first_tier_only_ms": round(self.first_tier_only_ms, 1)
+        }
@@ -0,0 +1,772 @@
+"""
+OCR Engines - Pluggable Tesseract backends used by OCRExtractor
+"""
+
+import io
+import os
+import json
+import shutil
+import ctypes
+import ctypes.util
+import tempfile
+import subprocess
+import threading
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import pytesseract
+from PIL import Image
+
+from ocr_cache import DEFAULT_CACHE_DIR
+from word_boxes import WordBoxes
+
+logger = logging.getLogger(__name__)
+
+# Separates the text of each image when tesseract reads a list file
+PAGE_SEPARATOR = '\f'
+
+# tesseract output renderers, by config name (and output file extension)
+RENDERERS = ('txt', 'tsv', 'hocr', 'pdf')
+
+# The API renders one page's hOCR element; the binary wraps it in a document like this
+HOCR_DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN"
+    "http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">
+<html xmlns="http://www.w3.org/1999/xhtml" xml:lang="en" lang="en">
+ <head>
+  <title></title>
+  <meta http-equiv="Content-Type" content="text/html;charset=utf-8"/>
+  <meta name='ocr-system' content='tesseract'/>
+  <meta name='ocr-capabilities' content='ocr_page ocr_carea ocr_par ocr_line ocrx_word'/>
+ </head>
+ <body>
+{page} </body>
+</html>
+"""
+
+PROBE_CACHE_FILE = os.path.join(DEFAULT_CACHE_DIR, "tesseract_probe.json")
+
+# Probes already made by this process, by cache key
+_probes: Dict[str, Dict[str, Any]] = {}
+
+
+def probe_tesseract(tesseract_cmd: str,
+                    cache_file: Optional[str] = PROBE_CACHE_FILE) -> Dict[str, Any]:
+    """
+    Get the version and installed languages of a tesseract binary
+
+    Running tesseract twice costs more than the rest of a short command's
+    startup, so results are cached on disk, keyed by the binary's resolved
+    path, size and modification time (and TESSDATA_PREFIX, which changes
+    the languages found). Upgrading tesseract invalidates the entry.
+
+    Args:
+        tesseract_cmd (str): tesseract command name or path
+        cache_file (str): JSON file caching probes across runs (None disables it)
+
+    Returns:
+        Dict: "version" (first line of tesseract --version) and "languages"
+    """
+    path = shutil.which(tesseract_cmd)
+    if path is None:
+        raise RuntimeError(f"tesseract is not installed or not in PATH: {tesseract_cmd}")
+    path = os.path.realpath(path)
+    stat = os.stat(path)
+    key = f"{path}|{stat.st_size}|{stat.st_mtime_ns}|{os.environ.get('TESSDATA_PREFIX', '')}"
+
+    probe = _probes.get(key)
+    if probe is not None:
+        return probe
+
+    probes = {}
+    if cache_file:
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                probes = json.load(f)
+        except (OSError, ValueError):
+            probes = {}
+        probe = probes.get(key)
+        if probe is not None:
+            _probes[key] = probe
+            return probe
+
+    try:
+        version = subprocess.run([path, '--version'], stdout=subprocess.PIPE,
+                                 stderr=subprocess.STDOUT, check=True)
+        langs = subprocess.run([path, '--list-langs'], stdout=subprocess.PIPE,
+                               stderr=subprocess.STDOUT, check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise RuntimeError(f"tesseract is not installed or not in PATH: {e}")
+    # The first line of --list-langs is a header naming the tessdata directory
+    probe = {
+        "version": version.stdout.decode('utf-8', 'replace').splitlines()[0].strip(),
+        "languages": [line.strip() for line in
+                      langs.stdout.decode('utf-8', 'replace').splitlines()[1:] if line.strip()]
+    }
+    _probes[key] = probe
+
+    if cache_file:
+        probes[key] = probe
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            temp_path = f"{cache_file}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(probes, f, indent=2)
+            os.replace(temp_path, cache_file)
+        except OSError as e:
+            logger.debug(f"Could not save tesseract probe cache {cache_file}: {e}")
+    return probe
+
+
+class OCREngine:
+    """Base class for Tesseract backends"""
+
+    name = None
+
+    def check(self) -> str:
+        """
+        Verify the backend is usable
+
+        Returns:
+            str: Tesseract version description
+        """
+        raise NotImplementedError
+
+    def languages(self) -> Optional[List[str]]:
+        """
+        List the installed Tesseract languages
+
+        Returns:
+            List[str]: Language codes, or None if the backend cannot tell
+        """
+        return None
+
+    def image_to_string(self, image: Image.Image, language: str, psm: int, oem: int) -> str:
+        """
+        Recognize text in an image
+
+        Args:
+            image (PIL.Image): Preprocessed image
+            language (str): Tesseract language code
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+
+        Returns:
+            str: Raw recognized text
+        """
+        raise NotImplementedError
+
+    def image_to_string_with_confidences(self, image: Image.Image, language: str, psm: int,
+                                         oem: int) -> Tuple[str, Optional[List[float]]]:
+        """
+        Recognize text in an image and report word confidences from the same run
+
+        Args:
+            image (PIL.Image): Preprocessed image
+            language (str): Tesseract language code
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+
+        Returns:
+            Tuple[str, List[float]]: Raw recognized text, and per-word confidences
+                (0-100), or None if the backend cannot report them
+        """
+        return self.image_to_string(image, language, psm, oem), None
+
+    def image_to_outputs(self, image: Image.Image, language: str, psm: int, oem: int,
+                         formats: Sequence[str]) -> Dict[str, Union[str, bytes]]:
+        """
+        Recognize an image once and render the result in several formats
+
+        Args:
+            image (PIL.Image): Preprocessed image
+            language (str): Tesseract language code
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+            formats (Sequence[str]): Renderers from RENDERERS
+
+        Returns:
+            Dict: Output per format (str, or bytes for "pdf"); formats the
+                backend cannot render are left out
+        """
+        return {'txt': self.image_to_string(image, language, psm, oem)}
+
+    def images_to_strings(self, images: List[Image.Image], language: str,
+                          psm: int, oem: int) -> List[str]:
+        """
+        Recognize text in several images
+
+        Backends that start a tesseract process per call override this to
+        recognize them all in one process.
+
+        Args:
+            images (List[PIL.Image]): Preprocessed images
+            language (str): Tesseract language code
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+
+        Returns:
+            List[str]: Raw recognized text per image, in order
+        """
+        return [self.image_to_string(image, language, psm, oem) for image in images]
+
+    def detect_script(self, image: Image.Image) -> Optional[Tuple[str, float]]:
+        """
+        Detect the writing system of an image with Tesseract's orientation
+        and script detection (OSD, which needs osd.traineddata)
+
+        Args:
+            image (PIL.Image): Grayscale image
+
+        Returns:
+            Tuple[str, float]: Script name (e.g. "Latin", "Han", "Cyrillic") and
+                its confidence, or None if the image has too little text to tell
+        """
+        return run_osd(pytesseract.pytesseract.tesseract_cmd, image)
+
+    def close(self):
+        """Release any resources held by the backend"""
+
+
+def run_list_file(tesseract_cmd: str, images: List[Image.Image], language: str,
+                  psm: int, oem: int) -> List[str]:
+    """
+    Recognize several images with one tesseract process
+
+    The images are written uncompressed to a temporary directory and
+    tesseract is given a list file naming them, so the language model is
+    loaded once for the whole list. The output is split back into one text
+    per image at tesseract's page separator.
+
+    Args:
+        tesseract_cmd (str): tesseract binary
+        images (List[PIL.Image]): Preprocessed images
+        language (str): Tesseract language code
+        psm (int): Page segmentation mode
+        oem (int): OCR engine mode
+
+    Returns:
+        List[str]: Raw recognized text per image, in order
+    """
+    with tempfile.TemporaryDirectory(prefix='ocr-batch-') as temp_dir:
+        lines = []
+        for index, image in enumerate(images):
+            data = encode_uncompressed(image)
+            path = os.path.join(temp_dir, f"page_{index:05d}.{'pgm' if data[:2] == b'P5' else 'ppm'}")
+            with open(path, 'wb') as f:
+                f.write(data)
+            lines.append(path)
+        list_path = os.path.join(temp_dir, "images.txt")
+        with open(list_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+        command = [tesseract_cmd, list_path, 'stdout', '-l', language, '--oem', str(oem),
+                   '--psm', str(psm), '-c', f'page_separator={PAGE_SEPARATOR}']
+        proc = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if proc.returncode != 0:
+        raise RuntimeError(f"tesseract failed: {proc.stderr.decode('utf-8', 'replace').strip()}")
+
+    # tesseract ends every page with the separator
+    texts = proc.stdout.decode('utf-8').split(PAGE_SEPARATOR)
+    if len(texts) == len(images) + 1 and not texts[-1].strip():
+        texts.pop()
+    if len(texts) != len(images):
+        raise RuntimeError(f"tesseract returned {len(texts)} pages for {len(images)} images")
+    return texts
+
+
+def parse_tsv_confidences(tsv: str) -> List[float]:
+    """
+    Read word confidences from tesseract's TSV output
+
+    Args:
+        tsv (str): TSV output (level, page, block, paragraph, line, word,
+            left, top, width, height, conf, text)
+
+    Returns:
+        List[float]: Confidence of each recognized word, in reading order
+    """
+    return WordBoxes.from_tsv(tsv).confidences.tolist()
+
+
+def run_renderers(tesseract_cmd: str, image: Image.Image, language: str, psm: int,
+                  oem: int, formats: Sequence[str]) -> Dict[str, Union[str, bytes]]:
+    """
+    Run tesseract once, producing every requested output format
+
+    The image is streamed uncompressed over stdin and tesseract writes one
+    file per renderer to a temporary directory, so plain text, TSV word
+    data, hOCR and a searchable PDF all come from a single recognition.
+
+    Args:
+        tesseract_cmd (str): tesseract binary
+        image (PIL.Image): Preprocessed image
+        language (str): Tesseract language code
+        psm (int): Page segmentation mode
+        oem (int): OCR engine mode
+        formats (Sequence[str]): Renderers from RENDERERS
+
+    Returns:
+        Dict: Output per format; str for text formats, bytes for "pdf"
+    """
+    unknown = [name for name in formats if name not in RENDERERS]
+    if unknown:
+        raise ValueError(f"Unknown tesseract renderer(s): {', '.join(unknown)}")
+    with tempfile.TemporaryDirectory(prefix='ocr-render-') as temp_dir:
+        output_base = os.path.join(temp_dir, "out")
+        command = [tesseract_cmd, 'stdin', output_base, '-l', language, '--oem', str(oem),
+                   '--psm', str(psm)] + list(formats)
+        proc = subprocess.run(command, input=encode_uncompressed(image),
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if proc.returncode != 0:
+            raise RuntimeError(f"tesseract failed: {proc.stderr.decode('utf-8', 'replace').strip()}")
+        outputs = {}
+        for name in formats:
+            with open(f"{output_base}.{name}", 'rb') as f:
+                data = f.read()
+            outputs[name] = data if name == 'pdf' else data.decode('utf-8')
+    return outputs
+
+
+def run_text_and_tsv(tesseract_cmd: str, image: Image.Image, language: str, psm: int,
+                     oem: int) -> Tuple[str, List[float]]:
+    """
+    Run tesseract once, producing both plain text and TSV word data
+
+    Args:
+        tesseract_cmd (str): tesseract binary
+        image (PIL.Image): Preprocessed image
+        language (str): Tesseract language code
+        psm (int): Page segmentation mode
+        oem (int): OCR engine mode
+
+    Returns:
+        Tuple[str, List[float]]: Raw recognized text and per-word confidences
+    """
+    outputs = run_renderers(tesseract_cmd, image, language, psm, oem, ('txt', 'tsv'))
+    return outputs['txt'], parse_tsv_confidences(outputs['tsv'])
+
+
+def parse_osd(output: str) -> Optional[Tuple[str, float]]:
+    """
+    Read the script from tesseract's OSD report
+
+    Args:
+        output (str): "Key: value" lines printed by tesseract --psm 0
+
+    Returns:
+        Tuple[str, float]: Script name and confidence, or None if not reported
+    """
+    fields = {}
+    for line in output.splitlines():
+        key, _, value = line.partition(':')
+        fields[key.strip()] = value.strip()
+    if not fields.get('Script'):
+        return None
+    try:
+        confidence = float(fields.get('Script confidence', 0.0))
+    except ValueError:
+        confidence = 0.0
+    return fields['Script'], confidence
+
+
+def run_osd(tesseract_cmd: str, image: Image.Image) -> Optional[Tuple[str, float]]:
+    """
+    Run tesseract's orientation and script detection only (--psm 0)
+
+    Args:
+        tesseract_cmd (str): tesseract binary
+        image (PIL.Image): Grayscale image
+
+    Returns:
+        Tuple[str, float]: Script name and confidence, or None when detection
+            fails (too few characters, or osd.traineddata not installed)
+    """
+    command = [tesseract_cmd, 'stdin', 'stdout', '--psm', '0']
+    proc = subprocess.run(command, input=encode_uncompressed(image),
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if proc.returncode != 0:
+        logger.debug(f"Script detection failed: {proc.stderr.decode('utf-8', 'replace').strip()}")
+        return None
+    return parse_osd(proc.stdout.decode('utf-8', 'replace'))
+
+
+class PytesseractEngine(OCREngine):
+    """Runs the tesseract binary once per image through pytesseract"""
+
+    name = "pytesseract"
+
+    def check(self) -> str:
+        return probe_tesseract(pytesseract.pytesseract.tesseract_cmd)["version"]
+
+    def languages(self) -> Optional[List[str]]:
+        return probe_tesseract(pytesseract.pytesseract.tesseract_cmd)["languages"]
+
+    def image_to_string(self, image: Image.Image, language: str, psm: int, oem: int) -> str:
+        custom_config = f'--oem {oem} --psm {psm} -l {language}'
+        return pytesseract.image_to_string(image, config=custom_config)
+
+    def image_to_string_with_confidences(self, image: Image.Image, language: str, psm: int,
+                                         oem: int) -> Tuple[str, Optional[List[float]]]:
+        return run_text_and_tsv(pytesseract.pytesseract.tesseract_cmd, image, language, psm, oem)
+
+    def image_to_outputs(self, image: Image.Image, language: str, psm: int, oem: int,
+                         formats: Sequence[str]) -> Dict[str, Union[str, bytes]]:
+        return run_renderers(pytesseract.pytesseract.tesseract_cmd, image, language, psm, oem,
+                             formats)
+
+    def images_to_strings(self, images: List[Image.Image], language: str,
+                          psm: int, oem: int) -> List[str]:
+        return run_list_file(pytesseract.pytesseract.tesseract_cmd, images, language, psm, oem)
+
+
+def encode_uncompressed(image: Image.Image, image_format: str = 'PNM') -> bytes:
+    """
+    Encode an image without compression for piping to tesseract
+
+    Args:
+        image (PIL.Image): Image to encode
+        image_format (str): 'PNM' (PGM/PPM) or 'BMP'
+
+    Returns:
+        bytes: Encoded image
+    """
+    if image.mode not in ('L', 'RGB'):
+        image = image.convert('L' if image.mode in ('1', 'LA', 'I', 'F') else 'RGB')
+
+    if image_format.upper() == 'BMP':
+        buffer = io.BytesIO()
+        image.save(buffer, format='BMP')
+        return buffer.getvalue()
+
+    # PNM is just a short header in front of the raw pixel bytes
+    width, height = image.size
+    magic = b'P5' if image.mode == 'L' else b'P6'
+    return b'%s\n%d %d\n255\n' % (magic, width, height) + image.tobytes()
+
+
+class PipeEngine(OCREngine):
+    """
+    Runs the tesseract binary per image, streaming it over stdin and stdout
+
+    The image is sent uncompressed, which skips the PNG encode and the temp
+    file round trip that pytesseract makes for every image.
+    """
+
+    name = "pipe"
+
+    def __init__(self, tesseract_cmd: str = None, image_format: str = 'PNM'):
+        """
+        Initialize pipe engine
+
+        Args:
+            tesseract_cmd (str): tesseract binary (default: pytesseract's configured command)
+            image_format (str): Uncompressed format sent to tesseract, 'PNM' or 'BMP'
+        """
+        self.tesseract_cmd = tesseract_cmd
+        self.image_format = image_format
+
+    def _command(self) -> str:
+        return self.tesseract_cmd or pytesseract.pytesseract.tesseract_cmd
+
+    def check(self) -> str:
+        return probe_tesseract(self._command())["version"]
+
+    def languages(self) -> Optional[List[str]]:
+        return probe_tesseract(self._command())["languages"]
+
+    def image_to_string(self, image: Image.Image, language: str, psm: int, oem: int) -> str:
+        command = [self._command(), 'stdin', 'stdout', '-l', language,
+                   '--oem', str(oem), '--psm', str(psm)]
+        proc = subprocess.run(command, input=encode_uncompressed(image, self.image_format),
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if proc.returncode != 0:
+            raise RuntimeError(f"tesseract failed: {proc.stderr.decode('utf-8', 'replace').strip()}")
+        return proc.stdout.decode('utf-8')
+
+    def image_to_string_with_confidences(self, image: Image.Image, language: str, psm: int,
+                                         oem: int) -> Tuple[str, Optional[List[float]]]:
+        return run_text_and_tsv(self._command(), image, language, psm, oem)
+
+    def image_to_outputs(self, image: Image.Image, language: str, psm: int, oem: int,
+                         formats: Sequence[str]) -> Dict[str, Union[str, bytes]]:
+        return run_renderers(self._command(), image, language, psm, oem, formats)
+
+    def images_to_strings(self, images: List[Image.Image], language: str,
+                          psm: int, oem: int) -> List[str]:
+        return run_list_file(self._command(), images, language, psm, oem)
+
+    def detect_script(self, image: Image.Image) -> Optional[Tuple[str, float]]:
+        return run_osd(self._command(), image)
+
+
+class TessAPIEngine(OCREngine):
+    """
+    Keeps a TessBaseAPI loaded in-process and passes image buffers to it directly
+
+    Uses tesserocr when it is installed, otherwise calls libtesseract's C API
+    through ctypes. Each process holds one initialized API per language and
+    OCR engine mode, so the language model is loaded only once per worker.
+    """
+
+    name = "tessapi"
+
+    LIBRARY_NAMES = ('libtesseract.so.5', 'libtesseract.so.4', 'libtesseract.dylib',
+                     'libtesseract-5.dll', 'libtesseract-4.dll')
+
+    def __init__(self, datapath: str = None, library: str = None):
+        """
+        Initialize in-process Tesseract engine
+
+        Args:
+            datapath (str): tessdata directory (default: TESSDATA_PREFIX or built-in path)
+            library (str): Path to libtesseract (default: search the system)
+        """
+        self.datapath = datapath or os.environ.get('TESSDATA_PREFIX')
+        self.library = library
+        self._lib = None
+        self._tesserocr = None
+        self._apis: Dict[Tuple[str, int], object] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Loaded APIs cannot cross process boundaries; each worker builds its own
+        state = self.__dict__.copy()
+        state.update(_lib=None, _tesserocr=None, _apis={}, _lock=None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Load tesserocr, or libtesseract through ctypes"""
+        if self._lib is not None or self._tesserocr is not None:
+            return
+
+        if self.library is None:
+            try:
+                import tesserocr
+                self._tesserocr = tesserocr
+                return
+            except ImportError:
+                pass
+
+        names = [self.library] if self.library else \
+            [ctypes.util.find_library('tesseract')] + list(self.LIBRARY_NAMES)
+        for name in names:
+            if not name:
+                continue
+            try:
+                lib = ctypes.CDLL(name)
+                break
+            except OSError:
+                continue
+        else:
+            raise RuntimeError("libtesseract not found; install tesserocr or the "
+                               "Tesseract shared library to use the tessapi engine")
+
+        lib.TessVersion.restype = ctypes.c_char_p
+        lib.TessBaseAPICreate.restype = ctypes.c_void_p
+        lib.TessBaseAPIInit2.argtypes = [ctypes.c_void_p, ctypes.c_char_p,
+                                         ctypes.c_char_p, ctypes.c_int]
+        lib.TessBaseAPIInit2.restype = ctypes.c_int
+        lib.TessBaseAPISetPageSegMode.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        lib.TessBaseAPISetImage.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int,
+                                            ctypes.c_int, ctypes.c_int, ctypes.c_int]
+        lib.TessBaseAPIGetUTF8Text.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIGetUTF8Text.restype = ctypes.c_void_p
+        lib.TessDeleteText.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIAllWordConfidences.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIAllWordConfidences.restype = ctypes.POINTER(ctypes.c_int)
+        lib.TessDeleteIntArray.argtypes = [ctypes.POINTER(ctypes.c_int)]
+        for render in (lib.TessBaseAPIGetTsvText, lib.TessBaseAPIGetHOCRText):
+            render.argtypes = [ctypes.c_void_p, ctypes.c_int]
+            render.restype = ctypes.c_void_p
+        lib.TessBaseAPIDetectOrientationScript.argtypes = [
+            ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_float),
+            ctypes.POINTER(ctypes.c_char_p), ctypes.POINTER(ctypes.c_float)]
+        lib.TessBaseAPIDetectOrientationScript.restype = ctypes.c_int
+        lib.TessBaseAPIClear.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIEnd.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIDelete.argtypes = [ctypes.c_void_p]
+        self._lib = lib
+
+    def _get_api(self, language: str, oem: int):
+        """Get the initialized API for a language, creating it on first use"""
+        key = (language, oem)
+        api = self._apis.get(key)
+        if api is not None:
+            return api
+
+        if self._tesserocr is not None:
+            kwargs = {'path': self.datapath} if self.datapath else {}
+            api = self._tesserocr.PyTessBaseAPI(lang=language, oem=self._tesserocr.OEM(oem),
+                                                **kwargs)
+        else:
+            api = self._lib.TessBaseAPICreate()
+            datapath = self.datapath.encode('utf-8') if self.datapath else None
+            if self._lib.TessBaseAPIInit2(api, datapath, language.encode('utf-8'), oem) != 0:
+                self._lib.TessBaseAPIDelete(api)
+                raise RuntimeError(f"Failed to load Tesseract language data: {language}")
+
+        logger.info(f"Loaded in-process Tesseract model: {language} (oem {oem})")
+        self._apis[key] = api
+        return api
+
+    def check(self) -> str:
+        self._load()
+        if self._tesserocr is not None:
+            return f"tesserocr {self._tesserocr.tesseract_version().splitlines()[0]}"
+        return f"libtesseract {self._lib.TessVersion().decode('utf-8')}"
+
+    def image_to_string(self, image: Image.Image, language: str, psm: int, oem: int) -> str:
+        return self._recognize(image, language, psm, oem, confidences=False)[0]
+
+    def image_to_string_with_confidences(self, image: Image.Image, language: str, psm: int,
+                                         oem: int) -> Tuple[str, Optional[List[float]]]:
+        return self._recognize(image, language, psm, oem, confidences=True)[:2]
+
+    def image_to_outputs(self, image: Image.Image, language: str, psm: int, oem: int,
+                         formats: Sequence[str]) -> Dict[str, Union[str, bytes]]:
+        if 'pdf' in formats:
+            # The PDF renderer only exists in the binary; one run there renders everything
+            return run_renderers(pytesseract.pytesseract.tesseract_cmd, image, language,
+                                 psm, oem, formats)
+        text, _, outputs = self._recognize(image, language, psm, oem, confidences=False,
+                                           renderers=[name for name in formats if name != 'txt'])
+        outputs['txt'] = text
+        return outputs
+
+    def detect_script(self, image: Image.Image) -> Optional[Tuple[str, float]]:
+        if image.mode != 'L':
+            image = image.convert('L')
+
+        with self._lock:
+            self._load()
+            # The OSD model is kept loaded next to the recognition models
+            api = self._get_api('osd', 3)
+
+            if self._tesserocr is not None:
+                api.SetPageSegMode(self._tesserocr.PSM.OSD_ONLY)
+                api.SetImage(image)
+                result = api.DetectOrientationScript()
+                if not result or not result.get('script_name'):
+                    return None
+                return result['script_name'], float(result['script_conf'])
+
+            lib = self._lib
+            width, height = image.size
+            lib.TessBaseAPISetPageSegMode(api, 0)
+            lib.TessBaseAPISetImage(api, image.tobytes(), width, height, 1, width)
+            degrees = ctypes.c_int()
+            orientation_confidence = ctypes.c_float()
+            script = ctypes.c_char_p()
+            script_confidence = ctypes.c_float()
+            try:
+                found = lib.TessBaseAPIDetectOrientationScript(
+                    api, ctypes.byref(degrees), ctypes.byref(orientation_confidence),
+                    ctypes.byref(script), ctypes.byref(script_confidence))
+                if not found or not script.value:
+                    return None
+                return script.value.decode('utf-8'), float(script_confidence.value)
+            finally:
+                lib.TessBaseAPIClear(api)
+
+    def _recognize(self, image: Image.Image, language: str, psm: int, oem: int,
+                   confidences: bool, renderers: Sequence[str] = ()
+                   ) -> Tuple[str, Optional[List[float]], Dict[str, str]]:
+        """
+        Recognize an image, reading word confidences and "tsv"/"hocr" renderings
+        of the same recognition from the API when asked
+        """
+        if image.mode not in ('L', 'RGB'):
+            image = image.convert('RGB')
+
+        with self._lock:
+            self._load()
+            api = self._get_api(language, oem)
+
+            if self._tesserocr is not None:
+                api.SetPageSegMode(psm)
+                api.SetImage(image)
+                text = api.GetUTF8Text()
+                outputs = {}
+                if 'tsv' in renderers:
+                    outputs['tsv'] = api.GetTSVText(0)
+                if 'hocr' in renderers:
+                    outputs['hocr'] = HOCR_DOCUMENT.format(page=api.GetHOCRText(0))
+                word_confidences = [float(c) for c in api.AllWordConfidences()] \
+                    if confidences else None
+                return text, word_confidences, outputs
+
+            lib = self._lib
+            bytes_per_pixel = 1 if image.mode == 'L' else 3
+            width, height = image.size
+            lib.TessBaseAPISetPageSegMode(api, psm)
+            lib.TessBaseAPISetImage(api, image.tobytes(), width, height,
+                                    bytes_per_pixel, width * bytes_per_pixel)
+            text_ptr = lib.TessBaseAPIGetUTF8Text(api)
+            try:
+                text = ctypes.string_at(text_ptr).decode('utf-8') if text_ptr else ""
+                word_confidences = None
+                if confidences:
+                    # A -1 terminated array, valid once recognition has run
+                    array = lib.TessBaseAPIAllWordConfidences(api)
+                    word_confidences = []
+                    if array:
+                        while array[len(word_confidences)] != -1:
+                            word_confidences.append(float(array[len(word_confidences)]))
+                        lib.TessDeleteIntArray(array)
+                outputs = {}
+                for name, render in (('tsv', lib.TessBaseAPIGetTsvText),
+                                     ('hocr', lib.TessBaseAPIGetHOCRText)):
+                    if name in renderers:
+                        rendered = render(api, 0)
+                        outputs[name] = ctypes.string_at(rendered).decode('utf-8') \
+                            if rendered else ""
+                        if rendered:
+                            lib.TessDeleteText(rendered)
+                if 'hocr' in outputs:
+                    outputs['hocr'] = HOCR_DOCUMENT.format(page=outputs['hocr'])
+                return text, word_confidences, outputs
+            finally:
+                if text_ptr:
+                    lib.TessDeleteText(text_ptr)
+                lib.TessBaseAPIClear(api)
+
+    def close(self):
+        with self._lock:
+            for api in self._apis.values():
+                if self._tesserocr is not None:
+                    api.End()
+                else:
+                    self._lib.TessBaseAPIEnd(api)
+                    self._lib.TessBaseAPIDelete(api)
+            self._apis = {}
+
+
+ENGINES = {
+    PytesseractEngine.name: PytesseractEngine,
+    PipeEngine.name: PipeEngine,
+    TessAPIEngine.name: TessAPIEngine,
+}
+
+
+def get_engine(engine: Union[str, OCREngine, None] = None) -> OCREngine:
+    """
+    Resolve an engine name or instance to an OCR engine
+
+    Args:
+        engine (str or OCREngine): Engine name from ENGINES, an engine instance,
+            or None for the default pytesseract engine
+
+    Returns:
+        OCREngine: Engine instance
+    """
+    if isinstance(engine, OCREngine):
+        return engine
+    name = engine or PytesseractEngine.name
+    if name not in ENGINES:
+        raise ValueError(f"Unknown OCR engine: {name} (choose from {', '.join(ENGINES)})")
+    return ENGINES[name]()
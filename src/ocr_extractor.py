@@ -6,39 +6,119 @@ Supports multiple image formats and languages
 import os
 import sys
 import argparse
-import cv2
+import time
 import numpy as np
-import pytesseract
-import pyperclip
-from PIL import Image, ImageEnhance, ImageFilter
-from typing import Optional, List
+from PIL import Image
+from typing import Optional, List, Dict, Any, Union, Tuple, Sequence, Iterable
+from ocr_cache import OCRCache, DEFAULT_CACHE_SIZE_MB
+from ocr_engines import OCREngine, ENGINES, get_engine
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from preprocessing import (PreprocessingPipeline, DEFAULT_ENHANCE_STAGES, STAGES,
+                           load_grayscale, load_frame, iter_frames, count_frames,
+                           estimate_text_height)
+from text_regions import detect_text_regions, region_pixel_fraction
+from pdf_ingest import DEFAULT_PDF_DPI, open_pdf, page_text, render_page
+from instrumentation import StageTimer
+from ocr_cascade import (CascadeTier, DEFAULT_CASCADE, DEFAULT_MIN_CONFIDENCE,
+                         describe_cascade, mean_confidence)
+from word_boxes import WordBoxes
+from tiling import (DEFAULT_TILE_HEIGHT, image_height, iter_row_bands, iter_strips,
+                    should_tile, stitch_texts)
+from script_detection import DEFAULT_AUTO_LANGUAGES, language_for_script, osd_image
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Extra outputs rendered by the same tesseract run as the text: word boxes with
+# confidences (from the TSV renderer), hOCR and a searchable PDF
+OUTPUT_FORMATS = ("boxes", "hocr", "pdf")
+
 class OCRExtractor:
     """Main OCR text extraction class"""
     
-    def __init__(self, language: str = 'eng'):
+    def __init__(self, language: str = 'eng', cache: Optional[OCRCache] = None,
+                 engine: Union[str, OCREngine, None] = None,
+                 pipeline: Optional[PreprocessingPipeline] = None,
+                 detect_regions: bool = False, region_workers: int = 1,
+                 pdf_dpi: int = DEFAULT_PDF_DPI, batch_size: int = 1,
+                 cascade: Optional[Sequence[CascadeTier]] = None,
+                 min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+                 outputs: Sequence[str] = (), tile_height: int = 0, tile_workers: int = 1,
+                 languages: Sequence[str] = ()):
         """
         Initialize OCR extractor
         
         Args:
             language (str): Tesseract language code (default: 'eng')
+            cache (OCRCache): Optional cache of previously extracted text
+            engine (str or OCREngine): Tesseract backend, by name or instance
+                (default: 'pytesseract')
+            pipeline (PreprocessingPipeline): Enhancement stages run when enhance=True
+                (default: contrast, sharpen, denoise)
+            detect_regions (bool): Only OCR detected text regions instead of the whole image
+            region_workers (int): Threads used to OCR the regions of one image
+            pdf_dpi (int): Resolution for rasterizing PDF pages that have no text layer
+            batch_size (int): Images OCRed per tesseract run when extracting many
+                images (see extract_batch; 1 runs tesseract once per image)
+            cascade (Sequence[CascadeTier]): Adaptive mode: OCR settings tried in order
+                until one reaches min_confidence, replacing the enhance and psm
+                arguments of the extract methods (None disables; see DEFAULT_CASCADE)
+            min_confidence (float): Mean word confidence (0-100) that accepts a tier
+            outputs (Sequence[str]): Extra formats from OUTPUT_FORMATS to render from
+                each image's tesseract run, returned under "outputs" by extract_details
+            tile_height (int): OCR images taller than one and a half times this
+                in strips of about this many rows, cut between text lines
+                (0 disables; see recognize_tiled)
+            tile_workers (int): Threads used to OCR the strips of one image
+            languages (Sequence[str]): Auto-language mode: candidate language codes;
+                each image's script is detected and the image is OCRed with the
+                first candidate that reads it, or with language when none does
+                (empty disables; see detect_language)
         """
+        unknown = [name for name in outputs if name not in OUTPUT_FORMATS]
+        if unknown:
+            raise ValueError(f"Unknown output format(s): {', '.join(unknown)} "
+                             f"(choose from {', '.join(OUTPUT_FORMATS)})")
+
         self.language = language
-        self.supported_formats = {'.png', '.jpg', '.jpeg', '.tiff', '.bmp', '.gif', '.webp'}
+        self.cache = cache
+        self.engine = get_engine(engine)
+        self.pipeline = pipeline or PreprocessingPipeline()
+        self.detect_regions = detect_regions
+        self.region_workers = max(1, region_workers)
+        self.pdf_dpi = pdf_dpi
+        self.batch_size = max(1, batch_size)
+        self.cascade = tuple(cascade) if cascade else None
+        self.min_confidence = min_confidence
+        self.outputs = tuple(outputs)
+        self.tile_height = max(0, tile_height)
+        self.tile_workers = max(1, tile_workers)
+        self.languages = tuple(languages)
+        # Above this coverage, cropping saves too little to be worth the extra calls
+        self.max_region_fraction = 0.85
+        self.supported_formats = {'.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp', '.gif', '.webp',
+                                  '.pdf'}
         
-        # Verify Tesseract installation
+        # Verify Tesseract installation (the probe is cached per tesseract binary)
         try:
-            pytesseract.get_tesseract_version()
-            logger.info("Tesseract OCR is properly installed")
+            version = self.engine.check()
         except Exception as e:
-            logger.error(f"Tesseract not found: {e}")
-            logger.error("Please install Tesseract OCR: https://github.com/tesseract-ocr/tesseract")
-            sys.exit(1)
+            raise RuntimeError(f"Tesseract not found: {e}. Please install Tesseract OCR: "
+                               "https://github.com/tesseract-ocr/tesseract") from e
+        logger.info(f"Tesseract OCR is properly installed ({version}, {self.engine.name} engine)")
+        
+        languages = self.engine.languages()
+        if languages is not None:
+            wanted = language.split('+') + [code for code in self.languages
+                                            if code not in language.split('+')]
+            missing = [code for code in wanted if code not in languages]
+            if missing:
+                logger.warning(f"Tesseract language data not installed: {', '.join(missing)} "
+                               f"(available: {', '.join(languages)})")
+            if self.languages and 'osd' not in languages:
+                logger.warning("Script detection needs osd.traineddata; without it every "
+                               f"image is OCRed with '{language}'")
     
     def preprocess_image(self, image_path: str, enhance: bool = True) -> Image.Image:
         """
@@ -49,34 +129,461 @@ class OCRExtractor:
             enhance (bool): Whether to apply image enhancement
             
         Returns:
-            PIL.Image: Preprocessed image
+            PIL.Image: Preprocessed grayscale image
         """
-        try:
-            # Load image
-            image = Image.open(image_path)
+        return self.preprocess_with_stats(image_path, enhance)[0]
+    
+    def preprocess_with_stats(self, image_path: str,
+                              enhance: bool = True) -> Tuple[Image.Image, Dict[str, Any]]:
+        """
+        Preprocess image and report what each stage did
+        
+        Args:
+            image_path (str): Path to the image file
+            enhance (bool): Whether to apply image enhancement
+            
+        Returns:
+            Tuple[PIL.Image, Dict]: Preprocessed grayscale image, and stats with
+                per-stage "timings" in milliseconds and rescale pixel counts
+        """
+        gray, stats = self.preprocess_array(image_path, enhance)
+        return Image.fromarray(gray), stats
+    
+    def preprocess_array(self, image_path: str,
+                         enhance: bool = True) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Preprocess image into a grayscale NumPy array
+        
+        Args:
+            image_path (str): Path to the image file
+            enhance (bool): Whether to apply image enhancement
             
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+        Returns:
+            Tuple[np.ndarray, Dict]: Preprocessed grayscale array and preprocessing stats
+        """
+        try:
+            # Load image straight to grayscale
+            start = time.perf_counter()
+            gray = load_grayscale(image_path)
+            decode_ms = (time.perf_counter() - start) * 1000
             
-            if enhance:
-                # Enhance contrast
-                enhancer = ImageEnhance.Contrast(image)
-                image = enhancer.enhance(1.5)
-                
-                # Enhance sharpness
-                enhancer = ImageEnhance.Sharpness(image)
-                image = enhancer.enhance(2.0)
-                
-                # Apply slight blur to reduce noise
-                image = image.filter(ImageFilter.MedianFilter(size=3))
+            # Normalize text size and run the enhancement stages on the array
+            gray, stats = self.pipeline.run(gray, enhance)
+            stats["timings"] = dict(decode=decode_ms, **stats["timings"])
             
-            return image
+            return gray, stats
             
         except Exception as e:
             logger.error(f"Error preprocessing image: {e}")
             raise
     
+    def recognize(self, gray: np.ndarray, psm: int = 6, oem: int = 3,
+                  stats: Optional[Dict[str, Any]] = None,
+                  rendered: Optional[Dict[str, Any]] = None,
+                  language: Optional[str] = None) -> str:
+        """
+        Run Tesseract on a preprocessed image, region by region when detection is on
+        
+        Args:
+            gray (np.ndarray): Preprocessed grayscale image
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+            stats (Dict): Optional stats dict that receives region counts, the
+                fraction of pixels actually sent to Tesseract, and "regions" and
+                "ocr" timings
+            rendered (Dict): Optional dict that receives the extractor's extra
+                outputs, rendered by the same Tesseract run (see recognize_with_confidences)
+            language (str): Tesseract language code (default: the extractor's language)
+            
+        Returns:
+            str: Raw recognized text
+        """
+        return self.recognize_with_confidences(gray, psm, oem, stats, confidences=False,
+                                               rendered=rendered, language=language)[0]
+    
+    def recognize_with_confidences(self, gray: np.ndarray, psm: int = 6, oem: int = 3,
+                                   stats: Optional[Dict[str, Any]] = None,
+                                   confidences: bool = True,
+                                   rendered: Optional[Dict[str, Any]] = None,
+                                   language: Optional[str] = None
+                                   ) -> Tuple[str, Optional[List[float]]]:
+        """
+        Run Tesseract on a preprocessed image and collect its word confidences
+        
+        With rendered, every output in self.outputs comes from the same Tesseract
+        run as the text: "boxes" (WordBoxes, mapped back to the pixels of the
+        image before rescaling using stats["scale"]), "hocr" (str) and "pdf"
+        (bytes); both of the latter describe the preprocessed image. Regions
+        are only OCRed separately for boxes, since hOCR and PDF need the whole
+        image. Formats the engine cannot render are left out.
+        
+        Args:
+            gray (np.ndarray): Preprocessed grayscale image
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+            stats (Dict): Optional stats dict, as for recognize
+            confidences (bool): Read word confidences from the same Tesseract run
+            rendered (Dict): Optional dict that receives the extra outputs
+            language (str): Tesseract language code (default: the extractor's language)
+            
+        Returns:
+            Tuple[str, List[float]]: Raw recognized text, and per-word confidences
+                (None if not requested or the engine cannot report them)
+        """
+        language = language or self.language
+        stats = stats if stats is not None else {}
+        timer = StageTimer(stats.setdefault("timings", {}))
+        renderers = []
+        if rendered is not None:
+            renderers = ["tsv" if name == "boxes" else name for name in self.outputs]
+            if confidences and "tsv" not in renderers:
+                renderers.append("tsv")
+        
+        def run(image: Image.Image, x: int = 0,
+                y: int = 0) -> Tuple[str, Optional[List[float]], Dict[str, Any]]:
+            if renderers:
+                outputs = self.engine.image_to_outputs(image, language, psm, oem,
+                                                       ["txt"] + renderers)
+                text = outputs.pop("txt")
+                if "tsv" not in outputs:
+                    return text, None, outputs
+                boxes = WordBoxes.from_tsv(outputs.pop("tsv")).transformed(x, y)
+                outputs["boxes"] = boxes
+                return text, boxes.confidences.tolist(), outputs
+            if confidences:
+                text, word_confidences = self.engine.image_to_string_with_confidences(
+                    image, language, psm, oem)
+                return text, word_confidences, {}
+            return self.engine.image_to_string(image, language, psm, oem), None, {}
+        
+        regions = []
+        if self.detect_regions and not {"hocr", "pdf"} & set(renderers):
+            regions = self.find_regions(gray, stats)
+        if regions:
+            def recognize_region(region):
+                x, y, w, h = region
+                return run(Image.fromarray(gray[y:y + h, x:x + w]), x, y)
+            
+            with timer.stage("ocr"):
+                if self.region_workers > 1 and len(regions) > 1:
+                    with ThreadPoolExecutor(max_workers=self.region_workers) as pool:
+                        results = list(pool.map(recognize_region, regions))
+                else:
+                    results = [recognize_region(region) for region in regions]
+            
+            text = self.join_regions([result[0] for result in results])
+            word_confidences = None
+            if all(result[1] is not None for result in results):
+                word_confidences = [c for result in results for c in result[1]]
+            outputs = {}
+            if all("boxes" in result[2] for result in results):
+                outputs["boxes"] = WordBoxes.concatenate([result[2]["boxes"] for result in results])
+        else:
+            with timer.stage("ocr"):
+                text, word_confidences, outputs = run(Image.fromarray(gray))
+        
+        if rendered is not None:
+            if "boxes" in outputs and "boxes" in self.outputs:
+                outputs["boxes"] = outputs["boxes"].transformed(scale=stats.get("scale", 1.0))
+            rendered.update((name, outputs[name]) for name in self.outputs if name in outputs)
+        return text, word_confidences
+    
+    def recognize_adaptive(self, gray: np.ndarray, psm: int = 6, oem: int = 3,
+                           rendered: Optional[Dict[str, Any]] = None,
+                           language: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        Run the OCR cascade over a decoded image, escalating while confidence is low
+        
+        Each tier preprocesses the image its own way (the rescaled and enhanced
+        versions are each made once and shared by the tiers that use them) and
+        is OCRed with word confidences from the same Tesseract run. The first
+        tier whose mean confidence reaches min_confidence, or that finds no
+        words at all, is accepted; otherwise the most confident tier's text
+        is kept.
+        
+        Args:
+            gray (np.ndarray): Writable grayscale image, before preprocessing
+            psm (int): Page segmentation mode for tiers that do not set their own
+            oem (int): OCR engine mode
+            rendered (Dict): Optional dict that receives the chosen tier's extra
+                outputs (see recognize_with_confidences)
+            language (str): Tesseract language code (default: the extractor's language)
+            
+        Returns:
+            Tuple[str, Dict]: Raw text of the chosen tier, and stats with the
+                chosen "tier", its mean "confidence", every "cascade" attempt
+                (tier, confidence, ms, and empty when no words were found) and
+                the usual preprocessing stats and timings
+        """
+        # The first tier's time includes the rescale every tier builds on
+        start = time.perf_counter()
+        base, stats = self.pipeline.run(gray, enhance=False)
+        timer = StageTimer(stats["timings"])
+        prepared = {False: base}
+        attempts = []
+        best = None
+        
+        for tier in self.cascade:
+            if tier.enhance not in prepared:
+                # Copied so the unenhanced image stays available to later tiers
+                enhanced, enhance_stats = self.pipeline.run(base.copy(), enhance=True,
+                                                            rescale=False)
+                for name, value in enhance_stats["timings"].items():
+                    timer.add(name, value)
+                prepared[True] = enhanced
+            
+            tier_stats = {"timings": timer.timings, "scale": stats.get("scale", 1.0)}
+            tier_rendered = {} if rendered is not None else None
+            text, confidences = self.recognize_with_confidences(
+                prepared[tier.enhance], tier.psm if tier.psm is not None else psm, oem, tier_stats,
+                rendered=tier_rendered, language=language)
+            for key in ("regions", "ocr_pixel_fraction"):
+                if key in tier_stats:
+                    stats[key] = tier_stats[key]
+            
+            confidence = mean_confidence(confidences) if confidences is not None else None
+            attempt = {"tier": tier.name,
+                       "confidence": round(confidence, 1) if confidence is not None else None,
+                       "ms": round((time.perf_counter() - start) * 1000, 1)}
+            empty = confidences is not None and not len(confidences)
+            if empty:
+                attempt["empty"] = True
+            attempts.append(attempt)
+            start = time.perf_counter()
+            if best is None or (confidence is not None and confidence > best[2]):
+                best = (attempt, text, confidence if confidence is not None else -1.0,
+                        tier_rendered)
+            
+            # Without confidences there is nothing to escalate on, and a blank
+            # image stays blank at every tier
+            if confidence is None or confidence >= self.min_confidence:
+                break
+        
+        attempt, text, _, best_rendered = best
+        attempt["final"] = True
+        if rendered is not None:
+            rendered.update(best_rendered)
+        stats.update(tier=attempt["tier"], confidence=attempt["confidence"], cascade=attempts)
+        return text, stats
+    
+    def recognize_image(self, gray: np.ndarray, enhance: bool = True, psm: int = 6,
+                        oem: int = 3, rendered: Optional[Dict[str, Any]] = None,
+                        language: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        Preprocess and recognize a decoded image the way the extractor is configured
+        
+        In auto-language mode the image's script is detected first to pick
+        its language; then the image goes through the cascade in adaptive
+        mode, or through the preprocessing pipeline and recognize.
+        
+        Args:
+            gray (np.ndarray): Writable grayscale image, before preprocessing
+            enhance (bool): Whether to enhance the image (unused in adaptive mode)
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+            rendered (Dict): Optional dict that receives the extra outputs
+            language (str): Tesseract language code (default: detected in
+                auto-language mode, otherwise the extractor's language)
+            
+        Returns:
+            Tuple[str, Dict]: Raw text, and stats as from recognize_adaptive or
+                the pipeline, plus the detected "script" and chosen "language"
+                in auto-language mode
+        """
+        detection = None
+        if self.languages and language is None:
+            detection = self.detect_language(gray)
+            language = detection["language"]
+        
+        if self.cascade is not None:
+            text, stats = self.recognize_adaptive(gray, psm, oem, rendered, language)
+        else:
+            gray, stats = self.pipeline.run(gray, enhance)
+            text = self.recognize(gray, psm, oem, stats, rendered, language)
+        
+        if detection is not None:
+            self.add_detection(stats, detection)
+        return text, stats
+    
+    def detect_language(self, gray: np.ndarray) -> Dict[str, Any]:
+        """
+        Pick an image's language model from its script (auto-language mode)
+        
+        Tesseract's script detection runs on a small copy of the image (see
+        script_detection.osd_image), which costs a fraction of a full OCR pass.
+        
+        Args:
+            gray (np.ndarray): Grayscale image, before preprocessing
+            
+        Returns:
+            Dict: Detected "script" and its "script_confidence" (None when the
+                image has too little text), the chosen "language" and "ms" spent
+        """
+        start = time.perf_counter()
+        detected = self.engine.detect_script(Image.fromarray(osd_image(gray)))
+        script, confidence = detected if detected is not None else (None, None)
+        language = language_for_script(script, self.languages) or self.language
+        return {"script": script, "script_confidence": confidence, "language": language,
+                "ms": (time.perf_counter() - start) * 1000}
+    
+    @staticmethod
+    def add_detection(stats: Dict[str, Any], detection: Dict[str, Any]):
+        """Record a detect_language result in an image's stats"""
+        stats.update(script=detection["script"], script_confidence=detection["script_confidence"],
+                     language=detection["language"])
+        stats["timings"] = dict(script=detection["ms"], **stats.get("timings", {}))
+    
+    def use_tiles(self, height: int) -> bool:
+        """Check whether an image of this height is OCRed in strips"""
+        # hOCR and PDF describe one whole image, so they are never stitched from strips
+        return should_tile(height, self.tile_height) and not {"hocr", "pdf"} & set(self.outputs)
+    
+    def recognize_tiled(self, bands: Iterable[np.ndarray], enhance: bool = True,
+                        psm: int = 6, oem: int = 3,
+                        rendered: Optional[Dict[str, Any]] = None,
+                        language: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        OCR a very tall image strip by strip and stitch the results
+        
+        The rows are cut into strips of about tile_height at the blank gaps
+        between text lines (see tiling.iter_strips). Each strip is preprocessed
+        and OCRed (through the cascade in adaptive mode) on tile_workers
+        threads while the next strips are read, so only a few strips are in
+        memory at once. Texts are joined in order, dropping lines repeated by
+        overlapping cuts; word boxes are placed on the whole image, keeping
+        each word of an overlap from the strip it lies further inside. In
+        auto-language mode the script is detected once, on the first strip.
+        
+        Args:
+            bands (Iterable[np.ndarray]): Grayscale rows, top to bottom (see
+                tiling.iter_row_bands), before preprocessing
+            enhance (bool): Whether to enhance the strips before OCR
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+            rendered (Dict): Optional dict that receives the "boxes" output
+            language (str): Tesseract language code (default: detected in
+                auto-language mode, otherwise the extractor's language)
+            
+        Returns:
+            Tuple[str, Dict]: Raw stitched text, and stats with the number of
+                "tiles", rescale pixel counts and timings summed over the strips
+                ("decode" covers reading and cutting the rows)
+        """
+        stats: Dict[str, Any] = {"timings": {}, "tiles": 0}
+        timer = StageTimer(stats["timings"])
+        attempts = []
+        texts = []
+        strip_boxes = []
+        # Text height, measured on the first strip cut without a gap, bounds
+        # how many lines an overlap can hold when stitching
+        line_height = None
+        
+        def recognize_strip(strip: np.ndarray) -> Tuple[str, Dict[str, Any], Optional[Dict]]:
+            # Overlapping strips share rows, and preprocessing works in place
+            strip = strip.copy()
+            strip_rendered = {} if rendered is not None else None
+            text, strip_stats = self.recognize_image(strip, enhance, psm, oem, strip_rendered,
+                                                     language)
+            return text, strip_stats, strip_rendered
+        
+        def collect(top: int, height: int, repeated: int, future):
+            text, strip_stats, strip_rendered = future.result()
+            texts.append((text, repeated))
+            stats["tiles"] += 1
+            for name, value in strip_stats["timings"].items():
+                timer.add(name, value)
+            for key in ("pixels_in", "pixels_out"):
+                if key in strip_stats:
+                    stats[key] = stats.get(key, 0) + strip_stats[key]
+            attempts.extend(strip_stats.get("cascade", []))
+            if strip_rendered and "boxes" in strip_rendered:
+                strip_boxes.append((top, height, repeated,
+                                    strip_rendered["boxes"].transformed(dy=top)))
+        
+        strips = iter_strips(bands, self.tile_height)
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.tile_workers) as pool:
+            while True:
+                with timer.stage("decode"):
+                    strip = next(strips, None)
+                if strip is None:
+                    break
+                top, rows, repeated = strip
+                if repeated and line_height is None:
+                    line_height = estimate_text_height(rows) or 0
+                if self.languages and language is None:
+                    detection = self.detect_language(rows)
+                    language = detection["language"]
+                    self.add_detection(stats, detection)
+                pending.append((top, len(rows), repeated, pool.submit(recognize_strip, rows)))
+                # Bound the strips held in memory while keeping every thread busy
+                while len(pending) > self.tile_workers:
+                    collect(*pending.popleft())
+            while pending:
+                collect(*pending.popleft())
+        
+        if attempts:
+            stats["cascade"] = attempts
+        if rendered is not None and "boxes" in self.outputs:
+            rendered["boxes"] = self.stitch_boxes(strip_boxes)
+        return stitch_texts(texts, line_height), stats
+    
+    @staticmethod
+    def stitch_boxes(strips: List[Tuple[int, int, int, WordBoxes]]) -> WordBoxes:
+        """
+        Join the word boxes of consecutive strips, dropping words read twice in overlaps
+        
+        Args:
+            strips (List[Tuple]): Each strip's top row, height, repeated row count
+                and word boxes in image coordinates, in order
+            
+        Returns:
+            WordBoxes: Every word once
+        """
+        parts = []
+        for index, (top, height, repeated, boxes) in enumerate(strips):
+            middle = boxes.boxes["top"] + boxes.boxes["height"] / 2
+            keep = np.ones(len(boxes), dtype=bool)
+            if repeated:
+                keep &= middle >= top + repeated / 2
+            if index + 1 < len(strips) and strips[index + 1][2]:
+                next_top, _, next_repeated, _ = strips[index + 1]
+                keep &= middle < next_top + next_repeated / 2
+            parts.append(boxes if keep.all() else boxes.select(keep))
+        return WordBoxes.concatenate(parts)
+    
+    def find_regions(self, gray: np.ndarray,
+                     stats: Dict[str, Any]) -> List[Tuple[int, int, int, int]]:
+        """
+        Detect the text regions worth OCRing separately
+        
+        Args:
+            gray (np.ndarray): Preprocessed grayscale image
+            stats (Dict): Stats dict that receives the region count, the fraction
+                of pixels to OCR and a "regions" timing
+            
+        Returns:
+            List[Tuple]: (x, y, width, height) boxes in reading order, or an empty
+                list when the whole image should be OCRed
+        """
+        with StageTimer(stats.setdefault("timings", {})).stage("regions"):
+            regions = detect_text_regions(gray)
+            fraction = region_pixel_fraction(regions, gray.shape)
+        
+        if regions and fraction <= self.max_region_fraction:
+            stats["regions"] = len(regions)
+            stats["ocr_pixel_fraction"] = round(fraction, 4)
+            return regions
+        
+        stats["regions"] = 0
+        stats["ocr_pixel_fraction"] = 1.0
+        return []
+    
+    @staticmethod
+    def join_regions(texts: List[str]) -> str:
+        """Join the raw texts of an image's regions (already in reading order)"""
+        return '\n'.join(text.strip() for text in texts if text.strip())
+    
     def extract_text_from_image(self, image_path: str, enhance: bool = True, 
                               psm: int = 6, oem: int = 3) -> str:
         """
@@ -91,35 +598,474 @@ class OCRExtractor:
         Returns:
             str: Extracted text
         """
+        return self.extract_details(image_path, enhance=enhance, psm=psm, oem=oem)["text"]
+    
+    def extract_details(self, image_path: str, enhance: bool = True,
+                        psm: int = 6, oem: int = 3, frame: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Extract text from image and report how it was produced
+        
+        Multi-page TIFFs, animated GIF/WebP images and PDFs are read one frame
+        at a time; each page is extracted separately and listed under "pages".
+        PDF pages with an embedded text layer are returned without OCR.
+        
+        Args:
+            image_path (str): Path to the image file
+            enhance (bool): Whether to enhance image before OCR
+            psm (int): Page segmentation mode (default: 6 - uniform block of text)
+            oem (int): OCR engine mode (default: 3 - LSTM only)
+            frame (int): Only extract this zero-based frame of a multi-frame image
+            
+        Returns:
+            Dict: Extracted "text", "cache" status ("hit", "miss" or None when disabled)
+                and "stats" with per-stage "timings" in milliseconds (only the cache
+                lookup when served from the cache), plus per-page "pages" records
+                for multi-frame images and, when the extractor has extra output
+                formats, "outputs" (see combine_pages for multi-frame images)
+        """
         try:
-            # Check if file exists
-            if not os.path.exists(image_path):
-                raise FileNotFoundError(f"Image file not found: {image_path}")
+            file_ext = self.check_file(image_path)
+            
+            if file_ext == '.pdf':
+                return self.extract_pdf(image_path, enhance, psm, oem, frame)
             
-            # Check file format
-            file_ext = os.path.splitext(image_path)[1].lower()
-            if file_ext not in self.supported_formats:
-                raise ValueError(f"Unsupported file format: {file_ext}")
+            if frame is not None:
+                start = time.perf_counter()
+                gray = load_frame(image_path, frame)
+                return self.extract_page(gray, frame, enhance, psm, oem,
+                                         decode_ms=(time.perf_counter() - start) * 1000,
+                                         raise_errors=True)
             
-            # Preprocess image
-            image = self.preprocess_image(image_path, enhance)
+            if count_frames(image_path) > 1:
+                pages = []
+                frames = iter_frames(image_path)
+                while True:
+                    # Frames are decoded lazily, so time each step of the iterator
+                    start = time.perf_counter()
+                    gray = next(frames, None)
+                    if gray is None:
+                        break
+                    pages.append(self.extract_page(gray, len(pages), enhance, psm, oem,
+                                                   decode_ms=(time.perf_counter() - start) * 1000))
+                details = self.combine_pages(pages)
+                logger.info(f"Successfully extracted text from {len(pages)} pages of: {image_path}")
+                return details
             
-            # Configure Tesseract
-            custom_config = f'--oem {oem} --psm {psm} -l {self.language}'
+            timer = StageTimer()
+            # The cache only holds text, so extra outputs always need a tesseract run
+            rendered = {} if self.outputs else None
             
-            # Extract text
-            extracted_text = pytesseract.image_to_string(image, config=custom_config)
+            # Check cache before doing any image work
+            cache_key = None
+            if self.cache is not None:
+                with timer.stage("cache"):
+                    cache_key = self.cache.make_key(image_path,
+                                                    **self.cache_settings(enhance, psm, oem))
+                    cached_text = self.cache.get(cache_key) if rendered is None else None
+                if cached_text is not None:
+                    logger.info(f"Using cached text for: {image_path}")
+                    return {"text": cached_text, "cache": "hit",
+                            "stats": {"timings": timer.timings}}
+            
+            if self.tile_height and self.use_tiles(image_height(image_path)):
+                # Very tall image: read lazily and OCRed strip by strip
+                extracted_text, stats = self.recognize_tiled(iter_row_bands(image_path),
+                                                             enhance, psm, oem, rendered)
+                timer = StageTimer(dict(timer.timings, **stats["timings"]))
+                stats["timings"] = timer.timings
+            else:
+                # Detect the language, then preprocess (each cascade tier its own
+                # way in adaptive mode) and extract text
+                start = time.perf_counter()
+                gray = load_grayscale(image_path)
+                decode_ms = (time.perf_counter() - start) * 1000
+                extracted_text, stats = self.recognize_image(gray, enhance, psm, oem, rendered)
+                timer = StageTimer(dict(timer.timings, decode=decode_ms, **stats["timings"]))
+                stats["timings"] = timer.timings
             
             # Clean up text
-            cleaned_text = self.clean_text(extracted_text)
+            with timer.stage("clean"):
+                cleaned_text = self.clean_text(extracted_text)
+            
+            if cache_key is not None:
+                with timer.stage("cache"):
+                    self.cache.put(cache_key, cleaned_text)
             
             logger.info(f"Successfully extracted text from: {image_path}")
-            return cleaned_text
+            details = {"text": cleaned_text, "cache": "miss" if cache_key else None,
+                       "stats": stats}
+            if rendered is not None:
+                details["outputs"] = rendered
+            return details
             
         except Exception as e:
             logger.error(f"Error extracting text from {image_path}: {e}")
             raise
     
+    def check_file(self, image_path: str) -> str:
+        """
+        Check that an input file exists and has a supported format
+        
+        Args:
+            image_path (str): Path to the image file
+            
+        Returns:
+            str: Lower-case file extension
+        """
+        if not os.path.exists(image_path):
+            raise FileNotFoundError(f"Image file not found: {image_path}")
+        
+        file_ext = os.path.splitext(image_path)[1].lower()
+        if file_ext not in self.supported_formats:
+            raise ValueError(f"Unsupported file format: {file_ext}")
+        return file_ext
+    
+    def extract_batch(self, image_paths: List[str], enhance: bool = True,
+                      psm: int = 6, oem: int = 3) -> List[Dict[str, Any]]:
+        """
+        Extract text from several images with a single tesseract run
+        
+        Each image is looked up in the cache and preprocessed as usual, then
+        every image (or detected text region) that still needs OCR is passed
+        to one tesseract process, which loads the language model only once.
+        In auto-language mode, images are grouped by detected language and
+        each group gets its own run. If a run fails, the images are retried
+        one at a time so a single bad image only fails itself. Multi-page
+        files, PDFs and images tall enough to be tiled, and every image in
+        adaptive mode (whose tiers depend on each image's confidence) or with
+        extra output formats (rendered per image), are extracted on their own
+        with extract_details. The "ocr" timing of a batch is shared evenly
+        between its images.
+        
+        Args:
+            image_paths (List[str]): Image file paths, usually batch_size of them
+            enhance (bool): Whether to enhance images before OCR
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+            
+        Returns:
+            List[Dict]: Details as returned by extract_details, or "error" on
+                failure, per image in input order
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(image_paths)
+        # (index, stats, cache key, image crops to OCR, whether the crops are regions, language)
+        jobs = []
+        
+        for index, image_path in enumerate(image_paths):
+            try:
+                file_ext = self.check_file(image_path)
+                if (self.cascade is not None or self.outputs or file_ext == '.pdf'
+                        or count_frames(image_path) > 1
+                        or self.tile_height and self.use_tiles(image_height(image_path))):
+                    results[index] = self.extract_details(image_path, enhance, psm, oem)
+                    continue
+                
+                timer = StageTimer()
+                cache_key = None
+                if self.cache is not None:
+                    with timer.stage("cache"):
+                        cache_key = self.cache.make_key(image_path,
+                                                        **self.cache_settings(enhance, psm, oem))
+                        cached_text = self.cache.get(cache_key)
+                    if cached_text is not None:
+                        logger.info(f"Using cached text for: {image_path}")
+                        results[index] = {"text": cached_text, "cache": "hit",
+                                          "stats": {"timings": timer.timings}}
+                        continue
+                
+                if self.languages:
+                    start = time.perf_counter()
+                    gray = load_grayscale(image_path)
+                    decode_ms = (time.perf_counter() - start) * 1000
+                    detection = self.detect_language(gray)
+                    gray, stats = self.pipeline.run(gray, enhance)
+                    stats["timings"] = dict(decode=decode_ms, **stats["timings"])
+                    self.add_detection(stats, detection)
+                else:
+                    gray, stats = self.preprocess_array(image_path, enhance)
+                stats["timings"] = dict(timer.timings, **stats["timings"])
+                regions = self.find_regions(gray, stats) if self.detect_regions else []
+                crops = [gray[y:y + h, x:x + w] for x, y, w, h in regions] or [gray]
+                jobs.append((index, stats, cache_key, crops, bool(regions),
+                             stats.get("language", self.language)))
+            except Exception as e:
+                logger.error(f"Error extracting text from {image_path}: {e}")
+                results[index] = {"error": str(e)}
+        
+        # Images of the same language share a run, so each model loads once per batch
+        groups: Dict[str, list] = {}
+        for job in jobs:
+            groups.setdefault(job[5], []).append(job)
+        job_texts = None
+        if jobs:
+            start = time.perf_counter()
+            try:
+                job_texts = {}
+                for language, group in groups.items():
+                    images = [Image.fromarray(crop) for job in group for crop in job[3]]
+                    texts = self.engine.images_to_strings(images, language, psm, oem)
+                    offset = 0
+                    for job in group:
+                        job_texts[job[0]] = texts[offset:offset + len(job[3])]
+                        offset += len(job[3])
+            except Exception as e:
+                job_texts = None
+                logger.warning(f"Batched OCR of {len(jobs)} images failed ({e}), "
+                               "retrying them one at a time")
+            ocr_ms = (time.perf_counter() - start) * 1000 / len(jobs)
+        
+        for index, stats, cache_key, crops, is_regions, language in jobs:
+            image_path = image_paths[index]
+            timer = StageTimer(stats["timings"])
+            try:
+                if job_texts is not None:
+                    raw_texts = job_texts[index]
+                    timer.add("ocr", ocr_ms)
+                else:
+                    with timer.stage("ocr"):
+                        raw_texts = [self.engine.image_to_string(Image.fromarray(crop),
+                                                                 language, psm, oem)
+                                     for crop in crops]
+                raw_text = self.join_regions(raw_texts) if is_regions else raw_texts[0]
+                
+                with timer.stage("clean"):
+                    text = self.clean_text(raw_text)
+                if cache_key is not None:
+                    with timer.stage("cache"):
+                        self.cache.put(cache_key, text)
+                
+                logger.info(f"Successfully extracted text from: {image_path}")
+                results[index] = {"text": text, "cache": "miss" if cache_key else None,
+                                  "stats": stats}
+            except Exception as e:
+                logger.error(f"Error extracting text from {image_path}: {e}")
+                results[index] = {"error": str(e)}
+        
+        return results
+    
+    def cache_settings(self, enhance: bool, psm: int, oem: int) -> Dict[str, Any]:
+        """Settings that affect extracted text, used to build cache keys"""
+        settings = dict(language=self.language, psm=psm, oem=oem, enhance=enhance,
+                        preprocess=self.pipeline.describe(enhance), regions=self.detect_regions)
+        if self.cascade is not None:
+            settings.update(enhance=None, preprocess=self.pipeline.describe(True),
+                            cascade=describe_cascade(self.cascade, self.min_confidence))
+        if self.tile_height:
+            # Stitched strips can read differently from the whole image
+            settings["tile_height"] = self.tile_height
+        if self.languages:
+            # The language is picked per image, from these candidates
+            settings["auto_languages"] = list(self.languages)
+        return settings
+    
+    def extract_frame(self, gray: np.ndarray, frame: int, enhance: bool = True,
+                      psm: int = 6, oem: int = 3) -> Dict[str, Any]:
+        """
+        Extract text from one decoded frame of a multi-frame image
+        
+        Args:
+            gray (np.ndarray): Grayscale frame, modified in place
+            frame (int): Zero-based frame index
+            enhance (bool): Whether to enhance the frame before OCR
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+            
+        Returns:
+            Dict: "page" number (1-based), "text", "cache" status and "stats", plus
+                "outputs" when the extractor has extra output formats
+        """
+        timer = StageTimer()
+        rendered = {} if self.outputs else None
+        
+        # Frames have no file of their own, so they are keyed by their pixels
+        cache_key = None
+        if self.cache is not None:
+            with timer.stage("cache"):
+                cache_key = self.cache.make_data_key(gray.tobytes(), shape=gray.shape,
+                                                     **self.cache_settings(enhance, psm, oem))
+                cached_text = self.cache.get(cache_key) if rendered is None else None
+            if cached_text is not None:
+                return {"page": frame + 1, "text": cached_text, "cache": "hit",
+                        "stats": {"timings": timer.timings}}
+        
+        if self.use_tiles(gray.shape[0]):
+            text, stats = self.recognize_tiled([gray], enhance, psm, oem, rendered)
+        else:
+            text, stats = self.recognize_image(gray, enhance, psm, oem, rendered)
+        timer = StageTimer(dict(timer.timings, **stats["timings"]))
+        stats["timings"] = timer.timings
+        with timer.stage("clean"):
+            text = self.clean_text(text)
+        
+        if cache_key is not None:
+            with timer.stage("cache"):
+                self.cache.put(cache_key, text)
+        details = {"page": frame + 1, "text": text, "cache": "miss" if cache_key else None,
+                   "stats": stats}
+        if rendered is not None:
+            if "boxes" in rendered:
+                rendered["boxes"] = rendered["boxes"].transformed(page=frame)
+            details["outputs"] = rendered
+        return details
+    
+    def extract_page(self, gray: np.ndarray, frame: int, enhance: bool = True,
+                     psm: int = 6, oem: int = 3, decode_ms: Optional[float] = None,
+                     raise_errors: bool = False) -> Dict[str, Any]:
+        """
+        Extract one decoded frame, recording a failure instead of raising
+        
+        Args:
+            gray (np.ndarray): Grayscale frame
+            frame (int): Zero-based frame index
+            enhance (bool): Whether to enhance the frame before OCR
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+            decode_ms (float): Time spent decoding the frame, added to its timings
+            raise_errors (bool): Raise instead of recording failures
+            
+        Returns:
+            Dict: Page details from extract_frame, or "page" and "error" on failure
+        """
+        try:
+            details = self.extract_frame(gray, frame, enhance, psm, oem)
+        except Exception as e:
+            if raise_errors:
+                raise
+            logger.error(f"Error extracting text from page {frame + 1}: {e}")
+            return {"page": frame + 1, "error": str(e)}
+        
+        if decode_ms is not None:
+            details["stats"]["timings"] = dict(decode=decode_ms, **details["stats"]["timings"])
+        return details
+    
+    def extract_pdf(self, pdf_path: str, enhance: bool = True, psm: int = 6, oem: int = 3,
+                    frame: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Extract text from a PDF, or from one of its pages
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            enhance (bool): Whether to enhance rasterized pages before OCR
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+            frame (int): Only extract this zero-based page
+            
+        Returns:
+            Dict: Page details when frame is given, otherwise combined document details
+        """
+        with open_pdf(pdf_path) as document:
+            if frame is not None:
+                return self.extract_pdf_page(document[frame], frame, enhance, psm, oem)
+            
+            pages = []
+            for index, page in enumerate(document):
+                try:
+                    pages.append(self.extract_pdf_page(page, index, enhance, psm, oem))
+                except Exception as e:
+                    logger.error(f"Error extracting text from page {index + 1}: {e}")
+                    pages.append({"page": index + 1, "error": str(e)})
+        
+        details = self.combine_pages(pages)
+        logger.info(f"Successfully extracted text from {len(pages)} pages of: {pdf_path}")
+        return details
+    
+    def extract_pdf_page(self, page, index: int, enhance: bool = True,
+                         psm: int = 6, oem: int = 3) -> Dict[str, Any]:
+        """
+        Extract one PDF page, using its text layer when it has one
+        
+        Args:
+            page (pymupdf.Page): PDF page
+            index (int): Zero-based page index
+            enhance (bool): Whether to enhance the rasterized page before OCR
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+            
+        Returns:
+            Dict: Page details with "source" set to "text_layer" or "ocr"
+        """
+        text = page_text(page)
+        if text is not None:
+            return {"page": index + 1, "text": self.clean_text(text), "cache": None,
+                    "stats": {}, "source": "text_layer"}
+        
+        start = time.perf_counter()
+        gray = render_page(page, self.pdf_dpi)
+        render_ms = (time.perf_counter() - start) * 1000
+        
+        details = self.extract_frame(gray, index, enhance, psm, oem)
+        details["stats"]["timings"] = dict(render=render_ms, **details["stats"]["timings"])
+        details["source"] = "ocr"
+        return details
+    
+    def combine_pages(self, pages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Combine per-page details into the details of the whole document
+        
+        Args:
+            pages (List[Dict]): Page details in page order
+            
+        Returns:
+            Dict: Combined "text" with page headers, overall "cache" status, summed
+                "stats" timings and pixel counts, and per-page "pages" records (without text),
+                plus "outputs" when pages have extra outputs: "boxes" of every page
+                in one WordBoxes, and "hocr" and "pdf" as dicts keyed by page number
+        """
+        texts = []
+        outputs: Dict[str, Any] = {}
+        page_boxes = []
+        records = []
+        timings = {}
+        attempts = []
+        pixels_in = pixels_out = 0
+        for page in pages:
+            record = {"page": page["page"]}
+            if "error" in page:
+                record.update(status="failed", text_length=0, error=page["error"])
+            else:
+                text = page["text"]
+                record.update(status="success", text_length=len(text), cache=page["cache"])
+                if "source" in page:
+                    record["source"] = page["source"]
+                if text:
+                    texts.append(f"--- Page {page['page']} ---\n{text}")
+                stats = page["stats"]
+                if "tier" in stats:
+                    record.update(tier=stats["tier"], confidence=stats["confidence"])
+                if "tiles" in stats:
+                    record["tiles"] = stats["tiles"]
+                if "language" in stats:
+                    record.update(script=stats["script"], language=stats["language"])
+                attempts.extend(stats.get("cascade", []))
+                for name, value in page.get("outputs", {}).items():
+                    if name == "boxes":
+                        page_boxes.append(value)
+                    else:
+                        outputs.setdefault(name, {})[page["page"]] = value
+                pixels_in += stats.get("pixels_in", 0)
+                pixels_out += stats.get("pixels_out", 0)
+                for name, value in stats.get("timings", {}).items():
+                    timings[name] = timings.get(name, 0.0) + value
+            records.append(record)
+        
+        succeeded = [page for page in pages if "error" not in page]
+        if not succeeded:
+            raise RuntimeError(f"All {len(pages)} pages failed")
+        
+        statuses = {page["cache"] for page in succeeded}
+        cache = "miss" if "miss" in statuses else ("hit" if "hit" in statuses else None)
+        stats = {"timings": timings}
+        if pixels_in:
+            stats.update(pixels_in=pixels_in, pixels_out=pixels_out)
+        if attempts:
+            stats["cascade"] = attempts
+        details = {"text": "\n\n".join(texts), "cache": cache, "stats": stats, "pages": records}
+        if page_boxes:
+            outputs["boxes"] = WordBoxes.concatenate(page_boxes)
+        if outputs:
+            details["outputs"] = outputs
+        return details
+    
     def clean_text(self, text: str) -> str:
         """
         Clean extracted text by removing extra whitespace and formatting
@@ -142,29 +1088,37 @@ class OCRExtractor:
         return '\n'.join(cleaned_lines)
     
     def extract_text_from_multiple_images(self, image_paths: List[str], 
-                                        combine: bool = True) -> str:
+                                        combine: bool = True, workers: Optional[int] = 1,
+                                        enhance: bool = True, psm: int = 6, oem: int = 3) -> str:
         """
         Extract text from multiple images
         
         Args:
             image_paths (List[str]): List of image file paths
             combine (bool): Whether to combine all text into one string
+            workers (int): Number of worker processes (None or 0 means one per CPU core)
+            enhance (bool): Whether to enhance images before OCR
+            psm (int): Page segmentation mode (default: 6 - uniform block of text)
+            oem (int): OCR engine mode (default: 3 - LSTM only)
             
         Returns:
             str: Combined extracted text or individual results
         """
+        from parallel_engine import ParallelEngine
+        
+        engine = ParallelEngine(self, workers=workers)
         all_text = []
         
-        for i, image_path in enumerate(image_paths):
-            try:
-                text = self.extract_text_from_image(image_path)
-                if combine:
-                    all_text.append(f"--- Image {i+1}: {os.path.basename(image_path)} ---\n{text}\n")
-                else:
-                    all_text.append(text)
-            except Exception as e:
-                logger.warning(f"Failed to process {image_path}: {e}")
+        for i, result in enumerate(engine.imap(image_paths, enhance=enhance, psm=psm, oem=oem)):
+            if result["status"] != "success":
+                logger.warning(f"Failed to process {result['file_path']}: {result['error']}")
                 continue
+            
+            text = result["extracted_text"]
+            if combine:
+                all_text.append(f"--- Image {i+1}: {result['file_name']} ---\n{text}\n")
+            else:
+                all_text.append(text)
         
         return '\n'.join(all_text) if combine else all_text
     
@@ -188,6 +1142,37 @@ class OCRExtractor:
             logger.error(f"Error saving text to file: {e}")
             return False
     
+    def save_outputs(self, outputs: Dict[str, Any], base_path: str) -> Dict[str, List[str]]:
+        """
+        Save extra outputs next to a text file
+        
+        Word boxes are saved as a NumPy .npz file (see WordBoxes.load). hOCR
+        and PDF outputs of multi-frame images get one file per page.
+        
+        Args:
+            outputs (Dict): "outputs" of extract_details
+            base_path (str): Output path without extension
+            
+        Returns:
+            Dict[str, List[str]]: Paths written per format
+        """
+        files = {}
+        for name, value in outputs.items():
+            if name == "boxes":
+                path = f"{base_path}.boxes.npz"
+                value.save(path)
+                files[name] = [path]
+                continue
+            pages = value if isinstance(value, dict) else {None: value}
+            files[name] = []
+            for page, data in sorted(pages.items(), key=lambda item: item[0] or 0):
+                path = f"{base_path}.{name}" if page is None else f"{base_path}_page{page:04d}.{name}"
+                with open(path, 'wb') as f:
+                    f.write(data if isinstance(data, bytes) else data.encode('utf-8'))
+                files[name].append(path)
+        logger.info(f"Saved {', '.join(files)} output for: {base_path}")
+        return files
+    
     def copy_to_clipboard(self, text: str) -> bool:
         """
         Copy text to clipboard
@@ -199,6 +1184,8 @@ class OCRExtractor:
             bool: Success status
         """
         try:
+            import pyperclip
+            
             pyperclip.copy(text)
             logger.info("Text copied to clipboard")
             return True
@@ -206,10 +1193,88 @@ class OCRExtractor:
             logger.error(f"Error copying to clipboard: {e}")
             return False
 
+def add_extractor_arguments(parser: argparse.ArgumentParser):
+    """
+    Add the OCR engine, cache and preprocessing options shared by the command line tools
+    
+    Args:
+        parser (argparse.ArgumentParser): Parser to extend
+    """
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='pytesseract',
+                       help='Tesseract backend: pytesseract runs the tesseract binary per image, '
+                            'pipe streams uncompressed images over stdin without temp files, '
+                            'tessapi keeps libtesseract loaded in-process (default: pytesseract)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Do not read or write the OCR result cache')
+    parser.add_argument('--cache-dir', default=None,
+                       help='OCR result cache directory (default: ~/.cache/screenshot-text-extractor)')
+    parser.add_argument('--cache-size', type=float, default=DEFAULT_CACHE_SIZE_MB,
+                       help=f'Maximum OCR result cache size in MB (default: {DEFAULT_CACHE_SIZE_MB})')
+    parser.add_argument('--preprocess', default=','.join(DEFAULT_ENHANCE_STAGES),
+                       help='Comma-separated enhancement stages to run, in order '
+                            f'(available: {", ".join(STAGES)}; default: {",".join(DEFAULT_ENHANCE_STAGES)})')
+    parser.add_argument('--no-rescale', action='store_true',
+                       help='Do not resize images to normalize text height before OCR')
+    parser.add_argument('--detect-regions', action='store_true',
+                       help='Only OCR detected text regions, skipping whitespace and graphics')
+    parser.add_argument('--region-workers', type=int, default=1,
+                       help='Threads used to OCR the text regions of one image (default: 1)')
+    parser.add_argument('--pdf-dpi', type=int, default=DEFAULT_PDF_DPI,
+                       help='Resolution for rasterizing PDF pages without a text layer '
+                            f'(default: {DEFAULT_PDF_DPI})')
+    parser.add_argument('--adaptive', type=float, nargs='?', const=DEFAULT_MIN_CONFIDENCE,
+                       default=None, metavar='MIN_CONFIDENCE',
+                       help='OCR each image with cheap settings first and only retry with '
+                            'enhancement, then sparse-text segmentation, while the mean word '
+                            f'confidence is below MIN_CONFIDENCE (default: {DEFAULT_MIN_CONFIDENCE:g})')
+    parser.add_argument('--formats', default='',
+                       help='Comma-separated extra outputs rendered by the same tesseract run '
+                            f'as the text (available: {", ".join(OUTPUT_FORMATS)})')
+    parser.add_argument('--tile', type=int, nargs='?', const=DEFAULT_TILE_HEIGHT, default=0,
+                       metavar='HEIGHT',
+                       help='OCR very tall images (long scrolling screenshots, large scans) in '
+                            'strips of about HEIGHT rows cut between text lines; TIFFs are read '
+                            f'strip by strip when tifffile is installed (default: {DEFAULT_TILE_HEIGHT})')
+    parser.add_argument('--tile-workers', type=int, default=1,
+                       help='Threads used to OCR the strips of one tiled image (default: 1)')
+    parser.add_argument('--auto-language', nargs='?', const=','.join(DEFAULT_AUTO_LANGUAGES),
+                       default=None, metavar='LANGS',
+                       help='Detect each image\'s script and OCR it with the matching one of '
+                            'these comma-separated languages, falling back to -l '
+                            f'(default: {",".join(DEFAULT_AUTO_LANGUAGES)})')
+    parser.add_argument('--batch-size', type=int, default=1,
+                       help='Images OCRed by each tesseract run when extracting many images, '
+                            'so the language model is loaded once per batch (default: 1)')
+
+def create_extractor(args: argparse.Namespace) -> OCRExtractor:
+    """
+    Build an OCR extractor from parsed command line options
+    
+    Args:
+        args (argparse.Namespace): Options added by add_extractor_arguments, plus language
+        
+    Returns:
+        OCRExtractor: Configured extractor
+    """
+    cache = None if args.no_cache else OCRCache(args.cache_dir, args.cache_size)
+    stage_names = [name.strip() for name in args.preprocess.split(',') if name.strip()]
+    pipeline = PreprocessingPipeline.from_names(stage_names, rescale=not args.no_rescale)
+    return OCRExtractor(language=args.language, cache=cache, engine=args.engine,
+                        pipeline=pipeline, detect_regions=args.detect_regions,
+                        region_workers=args.region_workers, pdf_dpi=args.pdf_dpi,
+                        batch_size=args.batch_size,
+                        cascade=DEFAULT_CASCADE if args.adaptive is not None else None,
+                        min_confidence=args.adaptive if args.adaptive is not None
+                        else DEFAULT_MIN_CONFIDENCE,
+                        outputs=[name.strip() for name in args.formats.split(',') if name.strip()],
+                        tile_height=args.tile, tile_workers=args.tile_workers,
+                        languages=[code.strip() for code in (args.auto_language or '').split(',')
+                                   if code.strip()])
+
 def main():
     """Command line interface for OCR extraction"""
     parser = argparse.ArgumentParser(description='Extract text from images using OCR')
-    parser.add_argument('input_path', help='Path to image file or directory')
+    parser.add_argument('input_path', help='Path to image file, PDF or directory')
     parser.add_argument('-o', '--output', help='Output text file path')
     parser.add_argument('-l', '--language', default='eng', 
                        help='Tesseract language code (default: eng)')
@@ -221,22 +1286,47 @@ def main():
                        help='Page segmentation mode (default: 6)')
     parser.add_argument('--oem', type=int, default=3,
                        help='OCR engine mode (default: 3)')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                       help='Worker processes for directories and multi-page files '
+                            '(0 = one per CPU core, default: 1)')
+    add_extractor_arguments(parser)
     
     args = parser.parse_args()
-    
-    # Initialize OCR extractor
-    extractor = OCRExtractor(language=args.language)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     
     try:
+        # Initialize OCR extractor
+        extractor = create_extractor(args)
+        
         # Handle single file or directory
         if os.path.isfile(args.input_path):
-            # Single file
-            text = extractor.extract_text_from_image(
-                args.input_path, 
-                enhance=not args.no_enhance,
-                psm=args.psm,
-                oem=args.oem
-            )
+            # Single file; the pages of PDFs and multi-page TIFFs are spread across workers
+            if args.workers != 1 and count_frames(args.input_path) > 1:
+                from parallel_engine import ParallelEngine
+                
+                engine = ParallelEngine(extractor, workers=args.workers)
+                record = next(engine.imap([args.input_path], enhance=not args.no_enhance,
+                                          psm=args.psm, oem=args.oem))
+                if record["status"] != "success":
+                    raise RuntimeError(record["error"])
+                text = record["extracted_text"]
+                outputs = record.get("outputs")
+            else:
+                details = extractor.extract_details(
+                    args.input_path, 
+                    enhance=not args.no_enhance,
+                    psm=args.psm,
+                    oem=args.oem
+                )
+                text = details["text"]
+                outputs = details.get("outputs")
+            
+            if outputs:
+                # Named like batch output so a PDF input is never overwritten
+                base_path = os.path.splitext(args.output or args.input_path)[0]
+                if not args.output:
+                    base_path += "_extracted"
+                extractor.save_outputs(outputs, base_path)
         elif os.path.isdir(args.input_path):
             # Directory - find all image files
             image_files = []
@@ -248,8 +1338,17 @@ def main():
             if not image_files:
                 print("No supported image files found in directory")
                 return
+            if extractor.outputs:
+                logger.warning("--formats outputs are not saved for directories here; "
+                               "use ocr-batch to save them per file")
             
-            text = extractor.extract_text_from_multiple_images(image_files)
+            text = extractor.extract_text_from_multiple_images(
+                image_files,
+                workers=args.workers,
+                enhance=not args.no_enhance,
+                psm=args.psm,
+                oem=args.oem
+            )
         else:
             print(f"Error: {args.input_path} is not a valid file or directory")
             return
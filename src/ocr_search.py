@@ -0,0 +1,249 @@
+"""
+OCR Search - SQLite FTS5 full-text index of extracted text, and the ocr-search command
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "search_index.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    file_path TEXT NOT NULL UNIQUE,
+    extracted_at REAL NOT NULL,
+    settings TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_text USING fts5(
+    text, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+class SearchIndex:
+    """
+    Full-text index of extracted text, one document per file
+
+    File metadata lives in an ordinary table and the text in an FTS5 table
+    sharing its rowid, so replacing or removing a file is a primary-key
+    lookup however large the index grows. The database uses write-ahead
+    logging, so searches can run while a batch is still adding documents.
+    Writes are committed in groups; call commit (or close) to make the
+    latest documents visible to other connections.
+    """
+
+    def __init__(self, path: str, settings: Optional[Dict[str, Any]] = None,
+                 commit_every: int = 200, commit_interval: float = 2.0):
+        """
+        Open or create a search index
+
+        Args:
+            path (str): SQLite database file
+            settings (Dict): Extraction settings recorded with every document added
+            commit_every (int): Commit after this many changes
+            commit_interval (float): Commit changes older than this many seconds
+                when the next change arrives
+        """
+        self.path = path
+        self.settings = json.dumps(settings, sort_keys=True) if settings is not None else None
+        self.commit_every = max(1, commit_every)
+        self.commit_interval = commit_interval
+        self._uncommitted = 0
+        self._first_change = None
+
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _changed(self):
+        """Count an uncommitted change, committing when enough have piled up"""
+        now = time.monotonic()
+        if self._first_change is None:
+            self._first_change = now
+        self._uncommitted += 1
+        if (self._uncommitted >= self.commit_every
+                or now - self._first_change >= self.commit_interval):
+            self.commit()
+
+    def _delete(self, file_path: str):
+        row = self._conn.execute("SELECT id FROM documents WHERE file_path = ?",
+                                 (file_path,)).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM documents_text WHERE rowid = ?", row)
+            self._conn.execute("DELETE FROM documents WHERE id = ?", row)
+        return row is not None
+
+    def add(self, file_path: str, text: str, extracted_at: Optional[float] = None):
+        """
+        Add or replace the text of a file
+
+        Args:
+            file_path (str): Image path (stored as an absolute path)
+            text (str): Extracted text
+            extracted_at (float): Unix time of the extraction (default: now)
+        """
+        file_path = os.path.abspath(file_path)
+        self._delete(file_path)
+        cursor = self._conn.execute(
+            "INSERT INTO documents (file_path, extracted_at, settings) VALUES (?, ?, ?)",
+            (file_path, extracted_at if extracted_at is not None else time.time(), self.settings))
+        self._conn.execute("INSERT INTO documents_text (rowid, text) VALUES (?, ?)",
+                           (cursor.lastrowid, text))
+        self._changed()
+
+    def remove(self, file_path: str):
+        """Remove a file's text, if it is indexed"""
+        if self._delete(os.path.abspath(file_path)):
+            self._changed()
+
+    def clear(self):
+        """Remove every document"""
+        self._conn.execute("DELETE FROM documents_text")
+        self._conn.execute("DELETE FROM documents")
+        self.commit()
+
+    def compact(self, keep_paths: Iterable[str]):
+        """
+        Remove documents for files outside a set of paths (e.g. deleted files)
+
+        Args:
+            keep_paths (Iterable[str]): Image paths whose documents stay
+        """
+        keep = {os.path.abspath(path) for path in keep_paths}
+        stale = [row for row in self._conn.execute("SELECT id, file_path FROM documents")
+                 if row[1] not in keep]
+        for doc_id, _ in stale:
+            self._conn.execute("DELETE FROM documents_text WHERE rowid = ?", (doc_id,))
+            self._conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+        self.commit()
+        if stale:
+            logger.info(f"Removed {len(stale)} stale documents from the search index")
+
+    def commit(self):
+        """Make pending changes durable and visible to searches"""
+        self._conn.commit()
+        self._uncommitted = 0
+        self._first_change = None
+
+    def close(self):
+        if self._conn is not None:
+            self.commit()
+            self._conn.close()
+            self._conn = None
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def search(self, query: str, limit: int = 20, raw: bool = False,
+               snippet_words: int = 12) -> List[Dict[str, Any]]:
+        """
+        Find the files whose text best matches a query
+
+        Results are ranked by BM25, computed by FTS5 from its index without
+        reading any document that does not match.
+
+        Args:
+            query (str): Words that must all appear (or an FTS5 query when raw)
+            limit (int): Most hits to return
+            raw (bool): Pass the query to FTS5 unchanged, allowing phrases,
+                OR/NOT, prefix* and NEAR() queries
+            snippet_words (int): Words of context in each snippet
+
+        Returns:
+            List[Dict]: Hits with "file_path", "extracted_at", "settings",
+                "snippet" (matches wrapped in [ ]) and "score" (lower is better)
+        """
+        match = query if raw else to_match_query(query)
+        if not match:
+            return []
+        rows = self._conn.execute(
+            "SELECT d.file_path, d.extracted_at, d.settings, "
+            "snippet(documents_text, 0, '[', ']', '...', ?), documents_text.rank "
+            "FROM documents_text JOIN documents d ON d.id = documents_text.rowid "
+            "WHERE documents_text MATCH ? ORDER BY documents_text.rank LIMIT ?",
+            (snippet_words, match, limit))
+        return [{"file_path": file_path, "extracted_at": extracted_at,
+                 "settings": json.loads(settings) if settings else None,
+                 "snippet": snippet, "score": round(score, 4)}
+                for file_path, extracted_at, settings, snippet, score in rows]
+
+
+def to_match_query(text: str) -> str:
+    """
+    Turn plain words into an FTS5 query matching documents containing all of them
+
+    Each word is quoted, so punctuation common in screenshots (paths, URLs,
+    error codes) is searched for rather than parsed as query syntax.
+
+    Args:
+        text (str): Words typed by the user
+
+    Returns:
+        str: FTS5 MATCH expression ("" if there are no words)
+    """
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+def main():
+    """Command line interface for searching extracted text"""
+    parser = argparse.ArgumentParser(description='Search text extracted by ocr-batch')
+    parser.add_argument('query', nargs='+', help='Words to search for (all must appear)')
+    parser.add_argument('-d', '--dir', default='extracted_texts',
+                       help='Batch output directory holding the index (default: extracted_texts)')
+    parser.add_argument('--index', default=None,
+                       help=f'Index file to search (default: DIR/{INDEX_FILENAME})')
+    parser.add_argument('-n', '--limit', type=int, default=20,
+                       help='Most results to show (default: 20)')
+    parser.add_argument('--raw', action='store_true',
+                       help='Treat the query as FTS5 syntax ("exact phrase", OR, NOT, prefix*)')
+    parser.add_argument('--json', action='store_true',
+                       help='Print results as JSON')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    index_path = args.index or os.path.join(args.dir, INDEX_FILENAME)
+    if not os.path.exists(index_path):
+        print(f"Error: no search index at {index_path} (run ocr-batch first)")
+        sys.exit(1)
+
+    query = " ".join(args.query)
+    try:
+        with SearchIndex(index_path) as index:
+            start = time.perf_counter()
+            hits = index.search(query, limit=args.limit, raw=args.raw)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+    except sqlite3.OperationalError as e:
+        print(f"Error: invalid search: {e}")
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps({"query": query, "elapsed_ms": round(elapsed_ms, 2), "hits": hits},
+                         indent=2, ensure_ascii=False))
+        return
+
+    for rank, hit in enumerate(hits, 1):
+        extracted = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(hit["extracted_at"]))
+        print(f"{rank}. {hit['file_path']}  ({extracted})")
+        print(f"   {' '.join(hit['snippet'].split())}")
+    print(f"\n{len(hits)} result(s) in {elapsed_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
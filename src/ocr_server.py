@@ -0,0 +1,509 @@
+"""
+OCR Server - Local HTTP service with a warm worker pool and micro-batching
+"""
+
+import os
+import sys
+import time
+import queue
+import logging
+import argparse
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
+from ocr_extractor import OCRExtractor, add_extractor_arguments, create_extractor
+from parallel_engine import ParallelEngine, worker_extract_batch
+from instrumentation import PERCENTILES
+
+try:
+    from flask import Flask, jsonify, request
+except ImportError:
+    Flask = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+
+
+class ClientLimiter:
+    """Caps how many requests each client may have in progress at once"""
+
+    def __init__(self, max_per_client: int = 4):
+        """
+        Initialize client limiter
+
+        Args:
+            max_per_client (int): Concurrent requests allowed per client (0 = unlimited)
+        """
+        self.max_per_client = max_per_client
+        self._active: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, client: str) -> bool:
+        """Take a slot for a client; returns False if it is at its limit"""
+        with self._lock:
+            active = self._active.get(client, 0)
+            if self.max_per_client and active >= self.max_per_client:
+                return False
+            self._active[client] = active + 1
+            return True
+
+    def release(self, client: str):
+        """Give back a slot taken with acquire"""
+        with self._lock:
+            active = self._active.get(client, 0) - 1
+            if active > 0:
+                self._active[client] = active
+            else:
+                self._active.pop(client, None)
+
+    def active_clients(self) -> int:
+        with self._lock:
+            return len(self._active)
+
+
+class OCRService:
+    """
+    Queue of OCR requests served by a warm process pool in micro-batches
+
+    Requests wait in a bounded queue. A dispatcher thread groups whatever is
+    queued (up to max_batch, waiting at most max_wait_ms for more) into one
+    pool task, so each round trip to a worker carries several images. At most
+    one batch per worker is in flight, which lets batches grow under load and
+    keeps the queue depth an honest measure of backlog.
+    """
+
+    def __init__(self, extractor: OCRExtractor, workers: Optional[int] = 0,
+                 max_batch: int = 8, max_wait_ms: float = 10.0, max_queue: int = 256,
+                 max_per_client: int = 4, request_timeout: float = 300.0):
+        """
+        Initialize OCR service
+
+        Args:
+            extractor (OCRExtractor): Configured extractor, copied into each worker
+            workers (int): Worker processes (None or 0 means one per CPU core)
+            max_batch (int): Most images sent to a worker in one task
+            max_wait_ms (float): Longest a batch waits to fill before dispatch
+            max_queue (int): Most queued images before requests are rejected
+            max_per_client (int): Concurrent requests allowed per client (0 = unlimited)
+            request_timeout (float): Seconds a request waits for its result
+        """
+        self.extractor = extractor
+        self.engine = ParallelEngine(extractor, workers=workers)
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000.0
+        self.request_timeout = request_timeout
+        self.limiter = ClientLimiter(max_per_client)
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._batch_slots = threading.Semaphore(self.engine.workers)
+        self._pool = None
+        self._dispatcher = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._latencies = deque(maxlen=1000)
+        self.counters = {
+            "requests_success": 0, "requests_failed": 0, "requests_timeout": 0,
+            "rejected_client_limit": 0, "rejected_queue_full": 0,
+            "batches": 0, "batch_items": 0, "latency_sum": 0.0
+        }
+
+    @property
+    def workers(self) -> int:
+        return self.engine.workers
+
+    def start(self):
+        """Start the worker pool, warm every worker, and start dispatching"""
+        self._pool = self.engine.create_pool()
+        start = time.time()
+        started = self.engine.warm_pool(self._pool)
+        logger.info(f"Warmed {started} OCR worker(s) in {time.time() - start:.2f}s")
+
+        self._stopping.clear()
+        self._dispatcher = threading.Thread(target=self._dispatch, name='ocr-dispatcher',
+                                            daemon=True)
+        self._dispatcher.start()
+
+    def stop(self):
+        """Stop dispatching, fail the requests still queued, and shut down the worker pool"""
+        if self._dispatcher is not None:
+            self._stopping.set()
+            try:
+                # Wakes a dispatcher waiting on an empty queue; a full queue wakes it anyway
+                self._queue.put_nowait(None)
+            except queue.Full:
+                pass
+            self._dispatcher.join()
+            self._dispatcher = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def submit(self, image_path: str, enhance: bool = True, psm: int = 6, oem: int = 3) -> Future:
+        """
+        Queue an image for extraction
+
+        Args:
+            image_path (str): Image file path
+            enhance (bool): Whether to enhance the image before OCR
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+
+        Returns:
+            Future: Resolves to the per-image record (see ParallelEngine.imap);
+                cancelling it before a worker picks it up drops the request
+
+        Raises:
+            queue.Full: The queue is at max_queue
+        """
+        future = Future()
+        self._queue.put_nowait(((image_path, enhance, psm, oem), future))
+        return future
+
+    def _dispatch(self):
+        """Group queued requests into batches and hand them to the pool"""
+        while not self._stopping.is_set():
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 \
+                        else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    break
+                batch.append(item)
+
+            # Requests cancelled while queued (timed out) are dropped; the rest can
+            # no longer be cancelled
+            batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            # One batch per worker; queued work waits here and joins later batches
+            self._batch_slots.acquire()
+            with self._lock:
+                self._in_flight += len(batch)
+                self.counters["batches"] += 1
+                self.counters["batch_items"] += len(batch)
+            try:
+                pool_future = self._pool.submit(worker_extract_batch, [task for task, _ in batch])
+            except Exception as e:
+                self._finish(batch, None, error=e)
+                continue
+            pool_future.add_done_callback(partial(self._finish, batch))
+
+        # Fail whatever is still queued so no request waits for a stopped service
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(RuntimeError("OCR service stopped"))
+
+    def _finish(self, batch: List[Tuple[tuple, Future]], pool_future: Optional[Future],
+                error: Optional[Exception] = None):
+        """Resolve each request of a finished batch"""
+        self._batch_slots.release()
+        with self._lock:
+            self._in_flight -= len(batch)
+
+        if error is None:
+            try:
+                records = pool_future.result()
+            except Exception as e:
+                error = e
+        for i, (_, future) in enumerate(batch):
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(records[i])
+
+    def record_request(self, status: str, latency: float):
+        """Count a finished request and its end-to-end latency in seconds"""
+        with self._lock:
+            self.counters[f"requests_{status}"] += 1
+            self.counters["latency_sum"] += latency
+            self._latencies.append(latency)
+
+    def record_timeout(self, latency: float):
+        """Count a request that gave up waiting for its result"""
+        with self._lock:
+            self.counters["requests_timeout"] += 1
+            self.counters["latency_sum"] += latency
+            self._latencies.append(latency)
+
+    def record_rejection(self, reason: str):
+        """Count a request turned away ('client_limit' or 'queue_full')"""
+        with self._lock:
+            self.counters[f"rejected_{reason}"] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot of queue and latency metrics
+
+        Returns:
+            Dict: Queue depth, in-flight images, counters and recent latency percentiles
+        """
+        with self._lock:
+            counters = dict(self.counters)
+            latencies = sorted(self._latencies)
+            in_flight = self._in_flight
+        percentiles = {}
+        for fraction in PERCENTILES:
+            if latencies:
+                index = min(len(latencies) - 1, int(round(fraction * (len(latencies) - 1))))
+                percentiles[str(fraction)] = round(latencies[index], 4)
+        return {
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize(),
+            "in_flight": in_flight,
+            "active_clients": self.limiter.active_clients(),
+            "counters": counters,
+            "mean_batch_size": round(counters["batch_items"] / counters["batches"], 2)
+                if counters["batches"] else None,
+            "latency_seconds": percentiles
+        }
+
+    def prometheus_metrics(self) -> str:
+        """Metrics in the Prometheus text exposition format"""
+        metrics = self.metrics()
+        counters = metrics["counters"]
+        requests = (counters["requests_success"] + counters["requests_failed"]
+                    + counters["requests_timeout"])
+        lines = [
+            "# HELP ocr_serve_queue_depth Images waiting to be dispatched to a worker",
+            "# TYPE ocr_serve_queue_depth gauge",
+            f"ocr_serve_queue_depth {metrics['queue_depth']}",
+            "# HELP ocr_serve_in_flight Images currently being extracted by workers",
+            "# TYPE ocr_serve_in_flight gauge",
+            f"ocr_serve_in_flight {metrics['in_flight']}",
+            "# HELP ocr_serve_workers Warm OCR worker processes",
+            "# TYPE ocr_serve_workers gauge",
+            f"ocr_serve_workers {metrics['workers']}",
+            "# HELP ocr_serve_requests_total Finished extraction requests by status",
+            "# TYPE ocr_serve_requests_total counter",
+            f'ocr_serve_requests_total{{status="success"}} {counters["requests_success"]}',
+            f'ocr_serve_requests_total{{status="failed"}} {counters["requests_failed"]}',
+            f'ocr_serve_requests_total{{status="timeout"}} {counters["requests_timeout"]}',
+            "# HELP ocr_serve_rejected_total Requests turned away by reason",
+            "# TYPE ocr_serve_rejected_total counter",
+            f'ocr_serve_rejected_total{{reason="client_limit"}} {counters["rejected_client_limit"]}',
+            f'ocr_serve_rejected_total{{reason="queue_full"}} {counters["rejected_queue_full"]}',
+            "# HELP ocr_serve_batches_total Micro-batches sent to workers",
+            "# TYPE ocr_serve_batches_total counter",
+            f"ocr_serve_batches_total {counters['batches']}",
+            "# HELP ocr_serve_batch_items_total Images sent to workers in micro-batches",
+            "# TYPE ocr_serve_batch_items_total counter",
+            f"ocr_serve_batch_items_total {counters['batch_items']}",
+            "# HELP ocr_serve_request_latency_seconds End-to-end request latency "
+            "(quantiles over the last 1000 requests)",
+            "# TYPE ocr_serve_request_latency_seconds summary",
+        ]
+        for fraction, value in metrics["latency_seconds"].items():
+            lines.append(f'ocr_serve_request_latency_seconds{{quantile="{fraction}"}} {value}')
+        lines.append(f"ocr_serve_request_latency_seconds_sum {counters['latency_sum']:.4f}")
+        lines.append(f"ocr_serve_request_latency_seconds_count {requests}")
+        return "\n".join(lines) + "\n"
+
+
+def create_app(service: OCRService, allow_paths: bool = True,
+               path_roots: Optional[List[str]] = None):
+    """
+    Build the Flask application serving an OCR service
+
+    Endpoints:
+        POST /extract   Multipart "file" upload, or a "path" (JSON body or form
+                        field); optional enhance, psm and oem parameters
+        GET  /health    Liveness and queue depth
+        GET  /metrics   Prometheus text metrics
+
+    Clients are identified by the X-Client-Id header, or their address. When the
+    extractor renders extra formats, /extract responses add "words" (boxes and
+    confidences) and "hocr"; PDF renderings are not returned.
+
+    Args:
+        service (OCRService): Started OCR service
+        allow_paths (bool): Accept paths to files on the server's disk
+        path_roots (List[str]): If given, only accept paths inside these directories
+
+    Returns:
+        Flask: WSGI application
+    """
+    if Flask is None:
+        raise RuntimeError("ocr-serve requires Flask: pip install Flask")
+
+    app = Flask(__name__)
+    roots = [os.path.realpath(root) for root in (path_roots or [])]
+
+    def path_allowed(path: str) -> bool:
+        if not roots:
+            return True
+        real = os.path.realpath(path)
+        return any(os.path.commonpath([real, root]) == root for root in roots)
+
+    @app.route('/extract', methods=['POST'])
+    def extract():
+        start = time.perf_counter()
+        client = request.headers.get('X-Client-Id') or request.remote_addr or 'unknown'
+        if not service.limiter.acquire(client):
+            service.record_rejection('client_limit')
+            return jsonify(error=f"Too many concurrent requests for client {client}"), 429
+
+        temp_path = None
+        # Cleanup passes to the request's future when it outlives a timed-out request
+        deferred = False
+
+        def cleanup(_future=None):
+            service.limiter.release(client)
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+        try:
+            values = dict(request.values)
+            values.update(request.get_json(silent=True) or {})
+            try:
+                enhance = str(values.get('enhance', 'true')).lower() not in ('0', 'false', 'no')
+                psm = int(values.get('psm', 6))
+                oem = int(values.get('oem', 3))
+            except ValueError as e:
+                return jsonify(error=f"Invalid option: {e}"), 400
+
+            upload = request.files.get('file')
+            if upload is not None:
+                suffix = os.path.splitext(upload.filename or '')[1].lower() or '.png'
+                if suffix not in service.extractor.supported_formats:
+                    return jsonify(error=f"Unsupported file format: {suffix}"), 415
+                with tempfile.NamedTemporaryFile(suffix=suffix, prefix='ocr-upload-',
+                                                 delete=False) as f:
+                    upload.save(f)
+                    temp_path = image_path = f.name
+            elif values.get('path'):
+                image_path = values['path']
+                if not allow_paths or not path_allowed(image_path):
+                    return jsonify(error="Path not allowed"), 403
+            else:
+                return jsonify(error="Send a 'file' upload or a 'path'"), 400
+
+            try:
+                future = service.submit(image_path, enhance=enhance, psm=psm, oem=oem)
+            except queue.Full:
+                service.record_rejection('queue_full')
+                return jsonify(error="Server busy, try again later"), 503
+
+            try:
+                record = future.result(timeout=service.request_timeout)
+            except FutureTimeout:
+                service.record_timeout(time.perf_counter() - start)
+                if not future.cancel():
+                    # A worker is reading the file: keep it (and the client's slot)
+                    # until the extraction finishes
+                    deferred = True
+                    future.add_done_callback(cleanup)
+                return jsonify(error=f"Timed out after {service.request_timeout:g}s"), 504
+            latency = time.perf_counter() - start
+            service.record_request(record["status"], latency)
+
+            response = {
+                "status": record["status"],
+                "file_path": None if temp_path else image_path,
+                "latency_ms": round(latency * 1000, 1)
+            }
+            if record["status"] != "success":
+                response["error"] = record.get("error")
+                return jsonify(response), 422
+            response.update(text=record["extracted_text"], text_length=record["text_length"],
+                            cache=record.get("cache"), stats=record.get("stats"))
+            if record.get("pages"):
+                response["pages"] = record["pages"]
+            outputs = record.get("outputs") or {}
+            if "boxes" in outputs:
+                response["words"] = outputs["boxes"].to_dicts()
+            if "hocr" in outputs:
+                response["hocr"] = outputs["hocr"]
+            return jsonify(response)
+
+        except Exception as e:
+            logger.error(f"Request failed: {e}")
+            service.record_request('failed', time.perf_counter() - start)
+            return jsonify(error=str(e) or type(e).__name__), 500
+        finally:
+            if not deferred:
+                cleanup()
+
+    @app.route('/health')
+    def health():
+        metrics = service.metrics()
+        return jsonify(status="ok", workers=metrics["workers"],
+                       queue_depth=metrics["queue_depth"], in_flight=metrics["in_flight"])
+
+    @app.route('/metrics')
+    def metrics():
+        return service.prometheus_metrics(), 200, {'Content-Type': 'text/plain; version=0.0.4'}
+
+    return app
+
+
+def main():
+    """Command line interface for the OCR server"""
+    parser = argparse.ArgumentParser(description='Serve OCR text extraction over local HTTP')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                       help=f'Port to listen on (default: {DEFAULT_PORT})')
+    parser.add_argument('-l', '--language', default='eng',
+                       help='Tesseract language code (default: eng)')
+    parser.add_argument('-w', '--workers', type=int, default=0,
+                       help='Warm OCR worker processes (0 = one per CPU core, default: 0)')
+    parser.add_argument('--max-batch', type=int, default=8,
+                       help='Most images sent to a worker at once (default: 8)')
+    parser.add_argument('--max-wait-ms', type=float, default=10.0,
+                       help='Longest a micro-batch waits to fill, in ms (default: 10)')
+    parser.add_argument('--max-queue', type=int, default=256,
+                       help='Queued images before requests get 503 (default: 256)')
+    parser.add_argument('--per-client', type=int, default=4,
+                       help='Concurrent requests per client before 429 (0 = unlimited, default: 4)')
+    parser.add_argument('--timeout', type=float, default=300.0,
+                       help='Seconds a request waits for its result (default: 300)')
+    parser.add_argument('--no-paths', action='store_true',
+                       help='Only accept uploads, not paths to files on this machine')
+    parser.add_argument('--path-root', action='append', default=None,
+                       help='Only accept paths inside this directory (repeatable)')
+    add_extractor_arguments(parser)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if Flask is None:
+        print("Error: ocr-serve requires Flask: pip install Flask")
+        sys.exit(1)
+
+    service = OCRService(create_extractor(args), workers=args.workers,
+                         max_batch=args.max_batch, max_wait_ms=args.max_wait_ms,
+                         max_queue=args.max_queue, max_per_client=args.per_client,
+                         request_timeout=args.timeout)
+    service.start()
+    try:
+        app = create_app(service, allow_paths=not args.no_paths, path_roots=args.path_root)
+        logger.info(f"Serving OCR on http://{args.host}:{args.port} "
+                    f"with {service.workers} warm worker(s)")
+        app.run(host=args.host, port=args.port, threaded=True)
+    finally:
+        service.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,476 @@
+"""
+Parallel Extraction Engine - Run OCR over many images on a pool of worker processes
+"""
+
+import os
+import time
+import logging
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from preprocessing import count_frames, SEEKABLE_FRAME_FORMATS
+from run_journal import file_signature
+
+logger = logging.getLogger(__name__)
+
+# Extractor owned by each worker process, installed once by _init_worker
+_worker_extractor = None
+
+
+def resolve_workers(workers: Optional[int] = None) -> int:
+    """
+    Resolve a requested worker count to a usable number of processes
+
+    Args:
+        workers (int): Requested workers (None or 0 means one per CPU core)
+
+    Returns:
+        int: Number of worker processes to use
+    """
+    if not workers or workers < 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def default_omp_threads(workers: int) -> int:
+    """
+    Pick Tesseract's OpenMP thread count for each worker process
+
+    Tesseract uses OpenMP internally, so N worker processes each running
+    a multi-threaded tesseract would oversubscribe the machine. The cores
+    are split evenly between workers instead.
+
+    Args:
+        workers (int): Number of worker processes
+
+    Returns:
+        int: OpenMP threads per tesseract process
+    """
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def _init_worker(extractor, omp_threads: Optional[int]):
+    """Install the extractor and OpenMP limit in a freshly started worker"""
+    global _worker_extractor
+    if omp_threads:
+        # Inherited by every tesseract subprocess this worker spawns
+        os.environ['OMP_THREAD_LIMIT'] = str(omp_threads)
+    _worker_extractor = extractor
+
+
+def _signature(image_path: str) -> Optional[Tuple[int, float]]:
+    """Size and modification time of a file about to be read (None if it is gone)"""
+    try:
+        return file_signature(image_path)
+    except OSError:
+        return None
+
+
+def _extract_one(extractor, image_path: str, enhance: bool, psm: int, oem: int) -> Dict[str, Any]:
+    """Extract text from one image and return its success/failure record"""
+    signature = _signature(image_path)
+    try:
+        start = time.perf_counter()
+        details = extractor.extract_details(image_path, enhance=enhance, psm=psm, oem=oem)
+        details["stats"].setdefault("timings", {})["total"] = (time.perf_counter() - start) * 1000
+        return _success_record(image_path, details, signature)
+    except Exception as e:
+        logger.error(f"Failed to process {image_path}: {e}")
+        return _failure_record(image_path, e, signature)
+
+
+def _extract_chunk(extractor, image_paths: List[str], enhance: bool, psm: int,
+                   oem: int) -> List[Dict[str, Any]]:
+    """Extract a chunk of images with one tesseract run and return their records"""
+    signatures = [_signature(image_path) for image_path in image_paths]
+    start = time.perf_counter()
+    try:
+        results = extractor.extract_batch(image_paths, enhance=enhance, psm=psm, oem=oem)
+    except Exception as e:
+        logger.error(f"Failed to process {len(image_paths)} images: {e}")
+        return [_failure_record(image_path, e, signature)
+                for image_path, signature in zip(image_paths, signatures)]
+    # The chunk's images were OCRed together, so its wall time is shared between them
+    total_ms = (time.perf_counter() - start) * 1000 / len(image_paths)
+
+    records = []
+    for image_path, details, signature in zip(image_paths, results, signatures):
+        if "error" in details:
+            records.append(_failure_record(image_path, details["error"], signature))
+        else:
+            details["stats"].setdefault("timings", {})["total"] = total_ms
+            records.append(_success_record(image_path, details, signature))
+    return records
+
+
+# Records carry the file's "signature" (size, mtime) from just before it was read,
+# so a file rewritten during extraction is not journaled as up to date
+def _success_record(image_path: str, details: Dict[str, Any],
+                    signature: Optional[Tuple[int, float]] = None) -> Dict[str, Any]:
+    text = details["text"]
+    record = {
+        "file_path": image_path,
+        "file_name": os.path.basename(image_path),
+        "status": "success",
+        "text_length": len(text),
+        "extracted_text": text,
+        "cache": details["cache"],
+        "stats": details["stats"],
+        "signature": signature
+    }
+    if "pages" in details:
+        record["pages"] = details["pages"]
+    if "outputs" in details:
+        record["outputs"] = details["outputs"]
+    return record
+
+
+def _failure_record(image_path: str, error: Union[Exception, str],
+                    signature: Optional[Tuple[int, float]] = None) -> Dict[str, Any]:
+    return {
+        "file_path": image_path,
+        "file_name": os.path.basename(image_path),
+        "status": "failed",
+        "error": str(error),
+        "signature": signature
+    }
+
+
+def _extract_frame_one(extractor, image_path: str, frame: int, enhance: bool,
+                       psm: int, oem: int) -> Dict[str, Any]:
+    """Extract one page of a multi-frame image, recording a failure instead of raising"""
+    signature = _signature(image_path)
+    try:
+        start = time.perf_counter()
+        details = extractor.extract_details(image_path, enhance=enhance, psm=psm, oem=oem,
+                                            frame=frame)
+        details["stats"].setdefault("timings", {})["total"] = (time.perf_counter() - start) * 1000
+        details["signature"] = signature
+        return details
+    except Exception as e:
+        return {"page": frame + 1, "error": str(e), "signature": signature}
+
+
+def _worker_extract(image_path: str, enhance: bool, psm: int, oem: int) -> Dict[str, Any]:
+    """Pool entry point: extract with the extractor installed in this worker"""
+    return _extract_one(_worker_extractor, image_path, enhance, psm, oem)
+
+
+def _worker_extract_chunk(image_paths: List[str], enhance: bool, psm: int,
+                          oem: int) -> List[Dict[str, Any]]:
+    """Pool entry point: extract a chunk of images with one tesseract run in this worker"""
+    return _extract_chunk(_worker_extractor, image_paths, enhance, psm, oem)
+
+
+def _worker_extract_frame(image_path: str, frame: int, enhance: bool,
+                          psm: int, oem: int) -> Dict[str, Any]:
+    """Pool entry point: extract one page with the extractor installed in this worker"""
+    return _extract_frame_one(_worker_extractor, image_path, frame, enhance, psm, oem)
+
+
+def worker_extract_batch(tasks: List[Tuple[str, bool, int, int]]) -> List[Dict[str, Any]]:
+    """
+    Pool entry point: extract a micro-batch of images in one round trip
+
+    Args:
+        tasks (List[Tuple]): (image_path, enhance, psm, oem) per image
+
+    Returns:
+        List[Dict]: Per-image records, in task order
+    """
+    if _worker_extractor.batch_size <= 1 or len(tasks) == 1:
+        return [_extract_one(_worker_extractor, *task) for task in tasks]
+
+    # Images sharing settings are OCRed together, batch_size per tesseract run
+    groups: Dict[Tuple[bool, int, int], List[int]] = {}
+    for index, (_, enhance, psm, oem) in enumerate(tasks):
+        groups.setdefault((enhance, psm, oem), []).append(index)
+    records: List[Optional[Dict[str, Any]]] = [None] * len(tasks)
+    batch_size = _worker_extractor.batch_size
+    for (enhance, psm, oem), indexes in groups.items():
+        for start in range(0, len(indexes), batch_size):
+            chunk = indexes[start:start + batch_size]
+            chunk_records = _extract_chunk(_worker_extractor, [tasks[i][0] for i in chunk],
+                                           enhance, psm, oem)
+            for i, record in zip(chunk, chunk_records):
+                records[i] = record
+    return records
+
+
+def _worker_wait(barrier, timeout: float) -> int:
+    """
+    Pool entry point: hold this worker until every worker has reached the barrier
+
+    Args:
+        barrier: Shared barrier with one party per worker
+        timeout (float): Seconds to wait before breaking the barrier
+
+    Returns:
+        int: Process ID of the worker
+    """
+    barrier.wait(timeout)
+    return os.getpid()
+
+
+def _chunks(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Group items into lists of up to size items"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def split_frame_count(image_path: str) -> int:
+    """
+    Number of pages an image should be split into across workers
+
+    Only formats with random frame access are split; animated GIF and WebP
+    must decode every earlier frame to reach frame N, so each stays on one
+    worker and is read sequentially there.
+
+    Args:
+        image_path (str): Path to the image file
+
+    Returns:
+        int: Pages to extract as separate tasks (1 means extract the file as a whole)
+    """
+    if os.path.splitext(image_path)[1].lower() not in SEEKABLE_FRAME_FORMATS:
+        return 1
+    try:
+        return count_frames(image_path)
+    except Exception:
+        # Let the extraction itself report the unreadable file
+        return 1
+
+
+class ParallelEngine:
+    """Process-pool execution engine for OCR text extraction"""
+
+    def __init__(self, extractor, workers: Optional[int] = 1, omp_threads: Optional[int] = None,
+                 split_pages: bool = True):
+        """
+        Initialize parallel engine
+
+        Args:
+            extractor (OCRExtractor): Configured extractor, copied into each worker
+            workers (int): Number of worker processes (None or 0 means one per CPU core)
+            omp_threads (int): OpenMP threads per tesseract process
+                (default: CPU cores split evenly between workers)
+            split_pages (bool): Spread the pages of multi-page TIFFs and PDFs across workers
+        """
+        self.extractor = extractor
+        self.split_pages = split_pages
+        self.workers = resolve_workers(workers)
+        if omp_threads is None and self.workers > 1:
+            omp_threads = default_omp_threads(self.workers)
+        self.omp_threads = omp_threads
+
+    def imap(self, image_paths: Iterable[str], enhance: bool = True,
+             psm: int = 6, oem: int = 3,
+             stop_event: Optional[threading.Event] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Extract text from images, yielding one record per image in input order
+
+        Only a bounded window of images is in flight at any time, so
+        arbitrarily long inputs can be streamed through the pool. With
+        split_pages, each page of a multi-page TIFF or PDF is a separate task and the
+        pages are reassembled into one record. When the extractor's batch_size
+        is above 1, consecutive images are sent to workers in chunks of that
+        size and each chunk is OCRed by one tesseract run (see
+        OCRExtractor.extract_batch).
+
+        Setting stop_event (or closing the iterator) cancels the images not
+        yet started; only those already running on a worker are waited for.
+
+        Args:
+            image_paths (Iterable[str]): Image file paths
+            enhance (bool): Whether to enhance images before OCR
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+            stop_event (threading.Event): Set to stop early, without yielding
+                the records of unfinished images
+
+        Yields:
+            Dict: Per-file record with status "success" or "failed"
+        """
+        stop_event = stop_event or threading.Event()
+        batch_size = self.extractor.batch_size
+        if self.workers <= 1:
+            if batch_size <= 1:
+                for image_path in image_paths:
+                    if stop_event.is_set():
+                        return
+                    yield _extract_one(self.extractor, image_path, enhance, psm, oem)
+            else:
+                for chunk in _chunks(image_paths, batch_size):
+                    if stop_event.is_set():
+                        return
+                    yield from _extract_chunk(self.extractor, chunk, enhance, psm, oem)
+            return
+
+        logger.info(f"Starting {self.workers} OCR worker processes "
+                    f"({self.omp_threads} OpenMP thread(s) each)")
+
+        with self.create_pool() as pool:
+            pending = deque()
+            max_pending = self.workers * 4
+            pages = []
+            chunk = []
+
+            def collect():
+                # Returns finished records (none while a document's pages are still arriving)
+                image_path, frame, frames, future = pending.popleft()
+                if frame is None:
+                    return future.result() if isinstance(image_path, list) else [future.result()]
+                pages.append(future.result())
+                if frame < frames - 1:
+                    return []
+                # The earliest read of any page stands for the whole document
+                signature = pages[0].pop("signature", None)
+                for page in pages[1:]:
+                    page.pop("signature", None)
+                try:
+                    return [_success_record(image_path, self.extractor.combine_pages(pages),
+                                            signature)]
+                except Exception as e:
+                    logger.error(f"Failed to process {image_path}: {e}")
+                    return [_failure_record(image_path, e, signature)]
+                finally:
+                    pages.clear()
+
+            def submit_chunk():
+                # A chunk of whole images goes to one worker for a single tesseract run
+                future = pool.submit(_worker_extract_chunk, list(chunk), enhance, psm, oem)
+                pending.append((list(chunk), None, 1, future))
+                chunk.clear()
+
+            try:
+                for image_path, frame, frames in self._tasks(image_paths):
+                    if stop_event.is_set():
+                        return
+                    if frame is None and batch_size > 1:
+                        chunk.append(image_path)
+                        if len(chunk) < batch_size:
+                            continue
+                        submit_chunk()
+                    else:
+                        if chunk:
+                            submit_chunk()
+                        if frame is None:
+                            future = pool.submit(_worker_extract, image_path, enhance, psm, oem)
+                        else:
+                            future = pool.submit(_worker_extract_frame, image_path, frame,
+                                                 enhance, psm, oem)
+                        pending.append((image_path, frame, frames, future))
+                    while len(pending) >= max_pending and not stop_event.is_set():
+                        yield from collect()
+
+                if chunk and not stop_event.is_set():
+                    submit_chunk()
+                while pending and not stop_event.is_set():
+                    yield from collect()
+            finally:
+                # Leaving the pool waits for running tasks, so drop the queued ones first
+                for *_, future in pending:
+                    future.cancel()
+
+    def _tasks(self, image_paths: Iterable[str]) -> Iterator[Tuple[str, Optional[int], int]]:
+        """Expand image paths into (path, frame or None, frame count) tasks"""
+        for image_path in image_paths:
+            frames = split_frame_count(image_path) if self.split_pages else 1
+            if frames > 1:
+                for frame in range(frames):
+                    yield image_path, frame, frames
+            else:
+                yield image_path, None, 1
+
+    def create_pool(self) -> ProcessPoolExecutor:
+        """
+        Start a long-lived pool of workers that each hold a copy of the extractor
+
+        For services that submit work over time (see worker_extract_batch)
+        rather than streaming one input sequence through imap. The caller
+        owns the pool and must shut it down.
+
+        Returns:
+            ProcessPoolExecutor: Pool with the extractor installed in every worker
+        """
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                   initargs=(self.extractor, self.omp_threads))
+
+    def warm_pool(self, pool: ProcessPoolExecutor, timeout: float = 60.0) -> int:
+        """
+        Start every worker of a pool from create_pool now rather than on first use
+
+        The executor spawns workers on submit and may hand quick tasks to one
+        idle worker, so each warm-up task waits on a barrier until all workers
+        hold one.
+
+        Args:
+            pool (ProcessPoolExecutor): Pool returned by create_pool
+            timeout (float): Seconds to wait for all workers to start
+
+        Returns:
+            int: Number of distinct worker processes started
+
+        Raises:
+            threading.BrokenBarrierError: If the workers did not all start in time
+        """
+        with multiprocessing.Manager() as manager:
+            barrier = manager.Barrier(self.workers)
+            futures = [pool.submit(_worker_wait, barrier, timeout) for _ in range(self.workers)]
+            return len({future.result() for future in futures})
+
+    def imap_calls(self, func: Callable[[Any], Any], items: Iterable[Any]) -> Iterator[Any]:
+        """
+        Apply a picklable module-level function to items on the worker pool
+
+        Used for lightweight per-image work other than OCR, such as hashing.
+        Results are yielded in input order with a bounded number in flight.
+
+        Args:
+            func (Callable): Function taking one item
+            items (Iterable): Items to process
+
+        Yields:
+            Any: func(item) for each item, in input order
+        """
+        if self.workers <= 1:
+            for item in items:
+                yield func(item)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = deque()
+            max_pending = self.workers * 16
+
+            for item in items:
+                pending.append(pool.submit(func, item))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+
+    def map(self, image_paths: Iterable[str], enhance: bool = True,
+            psm: int = 6, oem: int = 3) -> List[Dict[str, Any]]:
+        """
+        Extract text from images and return all records in input order
+
+        Args:
+            image_paths (Iterable[str]): Image file paths
+            enhance (bool): Whether to enhance images before OCR
+            psm (int): Page segmentation mode
+            oem (int): OCR engine mode
+
+        Returns:
+            List[Dict]: Per-file records in input order
+        """
+        return list(self.imap(image_paths, enhance=enhance, psm=psm, oem=oem))
@@ -0,0 +1,101 @@
+"""
+PDF Ingest - Read PDF pages as embedded text or as rasterized images for OCR
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# PyMuPDF takes longer to import than the rest of the app, so it is loaded
+# on first use rather than by every command that might see a PDF
+_pymupdf = None
+
+DEFAULT_PDF_DPI = 300
+
+# Fewer characters than this usually means a scan with a stray page number
+# or a header stamped on, so the page is OCRed instead
+MIN_TEXT_LAYER_CHARS = 16
+
+
+def import_pymupdf():
+    """
+    Import PyMuPDF on first use
+
+    Returns:
+        module: The pymupdf (or, before 1.24, fitz) module
+    """
+    global _pymupdf
+    if _pymupdf is None:
+        try:
+            import pymupdf
+        except ImportError:
+            try:
+                # PyMuPDF releases before 1.24 only provide the fitz module name
+                import fitz as pymupdf
+            except ImportError:
+                raise RuntimeError("PDF support requires PyMuPDF: pip install PyMuPDF")
+        _pymupdf = pymupdf
+    return _pymupdf
+
+
+def open_pdf(pdf_path: str):
+    """
+    Open a PDF document
+
+    Args:
+        pdf_path (str): Path to the PDF file
+
+    Returns:
+        pymupdf.Document: Open document (use as a context manager to close it)
+    """
+    return import_pymupdf().open(pdf_path)
+
+
+def page_count(pdf_path: str) -> int:
+    """
+    Count the pages of a PDF without rendering them
+
+    Args:
+        pdf_path (str): Path to the PDF file
+
+    Returns:
+        int: Number of pages
+    """
+    with open_pdf(pdf_path) as document:
+        return document.page_count
+
+
+def page_text(page, min_chars: int = MIN_TEXT_LAYER_CHARS) -> Optional[str]:
+    """
+    Get the embedded text layer of a page
+
+    Args:
+        page (pymupdf.Page): PDF page
+        min_chars (int): Fewest non-whitespace characters that count as a text layer
+
+    Returns:
+        str: Embedded text in reading order, or None if the page needs OCR
+    """
+    text = page.get_text("text", sort=True)
+    if sum(1 for c in text if not c.isspace()) < min_chars:
+        return None
+    return text
+
+
+def render_page(page, dpi: int = DEFAULT_PDF_DPI) -> np.ndarray:
+    """
+    Rasterize a page straight to an 8-bit grayscale array
+
+    Args:
+        page (pymupdf.Page): PDF page
+        dpi (int): Rendering resolution
+
+    Returns:
+        np.ndarray: Writable grayscale image (height x width, uint8)
+    """
+    pixmap = page.get_pixmap(dpi=dpi, colorspace=import_pymupdf().csGRAY, alpha=False)
+    rows = np.frombuffer(pixmap.samples, dtype=np.uint8).reshape(pixmap.height, pixmap.stride)
+    return rows[:, :pixmap.width].copy()
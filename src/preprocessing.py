@@ -0,0 +1,398 @@
+"""
+Image Preprocessing - Composable grayscale OpenCV pipeline run before OCR
+"""
+
+import os
+import time
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from pdf_ingest import page_count
+
+logger = logging.getLogger(__name__)
+
+# Formats that can hold several pages or animation frames
+MULTI_FRAME_FORMATS = {'.tif', '.tiff', '.gif', '.webp', '.pdf'}
+# Formats where seeking to frame N does not decode frames 0..N-1 first
+SEEKABLE_FRAME_FORMATS = {'.tif', '.tiff', '.pdf'}
+
+
+def load_grayscale(image_path: str) -> np.ndarray:
+    """
+    Decode an image straight to a writable 8-bit grayscale array
+
+    Tesseract binarizes internally, so color channels are dropped at decode
+    time instead of carrying three channels through every stage.
+
+    Args:
+        image_path (str): Path to the image file
+
+    Returns:
+        np.ndarray: Grayscale image (height x width, uint8)
+    """
+    gray = cv2.imdecode(np.fromfile(image_path, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        # OpenCV has no GIF decoder; let PIL handle formats it cannot read
+        with Image.open(image_path) as image:
+            gray = to_grayscale(image)
+    return gray
+
+
+def count_frames(image_path: str) -> int:
+    """
+    Count the pages or animation frames in an image without decoding them
+
+    Args:
+        image_path (str): Path to the image file
+
+    Returns:
+        int: Number of frames (1 for single-frame formats)
+    """
+    file_ext = os.path.splitext(image_path)[1].lower()
+    if file_ext not in MULTI_FRAME_FORMATS:
+        return 1
+    if file_ext == '.pdf':
+        return page_count(image_path)
+    with Image.open(image_path) as image:
+        return getattr(image, 'n_frames', 1)
+
+
+def load_frame(image_path: str, frame: int) -> np.ndarray:
+    """
+    Decode a single frame of a multi-frame image to grayscale
+
+    Args:
+        image_path (str): Path to the image file
+        frame (int): Zero-based frame index
+
+    Returns:
+        np.ndarray: Grayscale image (height x width, uint8)
+    """
+    with Image.open(image_path) as image:
+        image.seek(frame)
+        return to_grayscale(image)
+
+
+def iter_frames(image_path: str) -> Iterator[np.ndarray]:
+    """
+    Decode the frames of an image one at a time
+
+    Only the current frame is held in memory, so long multi-page TIFFs and
+    animations can be processed without decoding every page up front.
+
+    Args:
+        image_path (str): Path to the image file
+
+    Yields:
+        np.ndarray: Grayscale image for each frame, in order
+    """
+    with Image.open(image_path) as image:
+        for frame in range(getattr(image, 'n_frames', 1)):
+            image.seek(frame)
+            yield to_grayscale(image)
+
+
+def to_grayscale(image: Image.Image) -> np.ndarray:
+    """
+    Convert a PIL image to a writable 8-bit grayscale array
+
+    Args:
+        image (PIL.Image): Image in any mode
+
+    Returns:
+        np.ndarray: Grayscale image (height x width, uint8)
+    """
+    if image.mode != 'L':
+        image = image.convert('L')
+    return np.array(image)
+
+
+class PreprocessStage:
+    """Base class for a preprocessing stage operating on a grayscale array"""
+
+    name = None
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+
+    def apply(self, gray: np.ndarray) -> np.ndarray:
+        """
+        Apply the stage, in place where possible
+
+        Args:
+            gray (np.ndarray): Grayscale image
+
+        Returns:
+            np.ndarray: Processed image (usually the same buffer)
+        """
+        raise NotImplementedError
+
+    def describe(self) -> str:
+        """Short description used in cache keys and reports"""
+        return self.name
+
+
+class ContrastStage(PreprocessStage):
+    """Stretch contrast around the mean gray level (like PIL's ImageEnhance.Contrast)"""
+
+    name = "contrast"
+
+    def __init__(self, factor: float = 1.5, enabled: bool = True):
+        super().__init__(enabled)
+        self.factor = factor
+
+    def apply(self, gray: np.ndarray) -> np.ndarray:
+        # PIL blends with a flat image of the rounded mean level
+        mean = np.float32(int(float(gray.mean()) + 0.5))
+        # out = mean + factor * (in - mean), truncated like PIL and saturated to
+        # 0..255 (dark text must clamp to black, not wrap around)
+        levels = mean + np.float32(self.factor) * (np.arange(256, dtype=np.float32) - mean)
+        table = np.clip(np.trunc(levels), 0, 255).astype(np.uint8)
+        return cv2.LUT(gray, table, dst=gray)
+
+    def describe(self) -> str:
+        return f"{self.name}({self.factor})"
+
+
+class SharpenStage(PreprocessStage):
+    """Sharpen edges by extrapolating away from a smoothed copy (like ImageEnhance.Sharpness)"""
+
+    name = "sharpen"
+
+    # PIL's SMOOTH kernel, used as the blurred reference image
+    SMOOTH_KERNEL = np.array([[1, 1, 1], [1, 5, 1], [1, 1, 1]], dtype=np.float32) / 13.0
+
+    def __init__(self, factor: float = 2.0, enabled: bool = True):
+        super().__init__(enabled)
+        self.factor = factor
+        identity = np.zeros((3, 3), dtype=np.float32)
+        identity[1, 1] = 1.0
+        # factor * image + (1 - factor) * smooth(image) as a single 3x3 kernel
+        self.kernel = self.factor * identity + (1.0 - self.factor) * self.SMOOTH_KERNEL
+
+    def apply(self, gray: np.ndarray) -> np.ndarray:
+        return cv2.filter2D(gray, -1, self.kernel, dst=gray, borderType=cv2.BORDER_REPLICATE)
+
+    def describe(self) -> str:
+        return f"{self.name}({self.factor})"
+
+
+class DenoiseStage(PreprocessStage):
+    """Remove speckle noise with a median filter"""
+
+    name = "denoise"
+
+    def __init__(self, ksize: int = 3, enabled: bool = True):
+        super().__init__(enabled)
+        self.ksize = ksize
+
+    def apply(self, gray: np.ndarray) -> np.ndarray:
+        return cv2.medianBlur(gray, self.ksize, dst=gray)
+
+    def describe(self) -> str:
+        return f"{self.name}({self.ksize})"
+
+
+def estimate_text_height(gray: np.ndarray, min_components: int = 10) -> Optional[float]:
+    """
+    Estimate the dominant glyph height from connected-component statistics
+
+    Args:
+        gray (np.ndarray): Grayscale image
+        min_components (int): Fewest glyph-like components needed for an estimate
+
+    Returns:
+        float: Median glyph height in pixels, or None if there is too little text
+    """
+    _, ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    # Text is the minority class; flip for light-on-dark (dark mode) images
+    if cv2.countNonZero(ink) > ink.size // 2:
+        cv2.bitwise_not(ink, dst=ink)
+
+    count, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+    heights = stats[1:count, cv2.CC_STAT_HEIGHT]
+    widths = stats[1:count, cv2.CC_STAT_WIDTH]
+    areas = stats[1:count, cv2.CC_STAT_AREA]
+
+    # Keep glyph-shaped blobs: not specks, not rules or boxes, not huge graphics
+    glyphs = ((heights >= 3) & (areas >= 6) & (heights <= gray.shape[0] // 4)
+              & (widths <= heights * 4))
+    if np.count_nonzero(glyphs) < min_components:
+        return None
+    return float(np.median(heights[glyphs]))
+
+
+class RescaleStage(PreprocessStage):
+    """Resize so the dominant text height matches what Tesseract reads best"""
+
+    name = "rescale"
+
+    def __init__(self, target_height: float = 24.0, min_scale: float = 0.25,
+                 max_scale: float = 4.0, tolerance: float = 0.2,
+                 max_pixels: int = 40_000_000, enabled: bool = True):
+        """
+        Initialize rescale stage
+
+        Args:
+            target_height (float): Desired median glyph height in pixels
+            min_scale (float): Strongest allowed downscale factor
+            max_scale (float): Strongest allowed upscale factor
+            tolerance (float): Leave images alone when within this fraction of the target
+            max_pixels (int): Never upscale beyond this many pixels
+            enabled (bool): Whether the stage runs
+        """
+        super().__init__(enabled)
+        self.target_height = target_height
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.tolerance = tolerance
+        self.max_pixels = max_pixels
+
+    def scale_for(self, gray: np.ndarray) -> float:
+        """
+        Pick the scale factor for an image
+
+        Args:
+            gray (np.ndarray): Grayscale image
+
+        Returns:
+            float: Scale factor (1.0 means leave the image as it is)
+        """
+        if gray.size > 8_000_000:
+            # Half resolution is plenty to measure glyphs on very large images
+            half = cv2.resize(gray, None, fx=0.5, fy=0.5, interpolation=cv2.INTER_AREA)
+            text_height = estimate_text_height(half)
+            text_height = text_height * 2 if text_height is not None else None
+        else:
+            text_height = estimate_text_height(gray)
+        if text_height is None:
+            return 1.0
+
+        scale = min(self.max_scale, max(self.min_scale, self.target_height / text_height))
+        if abs(scale - 1.0) <= self.tolerance:
+            return 1.0
+
+        if scale > 1.0:
+            scale = min(scale, (self.max_pixels / gray.size) ** 0.5)
+            if scale <= 1.0 + self.tolerance:
+                return 1.0
+        return scale
+
+    def apply(self, gray: np.ndarray) -> np.ndarray:
+        scale = self.scale_for(gray)
+        if scale == 1.0:
+            return gray
+        interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC
+        return cv2.resize(gray, None, fx=scale, fy=scale, interpolation=interpolation)
+
+    def describe(self) -> str:
+        return f"{self.name}({self.target_height})"
+
+
+STAGES = {
+    ContrastStage.name: ContrastStage,
+    SharpenStage.name: SharpenStage,
+    DenoiseStage.name: DenoiseStage,
+}
+
+# Stages applied when enhancement is on, in order
+DEFAULT_ENHANCE_STAGES = ("contrast", "sharpen", "denoise")
+
+
+class PreprocessingPipeline:
+    """Ordered, individually switchable and timed preprocessing stages"""
+
+    def __init__(self, stages: Optional[List[PreprocessStage]] = None,
+                 rescale: Optional[RescaleStage] = None):
+        """
+        Initialize preprocessing pipeline
+
+        Args:
+            stages (List[PreprocessStage]): Enhancement stages in order
+                (default: contrast, sharpen, denoise)
+            rescale (RescaleStage): Text-height normalization run before the
+                enhancement stages, even when enhancement is off
+                (default: enabled with a 24 px target)
+        """
+        if stages is None:
+            stages = [STAGES[name]() for name in DEFAULT_ENHANCE_STAGES]
+        self.stages = stages
+        self.rescale = rescale if rescale is not None else RescaleStage()
+
+    @classmethod
+    def from_names(cls, names: Sequence[str], rescale: bool = True) -> "PreprocessingPipeline":
+        """
+        Build a pipeline from stage names
+
+        Args:
+            names (Sequence[str]): Stage names from STAGES, in order
+            rescale (bool): Whether to normalize text height before enhancement
+
+        Returns:
+            PreprocessingPipeline: Pipeline with those stages enabled
+        """
+        unknown = [name for name in names if name not in STAGES]
+        if unknown:
+            raise ValueError(f"Unknown preprocessing stage(s): {', '.join(unknown)} "
+                             f"(choose from {', '.join(STAGES)})")
+        return cls([STAGES[name]() for name in names], RescaleStage(enabled=rescale))
+
+    def set_enabled(self, name: str, enabled: bool):
+        """Enable or disable every stage with the given name"""
+        for stage in self.stages + [self.rescale]:
+            if stage.name == name:
+                stage.enabled = enabled
+
+    def describe(self, enhance: bool = True) -> str:
+        """
+        Describe the stages that would run, for cache keys and reports
+
+        Args:
+            enhance (bool): Whether enhancement stages run
+
+        Returns:
+            str: Stage descriptions joined with '+'
+        """
+        steps = ["grayscale"]
+        if self.rescale.enabled:
+            steps.append(self.rescale.describe())
+        if enhance:
+            steps.extend(stage.describe() for stage in self.stages if stage.enabled)
+        return "+".join(steps)
+
+    def run(self, gray: np.ndarray, enhance: bool = True,
+            rescale: bool = True) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Run the enabled stages over a grayscale image
+
+        Args:
+            gray (np.ndarray): Writable grayscale image, modified in place
+            enhance (bool): Whether to run the enhancement stages
+            rescale (bool): Whether to run the rescale stage (off for an image
+                that was already rescaled)
+
+        Returns:
+            Tuple[np.ndarray, Dict]: Processed image, and stats with per-stage
+                "timings" in ms, the "pixels_in"/"pixels_out" rescale counts and,
+                when the size changed, the "scale" factor applied
+        """
+        timings = {}
+        stats = {"timings": timings, "pixels_in": int(gray.size)}
+        width_in = gray.shape[1]
+
+        stages = ([self.rescale] if rescale else []) + (self.stages if enhance else [])
+        for stage in stages:
+            if not stage.enabled:
+                continue
+            start = time.perf_counter()
+            gray = stage.apply(gray)
+            timings[stage.name] = (time.perf_counter() - start) * 1000
+
+        stats["pixels_out"] = int(gray.size)
+        if gray.shape[1] != width_in:
+            stats["scale"] = gray.shape[1] / width_in
+        return gray, stats
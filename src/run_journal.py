@@ -0,0 +1,194 @@
+"""
+Run Journal - Checkpoint log of finished files for resumable and incremental batches
+"""
+
+import os
+import json
+import logging
+from typing import Dict, Any, Optional, Tuple, Iterable
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILENAME = "run_journal.jsonl"
+
+
+def file_signature(file_path: str) -> Tuple[int, float]:
+    """
+    Get the size and modification time used to detect changed files
+
+    Args:
+        file_path (str): File to inspect
+
+    Returns:
+        Tuple[int, float]: File size in bytes and modification time
+    """
+    stat = os.stat(file_path)
+    return stat.st_size, stat.st_mtime
+
+
+class RunJournal:
+    """
+    Append-only JSON-lines journal of per-file batch results
+
+    Entries are only held in memory once an existing journal has been
+    loaded (for resumed, incremental and watch runs); a fresh run just
+    appends them to the file, so its memory does not grow with the batch.
+    """
+
+    def __init__(self, output_dir: str):
+        """
+        Initialize run journal
+
+        Args:
+            output_dir (str): Batch output directory holding the journal
+        """
+        self.path = os.path.join(output_dir, JOURNAL_FILENAME)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._keep_entries = False
+        self._file = None
+
+    def load(self) -> int:
+        """
+        Load entries from an existing journal, keeping the latest one per file
+
+        Returns:
+            int: Number of files recorded in the journal
+        """
+        self.entries = {}
+        self._keep_entries = True
+        if not os.path.exists(self.path):
+            return 0
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A run killed mid-write leaves a truncated last line
+                    logger.warning(f"Ignoring damaged journal line in {self.path}")
+                    continue
+                self.entries[entry["file_path"]] = entry
+
+        logger.info(f"Loaded run journal with {len(self.entries)} files: {self.path}")
+        return len(self.entries)
+
+    def open(self, append: bool = True):
+        """
+        Open the journal for recording
+
+        Args:
+            append (bool): Keep existing entries instead of starting a new journal
+        """
+        self._file = open(self.path, 'a' if append else 'w', encoding='utf-8')
+
+    def close(self):
+        """Close the journal file"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Get the latest journal entry for a file, if any"""
+        return self.entries.get(file_path)
+
+    def is_done(self, file_path: str) -> bool:
+        """
+        Check whether a file was already extracted successfully
+
+        Args:
+            file_path (str): Image file path
+
+        Returns:
+            bool: True if the journal records a successful extraction
+        """
+        entry = self.entries.get(file_path)
+        return entry is not None and entry["status"] == "success"
+
+    def is_unchanged(self, file_path: str) -> bool:
+        """
+        Check whether a file was extracted successfully and has not changed since
+
+        Args:
+            file_path (str): Image file path
+
+        Returns:
+            bool: True if size and modification time match the journal entry
+        """
+        if not self.is_done(file_path):
+            return False
+        entry = self.entries[file_path]
+        try:
+            size, mtime = file_signature(file_path)
+        except OSError:
+            return False
+        return entry["size"] == size and entry["mtime"] == mtime
+
+    def record(self, file_result: Dict[str, Any],
+               signature: Optional[Tuple[int, float]] = None,
+               summary_span: Optional[Tuple[int, int]] = None):
+        """
+        Append a finished file's result to the journal
+
+        The signature should be taken before the file was read: a file
+        rewritten while it was being extracted then no longer matches its
+        entry, and is extracted again.
+
+        Args:
+            file_result (Dict): Per-file result record
+            signature (Tuple[int, float]): File size and modification time from
+                before extraction (default: the file's signature now)
+            summary_span (Tuple[int, int]): Byte offset and length of the file's
+                block in the batch summary, so a later result can replace it
+        """
+        file_path = file_result["file_path"]
+        if signature is None:
+            try:
+                signature = file_signature(file_path)
+            except OSError:
+                signature = (None, None)
+        size, mtime = signature
+
+        entry = {
+            "file_path": file_path,
+            "size": size,
+            "mtime": mtime,
+            "status": file_result["status"],
+            "text_length": file_result.get("text_length", 0),
+            "output_file": file_result.get("output_file"),
+            "error": file_result.get("error"),
+            "summary_span": list(summary_span) if summary_span else None
+        }
+        if self._keep_entries:
+            self.entries[file_path] = entry
+
+        if self._file is not None:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            # Flush per file so a crashed run loses at most the file in progress
+            self._file.flush()
+
+    def compact(self, file_paths: Iterable[str]):
+        """
+        Rewrite the journal with one entry for each of the given files
+
+        Args:
+            file_paths (Iterable[str]): Files to keep, in order
+        """
+        reopen = self._file is not None
+        self.close()
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for file_path in file_paths:
+                entry = self.entries.get(file_path)
+                if entry is not None:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+
+        if reopen:
+            self.open()
@@ -0,0 +1,83 @@
+"""
+Script Detection - Route each image to the Tesseract language model for its writing system
+"""
+
+import logging
+from typing import Optional, Sequence
+
+import cv2
+import numpy as np
+
+from preprocessing import RescaleStage
+from tiling import blank_rows
+
+logger = logging.getLogger(__name__)
+
+# Language models able to read each script reported by Tesseract's OSD. In
+# auto-language mode an image goes to the first candidate language listed
+# for its script
+SCRIPT_LANGUAGES = {
+    "Latin": ("eng", "spa", "fra", "deu", "ita", "por", "nld", "pol", "tur", "vie"),
+    "Cyrillic": ("rus", "ukr", "bul", "srp", "bel"),
+    "Han": ("chi_sim", "chi_tra", "jpn"),
+    "Japanese": ("jpn",),
+    "Katakana": ("jpn",),
+    "Hiragana": ("jpn",),
+    "Hangul": ("kor",),
+    "Korean": ("kor",),
+    "Arabic": ("ara", "fas", "urd"),
+    "Greek": ("ell",),
+    "Hebrew": ("heb",),
+    "Devanagari": ("hin", "mar", "nep"),
+    "Thai": ("tha",),
+}
+
+# Candidate languages when auto-language mode is turned on without a list
+DEFAULT_AUTO_LANGUAGES = ("eng", "chi_sim", "jpn", "rus")
+
+# OSD only needs a few lines of legible text: images are downscaled towards
+# this glyph height and cut to the band of rows holding the most text
+OSD_TEXT_HEIGHT = 20.0
+MAX_OSD_ROWS = 800
+
+
+def osd_image(gray: np.ndarray) -> np.ndarray:
+    """
+    Make the small copy of an image that script detection runs on
+
+    Args:
+        gray (np.ndarray): Grayscale image (not modified)
+
+    Returns:
+        np.ndarray: Downscaled band of the image's densest text rows
+    """
+    scale = RescaleStage(target_height=OSD_TEXT_HEIGHT, max_scale=1.0).scale_for(gray)
+    if scale != 1.0:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    if len(gray) <= MAX_OSD_ROWS:
+        return gray
+
+    # Window of MAX_OSD_ROWS rows with the most non-blank rows
+    text_rows = np.concatenate([[0], np.cumsum(~blank_rows(gray))])
+    counts = text_rows[MAX_OSD_ROWS:] - text_rows[:-MAX_OSD_ROWS]
+    top = int(np.argmax(counts))
+    return gray[top:top + MAX_OSD_ROWS]
+
+
+def language_for_script(script: Optional[str], languages: Sequence[str]) -> Optional[str]:
+    """
+    Pick the candidate language that reads a script
+
+    Args:
+        script (str): Script name reported by OSD (None if undetected)
+        languages (Sequence[str]): Candidate Tesseract language codes, in
+            order of preference
+
+    Returns:
+        str: First candidate for the script, or None if none of them reads it
+    """
+    readers = SCRIPT_LANGUAGES.get(script, ())
+    for language in languages:
+        if language in readers:
+            return language
+    return None
@@ -0,0 +1,342 @@
+"""
+Tiling - Cut very tall images into strips at the gaps between text lines
+"""
+
+import difflib
+import logging
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from preprocessing import estimate_text_height, load_grayscale
+
+logger = logging.getLogger(__name__)
+
+# Target strip height in input pixels: about a hundred lines of screenshot text,
+# which tesseract lays out reliably
+DEFAULT_TILE_HEIGHT = 2000
+
+# Images are only tiled when taller than this many strips, so a slightly
+# tall image is not cut into a full strip and a sliver
+MIN_TILED_HEIGHT_FACTOR = 1.5
+
+# A row is blank when it has at most this many sharp horizontal changes,
+# which lets window borders and scrollbars run through the gaps between lines
+MAX_BLANK_ROW_EDGES = 6
+EDGE_THRESHOLD = 40
+
+# Lines at least this similar are the same line OCRed in two overlapping strips
+LINE_MATCH_RATIO = 0.8
+
+# tifffile is optional and only imported when a TIFF is tiled
+_tifffile = None
+
+# TIFF photometric interpretations read without a color lookup
+PHOTOMETRIC_MINISWHITE = 0
+PHOTOMETRIC_MINISBLACK = 1
+PHOTOMETRIC_RGB = 2
+
+
+def import_tifffile():
+    """
+    Import tifffile on first use
+
+    Returns:
+        module: The tifffile module, or None when it is not installed
+    """
+    global _tifffile
+    if _tifffile is None:
+        try:
+            import tifffile
+        except ImportError:
+            return None
+        _tifffile = tifffile
+    return _tifffile
+
+
+def image_height(image_path: str) -> int:
+    """Read an image's height from its header, without decoding it"""
+    with Image.open(image_path) as image:
+        return image.size[1]
+
+
+def should_tile(height: int, tile_height: int) -> bool:
+    """
+    Check whether an image is tall enough to be OCRed in strips
+
+    Args:
+        height (int): Image height in pixels
+        tile_height (int): Target strip height (0 disables tiling)
+
+    Returns:
+        bool: True when the image should be tiled
+    """
+    return tile_height > 0 and height > tile_height * MIN_TILED_HEIGHT_FACTOR
+
+
+def _tiff_bands(tifffile, image_path: str) -> Optional[Iterator[np.ndarray]]:
+    """Start reading the first page of a TIFF strip by strip (or tile row by tile row)"""
+    tif = tifffile.TiffFile(image_path)
+    try:
+        page = tif.pages[0]
+        samples = page.samplesperpixel
+        supported = (page.dtype == np.uint8 and page.planarconfig == 1
+                     and (page.photometric in (PHOTOMETRIC_MINISWHITE, PHOTOMETRIC_MINISBLACK)
+                          and samples == 1
+                          or page.photometric == PHOTOMETRIC_RGB and samples in (3, 4)))
+        if supported:
+            # Raises for compressions that need the optional imagecodecs package
+            tifffile.TIFF.DECOMPRESSORS[page.compression]
+    except Exception:
+        supported = False
+    if not supported:
+        tif.close()
+        return None
+
+    height, width = page.shape[:2]
+    invert = page.photometric == PHOTOMETRIC_MINISWHITE
+
+    def to_gray(band: np.ndarray) -> np.ndarray:
+        if samples == 1:
+            gray = band[..., 0]
+            return 255 - gray if invert else np.ascontiguousarray(gray)
+        return cv2.cvtColor(np.ascontiguousarray(band[..., :3]), cv2.COLOR_RGB2GRAY)
+
+    def bands() -> Iterator[np.ndarray]:
+        with tif:
+            row: List[np.ndarray] = []
+            row_top = 0
+            for segment, indices, _ in page.segments(sort=True, maxworkers=1):
+                top, left = indices[2], indices[3]
+                if row and top != row_top:
+                    yield to_gray(np.hstack(row)[:height - row_top, :width])
+                    row = []
+                row_top = top
+                # Strips and tiles at the bottom and right edges are padded
+                row.append(segment[0])
+                if not page.is_tiled or left + segment.shape[2] >= width:
+                    yield to_gray(np.hstack(row)[:height - row_top, :width])
+                    row = []
+            if row:
+                yield to_gray(np.hstack(row)[:height - row_top, :width])
+
+    return bands()
+
+
+def iter_row_bands(image_path: str) -> Iterator[np.ndarray]:
+    """
+    Read an image as horizontal bands of grayscale rows, top to bottom
+
+    Uncompressed, deflate and PackBits TIFFs (8-bit gray or RGB) are decoded
+    one strip or row of tiles at a time when tifffile is installed, so only
+    the bands being cut into strips are in memory. Other images are decoded
+    whole and yielded as one band.
+
+    Args:
+        image_path (str): Path to the image file
+
+    Yields:
+        np.ndarray: Consecutive bands of rows (uint8, full image width)
+    """
+    if image_path.lower().endswith(('.tif', '.tiff')):
+        tifffile = import_tifffile()
+        if tifffile is not None:
+            bands = _tiff_bands(tifffile, image_path)
+            if bands is not None:
+                yield from bands
+                return
+    yield load_grayscale(image_path)
+
+
+def blank_rows(gray: np.ndarray) -> np.ndarray:
+    """
+    Find the rows that contain no text
+
+    A row is blank when almost no neighbouring pixels differ sharply, which
+    holds for any background color, gradient-free fills and rows crossed
+    only by a few vertical lines.
+
+    Args:
+        gray (np.ndarray): Grayscale rows
+
+    Returns:
+        np.ndarray: Boolean flag per row
+    """
+    edges = np.abs(np.diff(gray.astype(np.int16), axis=1)) > EDGE_THRESHOLD
+    return np.count_nonzero(edges, axis=1) <= MAX_BLANK_ROW_EDGES
+
+
+def find_gap(blank: np.ndarray, start: int, end: int, min_gap: int) -> Optional[int]:
+    """
+    Pick a cut row inside the lowest run of blank rows in a window
+
+    Args:
+        blank (np.ndarray): Blank flag per row
+        start (int): First row a cut may fall on
+        end (int): Row the cut should not pass
+        min_gap (int): Fewest consecutive blank rows counted as a gap between lines
+
+    Returns:
+        int: Row in the middle of the chosen gap, or None if the window has no gap
+    """
+    run_end = None
+    for row in range(min(end, len(blank)) - 1, start - 1, -1):
+        if blank[row]:
+            if run_end is None:
+                run_end = row
+        elif run_end is not None:
+            if run_end - row >= min_gap:
+                return (row + 1 + run_end + 1) // 2
+            run_end = None
+    if run_end is not None and run_end - start + 1 >= min_gap:
+        return (start + run_end + 1) // 2
+    return None
+
+
+def iter_strips(bands: Iterable[np.ndarray], tile_height: int = DEFAULT_TILE_HEIGHT,
+                overlap: Optional[int] = None,
+                min_gap: int = 3) -> Iterator[Tuple[int, np.ndarray, int]]:
+    """
+    Cut a stream of row bands into strips of about tile_height rows
+
+    Each cut is placed in the middle of a blank gap between text lines in
+    the lower half of the strip, so no line is split. Where no gap exists
+    (dense graphics, tightly set text), the strip is cut at tile_height and
+    the next strip repeats the last `overlap` rows, so every line appears
+    whole in at least one strip; stitch_texts drops the repeated lines.
+    Only the rows of the current strip are buffered.
+
+    Args:
+        bands (Iterable[np.ndarray]): Grayscale row bands, top to bottom
+        tile_height (int): Target strip height
+        overlap (int): Rows repeated after a cut without a gap (default: four
+            times the glyph height estimated on the first strip, at least 64)
+        min_gap (int): Fewest blank rows between lines to cut at
+
+    Yields:
+        Tuple[int, np.ndarray, int]: Strip's first row in the image, the strip,
+            and how many of its leading rows repeat the previous strip
+    """
+    buffer = None
+    pending: List[np.ndarray] = []
+    top = 0
+    repeated = 0
+    bands = iter(bands)
+    exhausted = False
+    # Enough rows to either cut a strip or keep the rest as the last one
+    needed = int(tile_height * MIN_TILED_HEIGHT_FACTOR) + 1
+
+    while True:
+        rows = (len(buffer) if buffer is not None else 0) + sum(len(band) for band in pending)
+        while not exhausted and rows < needed:
+            band = next(bands, None)
+            if band is None:
+                exhausted = True
+            else:
+                pending.append(band)
+                rows += len(band)
+        if pending:
+            # Bands are joined once per strip rather than once per band
+            buffer = np.concatenate(([buffer] if buffer is not None else []) + pending)
+            pending = []
+        if buffer is None or not len(buffer):
+            return
+
+        if len(buffer) < needed:
+            # The rest is short enough to be the last strip
+            yield top, buffer, repeated
+            return
+
+        if overlap is None:
+            text_height = estimate_text_height(buffer[:tile_height])
+            overlap = max(64, int(4 * text_height)) if text_height else 64
+        overlap = min(overlap, tile_height // 2)
+
+        cut = find_gap(blank_rows(buffer[:tile_height]), tile_height // 2, tile_height, min_gap)
+        if cut is not None:
+            yield top, buffer[:cut], repeated
+            buffer, top, repeated = buffer[cut:], top + cut, 0
+        else:
+            yield top, buffer[:tile_height], repeated
+            step = tile_height - overlap
+            buffer, top, repeated = buffer[step:], top + step, overlap
+
+
+def _normalize_line(line: str) -> str:
+    return " ".join(line.split())
+
+
+def _match_lines(a: str, b: str, edge: bool, anchored: bool) -> bool:
+    """
+    Check whether two normalized lines are the same line read in two strips
+
+    Lines must match exactly, except that a line at either edge of an
+    overlap in which another line matched exactly may have been cut by the
+    strip border: it also matches when it is a truncation of the other line
+    or at least LINE_MATCH_RATIO similar.
+    """
+    if a == b:
+        return True
+    if not (edge and anchored):
+        return False
+    return (a.startswith(b) or b.startswith(a)
+            or difflib.SequenceMatcher(None, a, b).ratio() >= LINE_MATCH_RATIO)
+
+
+def stitch_texts(texts: Iterable[Tuple[str, int]], line_height: Optional[float] = None,
+                 max_overlap_lines: int = 12) -> str:
+    """
+    Join the texts of consecutive strips, dropping lines read twice in overlaps
+
+    After an overlapping cut, the lines at the top of a strip were also read
+    at the bottom of the previous one. The longest run of lines matching
+    there is kept only once, taking the longer reading of each line, and the
+    run is never longer than the lines that fit in the repeated rows. Lines
+    that do not match are kept: repeating a line is better than losing one.
+
+    Args:
+        texts (Iterable[Tuple[str, int]]): Each strip's raw text and its
+            repeated row count (as yielded by iter_strips)
+        line_height (float): Estimated text height in rows, which bounds how
+            many lines an overlap can hold (default: only max_overlap_lines)
+        max_overlap_lines (int): Most lines compared across an overlap
+
+    Returns:
+        str: Stitched raw text
+    """
+    lines: List[str] = []
+    for text, repeated in texts:
+        new = [line for line in text.splitlines() if line.strip()]
+        if repeated and lines and new:
+            max_lines = max_overlap_lines
+            if line_height:
+                max_lines = min(max_lines, int(repeated / line_height) + 1)
+            count, merged = _find_overlap(lines[-max_lines:], new[:max_lines])
+            if count:
+                lines[-count:] = merged
+                new = new[count:]
+        lines.extend(new)
+    return "\n".join(lines)
+
+
+def _find_overlap(previous: List[str], following: List[str]) -> Tuple[int, List[str]]:
+    """
+    Align the end of one strip's lines with the start of the next
+
+    Returns:
+        Tuple[int, List[str]]: Number of lines read twice (0 if none), and
+            the longer reading of each of them
+    """
+    previous_keys = [_normalize_line(line) for line in previous]
+    following_keys = [_normalize_line(line) for line in following]
+    for count in range(min(len(previous), len(following)), 0, -1):
+        pairs = list(zip(previous_keys[len(previous) - count:], following_keys[:count]))
+        anchored = any(a == b for a, b in pairs)
+        if all(_match_lines(a, b, i in (0, count - 1), anchored)
+               for i, (a, b) in enumerate(pairs)):
+            merged = [max(a, b, key=lambda line: len(line.strip()))
+                      for a, b in zip(previous[len(previous) - count:], following[:count])]
+            return count, merged
+    return 0, []
@@ -0,0 +1,261 @@
+"""
+Word Boxes - Compact column store of recognized words, boxes and confidences
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# One row per word; layout numbers follow tesseract's TSV output
+BOX_DTYPE = np.dtype([
+    ("page", np.int32),
+    ("block", np.int32),
+    ("paragraph", np.int32),
+    ("line", np.int32),
+    ("word", np.int32),
+    ("left", np.int32),
+    ("top", np.int32),
+    ("width", np.int32),
+    ("height", np.int32),
+    ("conf", np.float32),
+])
+
+TSV_HEADER = "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\t" \
+             "left\ttop\twidth\theight\tconf\ttext"
+
+
+class WordBoxes:
+    """
+    Recognized words with their bounding boxes and confidences
+
+    The numbers live in one NumPy structured array (a column per field,
+    see BOX_DTYPE) and the words in a single UTF-8 buffer with an offset
+    per word, so a page of several hundred words takes a few kilobytes
+    instead of a dict and several Python objects per word, and it pickles
+    cheaply between worker processes.
+    """
+
+    __slots__ = ("boxes", "_text", "_offsets")
+
+    def __init__(self, boxes: np.ndarray, text: bytes = b"",
+                 offsets: Optional[np.ndarray] = None):
+        """
+        Initialize word boxes
+
+        Args:
+            boxes (np.ndarray): Structured array with BOX_DTYPE, one row per word
+            text (bytes): UTF-8 encoded words, concatenated
+            offsets (np.ndarray): Start of each word in text, plus its end (len(boxes) + 1)
+        """
+        self.boxes = boxes
+        self._text = text
+        self._offsets = offsets if offsets is not None else np.zeros(1, dtype=np.int64)
+
+    @classmethod
+    def empty(cls) -> "WordBoxes":
+        """Word boxes holding no words"""
+        return cls(np.zeros(0, dtype=BOX_DTYPE))
+
+    @classmethod
+    def from_words(cls, rows: Sequence[Sequence[Any]], words: Sequence[str]) -> "WordBoxes":
+        """
+        Build word boxes from per-word rows
+
+        Args:
+            rows (Sequence): Values in BOX_DTYPE field order, one tuple per word
+            words (Sequence[str]): Text of each word
+
+        Returns:
+            WordBoxes: Word boxes
+        """
+        boxes = np.array([tuple(row) for row in rows], dtype=BOX_DTYPE)
+        encoded = [word.encode('utf-8') for word in words]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(word) for word in encoded], out=offsets[1:])
+        return cls(boxes, b"".join(encoded), offsets)
+
+    @classmethod
+    def from_tsv(cls, tsv: str, page: int = 0) -> "WordBoxes":
+        """
+        Read the words from tesseract's TSV output
+
+        Args:
+            tsv (str): TSV output (level, page, block, paragraph, line, word,
+                left, top, width, height, conf, text)
+            page (int): Page number stored with every word
+
+        Returns:
+            WordBoxes: Recognized words in reading order
+        """
+        rows = []
+        words = []
+        for line in tsv.splitlines():
+            fields = line.split('\t')
+            # Level 5 rows are words (the renderer's header line is not); empty
+            # words and -1 confidences are layout rows
+            if len(fields) < 12 or fields[0] != '5' or not fields[11].strip():
+                continue
+            try:
+                numbers = [int(value) for value in fields[2:10]]
+                confidence = float(fields[10])
+            except ValueError:
+                continue
+            if confidence < 0:
+                continue
+            rows.append([page] + numbers + [confidence])
+            words.append(fields[11])
+        return cls.from_words(rows, words)
+
+    @classmethod
+    def concatenate(cls, parts: Sequence["WordBoxes"]) -> "WordBoxes":
+        """
+        Join the words of several images or pages, in order
+
+        Args:
+            parts (Sequence[WordBoxes]): Word boxes to join
+
+        Returns:
+            WordBoxes: All words
+        """
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return cls.empty()
+        if len(parts) == 1:
+            return parts[0]
+        offsets = [parts[0]._offsets]
+        base = parts[0]._offsets[-1]
+        for part in parts[1:]:
+            offsets.append(part._offsets[1:] + base)
+            base += part._offsets[-1]
+        return cls(np.concatenate([part.boxes for part in parts]),
+                   b"".join(part._text for part in parts), np.concatenate(offsets))
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def __getstate__(self):
+        return self.boxes, self._text, self._offsets
+
+    def __setstate__(self, state):
+        self.boxes, self._text, self._offsets = state
+
+    @property
+    def confidences(self) -> np.ndarray:
+        """Confidence (0-100) of each word"""
+        return self.boxes["conf"]
+
+    def words(self) -> List[str]:
+        """
+        Decode the text of every word
+
+        Returns:
+            List[str]: Words in reading order
+        """
+        offsets = self._offsets.tolist()
+        return [self._text[start:end].decode('utf-8')
+                for start, end in zip(offsets[:-1], offsets[1:])]
+
+    def mean_confidence(self) -> float:
+        """Mean word confidence, or 0.0 when there are no words"""
+        return float(self.confidences.mean()) if len(self) else 0.0
+
+    def select(self, mask: np.ndarray) -> "WordBoxes":
+        """
+        Keep only some of the words
+
+        Args:
+            mask (np.ndarray): Boolean flag per word
+
+        Returns:
+            WordBoxes: The flagged words, in order
+        """
+        index = np.flatnonzero(mask)
+        starts = self._offsets[index]
+        ends = self._offsets[index + 1]
+        offsets = np.zeros(len(index) + 1, dtype=np.int64)
+        np.cumsum(ends - starts, out=offsets[1:])
+        text = b"".join(self._text[start:end]
+                        for start, end in zip(starts.tolist(), ends.tolist()))
+        return WordBoxes(self.boxes[index], text, offsets)
+
+    def transformed(self, dx: int = 0, dy: int = 0, scale: float = 1.0,
+                    page: Optional[int] = None) -> "WordBoxes":
+        """
+        Map the boxes to another coordinate space
+
+        Boxes are shifted by (dx, dy), then divided by scale: use a region's
+        position to place region boxes on the whole image, and the rescale
+        factor of preprocessing to get back to the input image's pixels.
+
+        Args:
+            dx (int): Horizontal shift
+            dy (int): Vertical shift
+            scale (float): Factor the recognized image was resized by
+            page (int): Page number to store with every word (default: unchanged)
+
+        Returns:
+            WordBoxes: Word boxes sharing this one's text
+        """
+        boxes = self.boxes.copy()
+        if dx:
+            boxes["left"] += dx
+        if dy:
+            boxes["top"] += dy
+        if scale != 1.0:
+            for field in ("left", "top", "width", "height"):
+                boxes[field] = np.rint(boxes[field] / scale)
+        if page is not None:
+            boxes["page"] = page
+        return WordBoxes(boxes, self._text, self._offsets)
+
+    def to_tsv(self) -> str:
+        """
+        Format the words as tesseract-style TSV (word rows only)
+
+        Returns:
+            str: TSV text with a header line
+        """
+        lines = [TSV_HEADER]
+        for row, word in zip(self.boxes.tolist(), self.words()):
+            page, block, paragraph, line, number, left, top, width, height, conf = row
+            lines.append(f"5\t{page + 1}\t{block}\t{paragraph}\t{line}\t{number}\t"
+                         f"{left}\t{top}\t{width}\t{height}\t{conf:g}\t{word}")
+        return "\n".join(lines) + "\n"
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Convert to one JSON-serializable dict per word
+
+        Returns:
+            List[Dict]: Word "text" and the BOX_DTYPE fields
+        """
+        names = BOX_DTYPE.names
+        return [dict(zip(names, row), text=word)
+                for row, word in zip(self.boxes.tolist(), self.words())]
+
+    def save(self, path: str):
+        """
+        Save to an uncompressed NumPy .npz file (readable without pickle)
+
+        Args:
+            path (str): Output file path
+        """
+        np.savez(path, boxes=self.boxes, text=np.frombuffer(self._text, dtype=np.uint8),
+                 offsets=self._offsets)
+
+    @classmethod
+    def load(cls, path: str) -> "WordBoxes":
+        """
+        Load word boxes saved with save
+
+        Args:
+            path (str): .npz file path
+
+        Returns:
+            WordBoxes: Loaded word boxes
+        """
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["boxes"], data["text"].tobytes(), data["offsets"])
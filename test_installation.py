@@ -66,6 +66,96 @@ def test_dependencies():
     
     return all_good
 
+def test_contrast_matches_pil():
+    """Test that the fast contrast stage matches PIL's ImageEnhance.Contrast"""
+    print("\nTesting contrast enhancement...")
+    
+    try:
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+        import numpy as np
+        from PIL import Image, ImageEnhance
+        from preprocessing import ContrastStage
+        
+        # Dark text on a light background: the text must clamp to black
+        image = np.full((64, 256), 200, dtype=np.uint8)
+        image[16:48, 32:224:8] = 0
+        image[24:40, 36:220:8] = 40
+        
+        expected = np.asarray(ImageEnhance.Contrast(Image.fromarray(image)).enhance(2.0))
+        result = ContrastStage(2.0).apply(image.copy())
+        if np.array_equal(result, expected):
+            print("✓ Contrast enhancement matches PIL")
+            return True
+        worst = int(np.abs(result.astype(int) - expected.astype(int)).max())
+        print(f"✗ Contrast enhancement differs from PIL by up to {worst} levels")
+        return False
+        
+    except ImportError as e:
+        print(f"✗ Import error: {e}")
+        return False
+
+def test_stitch_keeps_similar_lines():
+    """Test that stitching tiled text keeps near-identical lines that are not repeats"""
+    print("\nTesting tiled text stitching...")
+    
+    try:
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+        from tiling import stitch_texts
+        
+        # A log of near-identical lines, cut with a two-line overlap
+        log = [f"12:00:{i:02d} INFO worker {i % 3} processed batch" for i in range(40)]
+        cases = [
+            (stitch_texts([("\n".join(log[:20]), 0), ("\n".join(log[18:]), 40)], line_height=20),
+             "\n".join(log)),
+            (stitch_texts([("ERROR 1\nERROR 2", 0), ("ERROR 3\nERROR 4", 64)]),
+             "ERROR 1\nERROR 2\nERROR 3\nERROR 4"),
+            (stitch_texts([("one\ntwo\nline thr", 0), ("two\nline three\nfour", 30)], line_height=16),
+             "one\ntwo\nline three\nfour"),
+        ]
+        if all(result == expected for result, expected in cases):
+            print("✓ Overlapping strips stitched without losing lines")
+            return True
+        print("✗ Stitching overlapping strips lost or kept the wrong lines")
+        return False
+        
+    except ImportError as e:
+        print(f"✗ Import error: {e}")
+        return False
+
+def test_journal_detects_rewrite():
+    """Test that a file rewritten while it is extracted is not journaled as up to date"""
+    print("\nTesting run journal change detection...")
+    
+    try:
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+        import tempfile
+        from parallel_engine import _extract_one
+        from run_journal import RunJournal
+        
+        class RewritingExtractor:
+            """Stands in for OCRExtractor and rewrites the image mid-extraction"""
+            def extract_details(self, image_path, **kwargs):
+                with open(image_path, 'ab') as f:
+                    f.write(b"new screenshot data")
+                return {"text": "old text", "cache": None, "stats": {}}
+        
+        with tempfile.TemporaryDirectory() as directory:
+            image_path = os.path.join(directory, "shot.png")
+            with open(image_path, 'wb') as f:
+                f.write(b"old screenshot data")
+            record = _extract_one(RewritingExtractor(), image_path, True, 6, 3)
+            journal = RunJournal(directory)
+            journal.record(record, record["signature"])
+            if not journal.is_unchanged(image_path):
+                print("✓ Files changed during extraction are extracted again")
+                return True
+        print("✗ A file changed during extraction was recorded as up to date")
+        return False
+        
+    except ImportError as e:
+        print(f"✗ Import error: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("Screenshot to Text Extractor - Installation Test")
@@ -74,7 +164,10 @@ def main():
     tests = [
         test_imports,
         test_tesseract,
-        test_dependencies
+        test_dependencies,
+        test_contrast_matches_pil,
+        test_stitch_keeps_similar_lines,
+        test_journal_detects_rewrite
     ]
     
     results = []